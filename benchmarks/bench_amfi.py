@@ -0,0 +1,68 @@
+"""AMFI NAV feed reconciliation: per-code queries vs. one batched lookup.
+
+Samples ``--size`` AMFI codes (~5% unknown) from the DB at
+``CASPARSER_ISIN_DB`` (or the bundled one), as a NAV feed would list them,
+and maps each to its scheme rows with a per-code full-table scan (the
+pre-index plan), per-code ``amfi_lookup`` and one ``amfi_lookup_many``.
+
+Run via ``python benchmarks/bench_amfi.py [--size N] [--scan-size N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+
+from casparser_isin import MFISINDb
+from casparser_isin.mf_isin import _candidates
+from casparser_isin.utils import get_isin_db_path
+
+
+class ScanMFISINDb(MFISINDb):
+    """Scans ``scheme`` per code, as before ``idx_scheme_amfi_code``."""
+
+    def amfi_lookup(self, amfi_code):
+        sql = (
+            f"SELECT {self._scheme_columns()} FROM scheme NOT INDEXED "
+            "WHERE amfi_code = :amfi_code ORDER BY id DESC"
+        )
+        return _candidates(self.run_query(sql, {"amfi_code": amfi_code}, row_factory=None))
+
+
+def sample_codes(size):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        codes = [r[0] for r in conn.execute("SELECT DISTINCT amfi_code FROM scheme")]
+    conn.close()
+    rng = random.Random(0)
+    return [rng.choice(codes) if rng.random() > 0.05 else f"9{n:07d}" for n in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=40_000)
+    parser.add_argument("--scan-size", type=int, default=500, help="codes for the scan baseline")
+    args = parser.parse_args()
+
+    codes = sample_codes(args.size)
+    db = MFISINDb()
+    expected = db.amfi_lookup_many(codes)
+    for label, db_, run, n in (
+        ("table scan per code", ScanMFISINDb(), None, min(args.scan_size, len(codes))),
+        ("amfi_lookup per code", db, None, len(codes)),
+        ("amfi_lookup_many", db, db.amfi_lookup_many, len(codes)),
+    ):
+        start = time.perf_counter()
+        if run is None:
+            found = {code: db_.amfi_lookup(code) for code in codes[:n]}
+        else:
+            found = run(codes[:n])
+        elapsed = time.perf_counter() - start
+        assert all(found[code] == expected[code] for code in found)
+        print(
+            f"{label:<22} {elapsed / n * 1e6:9.2f} µs/code  "
+            f"{elapsed * len(codes) / n:8.3f} s for {len(codes):,} codes"
+        )
+
+
+if __name__ == "__main__":
+    main()
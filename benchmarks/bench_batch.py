@@ -0,0 +1,79 @@
+"""Batch lookups vs. one lookup per item.
+
+Run via ``python benchmarks/bench_batch.py [--size N] [--rounds N]``.
+"""
+
+import argparse
+import sqlite3
+import timeit
+
+from casparser_isin import ISINDb, MFISINDb
+from casparser_isin.mf_isin import RTA_MAP
+from casparser_isin.utils import get_isin_db_path
+
+
+def sample_isins(size):
+    """``size`` ISINs: ~90% present in the ``isin`` table, the rest misses, some repeated."""
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        hits = [r[0] for r in conn.execute("SELECT isin FROM isin LIMIT ?", (size * 9 // 10,))]
+    misses = [f"INE{n:09d}X" for n in range(size - len(hits))]
+    return hits + misses
+
+
+def sample_holdings(size):
+    """``size`` MF holdings: half with an ISIN, half relying on the rta_code fallback.
+
+    HDFC schemes are left out: their fallback runs one query per item in both
+    code paths, so they only add the same constant to both timings.
+    """
+    rta_names = {v: k for k, v in RTA_MAP.items()}
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        rows = conn.execute(
+            "SELECT name, rta, rta_code, isin FROM scheme WHERE name NOT LIKE '%hdfc%' "
+            "ORDER BY random() LIMIT ?",
+            (size,),
+        ).fetchall()
+    return [
+        (name, rta_names[rta], rta_code, isin if n % 2 else None)
+        for n, (name, rta, rta_code, isin) in enumerate(rows)
+    ]
+
+
+def mf_loop(db, holdings):
+    results = []
+    for holding in holdings:
+        try:
+            results.append(db.isin_lookup(*holding))
+        except ValueError as exc:
+            results.append(exc)
+    return results
+
+
+def report(label, func, items, rounds):
+    best = min(timeit.repeat(func, number=1, repeat=rounds))
+    print(f"{label:<28} {best * 1e3:9.1f} ms  {len(items) / best:12,.0f} items/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    isins = sample_isins(args.size)
+    db = ISINDb()
+    report(
+        "ISINDb.isin_lookup loop", lambda: [db.isin_lookup(i) for i in isins], isins, args.rounds
+    )
+    report("ISINDb.isin_lookup_many", lambda: db.isin_lookup_many(isins), isins, args.rounds)
+
+    holdings = sample_holdings(args.size)
+    mf = MFISINDb()
+    report("MFISINDb.isin_lookup loop", lambda: mf_loop(mf, holdings), holdings, args.rounds)
+    report(
+        "MFISINDb.isin_lookup_many", lambda: mf.isin_lookup_many(holdings), holdings, args.rounds
+    )
+
+
+if __name__ == "__main__":
+    main()
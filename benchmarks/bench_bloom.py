@@ -0,0 +1,60 @@
+"""Bloom-filter negative lookups: size, false-positive rate and miss latency.
+
+Builds the same filters ``tools/update_isin_db.py`` ships from the DB at
+``CASPARSER_ISIN_DB`` (or the bundled one), then probes them with ISINs
+that are not in the database.
+
+Run via ``python benchmarks/bench_bloom.py [--misses N]``.
+"""
+
+import argparse
+import sqlite3
+import time
+import timeit
+
+from casparser_isin import ISINDb
+from casparser_isin.bloom import BloomFilter
+from casparser_isin.utils import get_isin_db_path
+
+KEY_SETS = {
+    "isin": "SELECT isin FROM isin",
+    "scheme": "SELECT isin FROM scheme WHERE isin IS NOT NULL",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--misses", type=int, default=100_000)
+    args = parser.parse_args()
+
+    absent = [f"INE{n:09d}X" for n in range(args.misses)]
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        key_sets = {name: [r[0] for r in conn.execute(sql)] for name, sql in KEY_SETS.items()}
+
+    filters = {}
+    for name, keys in key_sets.items():
+        start = time.perf_counter()
+        bloom = filters[name] = BloomFilter.from_keys(keys)
+        elapsed = time.perf_counter() - start
+        observed = sum(key in bloom for key in absent) / len(absent)
+        print(
+            f"{name:<7} n={bloom.n:>8,}  {bloom.nbytes / 1024:8.1f} KiB  "
+            f"{bloom.nbytes * 8 / max(bloom.n, 1):4.1f} bits/key  k={bloom.k}  "
+            f"fpr est={bloom.false_positive_rate:.4%} observed={observed:.4%}  "
+            f"build {elapsed:.2f}s"
+        )
+
+    db = ISINDb()
+    sql = "SELECT isin, name, issuer, type, status FROM isin WHERE isin = :isin"
+    probe = absent[:10_000]
+    query = min(
+        timeit.repeat(lambda: [db.run_query(sql, {"isin": i}, True) for i in probe], number=1)
+    )
+    bloom = filters["isin"]
+    check = min(timeit.repeat(lambda: [i in bloom for i in probe], number=1))
+    print(f"miss via SQLite query  {query / len(probe) * 1e6:6.2f} us")
+    print(f"miss via Bloom filter  {check / len(probe) * 1e6:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Bulk resolution throughput: one process vs. ``isin_lookup_bulk`` worker pools.
+
+Resolves holdings sampled from the DB at ``CASPARSER_ISIN_DB`` (or the
+bundled one) with ``iter_isin_lookup`` (``isin_lookup_many`` per chunk) in
+this process, then with ``isin_lookup_bulk`` on 1, 2, 4, ... worker
+processes up to ``--workers``.
+The lookup cache is disabled so repeated holdings cost a real lookup.
+
+Run via ``python benchmarks/bench_bulk.py [--size N] [--workers N] [--chunk-size N]``.
+"""
+
+import argparse
+import os
+import time
+
+from bench_batch import sample_holdings
+
+from casparser_isin import MFISINDb
+from casparser_isin.bulk import isin_lookup_bulk
+from casparser_isin.utils import lookup_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    # Time the lookups, not the result cache, here and in the (spawned) workers.
+    lookup_cache.resize(0)
+    os.environ["CASPARSER_ISIN_CACHE_SIZE"] = "0"
+    sample = sample_holdings(min(args.size, 20_000))
+    holdings = [sample[n % len(sample)] for n in range(args.size)]
+
+    db = MFISINDb()
+    start = time.perf_counter()
+    for _ in db.iter_isin_lookup(holdings, chunk_size=args.chunk_size):
+        pass
+    baseline = time.perf_counter() - start
+    print(f"{'in process':<12} {args.size / baseline:10,.0f} items/s")
+
+    for workers in sorted({2**n for n in range(args.workers.bit_length())} | {args.workers}):
+        start = time.perf_counter()
+        for _ in isin_lookup_bulk(holdings, max_workers=workers, chunk_size=args.chunk_size):
+            pass
+        elapsed = time.perf_counter() - start
+        print(
+            f"{workers:>2} worker(s) {args.size / elapsed:10,.0f} items/s  "
+            f"x{baseline / elapsed:.2f} vs in process"
+        )
+
+
+if __name__ == "__main__":
+    main()
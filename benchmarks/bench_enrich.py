@@ -0,0 +1,67 @@
+"""Portfolio enrichment: a lookup per row vs. ``AnyISINDb.enrich`` over the column.
+
+Samples ``--size`` rows of ISINs (securities and mutual funds, ~5% unknown,
+``--distinct`` distinct ISINs) from the DB at ``CASPARSER_ISIN_DB`` (or the
+bundled one) and resolves them with ``AnyISINDb.resolve`` per row (on the
+first ``--loop-size`` rows, extrapolated; lookup cache disabled) and with
+one ``AnyISINDb.enrich`` call on the whole NumPy column (and a pandas
+Series, if pandas is installed).
+
+Run via ``python benchmarks/bench_enrich.py [--size N] [--distinct N] [--loop-size N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+
+import numpy as np
+
+from casparser_isin import AnyISINDb
+from casparser_isin.utils import get_isin_db_path, lookup_cache
+
+
+def sample_isins(size, distinct):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        known = [r[0] for r in conn.execute("SELECT isin FROM isin UNION SELECT isin FROM scheme")]
+    conn.close()
+    rng = random.Random(0)
+    pool = rng.sample(known, min(distinct, len(known)))
+    pool += [f"INE{n:08d}X" for n in range(len(pool) // 20)]
+    return np.array([rng.choice(pool) for _ in range(size)], dtype=object)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=50_000)
+    parser.add_argument("--loop-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    isins = sample_isins(args.size, args.distinct)
+    db = AnyISINDb()
+    lookup_cache.resize(0)
+
+    n = min(args.loop_size, len(isins))
+    start = time.perf_counter()
+    names = [match.data.name if (match := db.resolve(isin)) else None for isin in isins[:n]]
+    elapsed = (time.perf_counter() - start) * len(isins) / n
+    print(f"{'resolve per row':<18} {elapsed:8.3f} s for {len(isins):,} rows (extrapolated)")
+
+    columns = [("NumPy array", isins)]
+    try:
+        import pandas as pd
+    except ImportError:
+        pass
+    else:
+        columns.append(("pandas Series", pd.Series(isins)))
+    for label, column in columns:
+        start = time.perf_counter()
+        enriched = db.enrich(column)
+        elapsed = time.perf_counter() - start
+        assert enriched["name"][:n].tolist() == names
+        print(f"{'enrich, ' + label:<18} {elapsed:8.3f} s for {len(isins):,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Global fuzzy search: token inverted index vs. scoring every scheme name.
+
+Garbles a sample of scheme names from the DB at ``CASPARSER_ISIN_DB`` (or the
+bundled one) and searches for each with ``MFISINDb.fuzzy_search`` (with and
+without AMC sharding) and with one rapidfuzz ``extractOne`` over all names,
+reporting latency and how often the garbled name's own row came first.
+
+Run via ``python benchmarks/bench_fuzzy_search.py [--size N] [--typos N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+
+from rapidfuzz import fuzz, process
+
+from casparser_isin import MFISINDb
+from casparser_isin.mf_isin import fuzzy_key
+from casparser_isin.utils import get_isin_db_path, lookup_cache
+
+
+def garble(name, typos, rng):
+    chars = list(name)
+    for _ in range(typos):
+        chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--typos", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        rows = conn.execute("SELECT name, isin FROM scheme WHERE name IS NOT NULL").fetchall()
+    conn.close()
+    sample = rng.sample(rows, min(args.size, len(rows)))
+    queries = [(garble(name, args.typos, rng), isin) for name, isin in sample]
+
+    lookup_cache.resize(0)
+    db = MFISINDb()
+    start = time.perf_counter()
+    index = db._name_index()
+    print(f"index build            {time.perf_counter() - start:8.3f} s  ({len(index):,} rows)")
+
+    def indexed(by_amc):
+        return [db.fuzzy_search(q, limit=1, by_amc=by_amc) for q, _ in queries]
+
+    def brute_force():
+        results = []
+        for q, _ in queries:
+            match = process.extractOne(fuzzy_key(q), index.keys, scorer=fuzz.ratio, processor=None)
+            results.append([index.rows[match[2]]] if match and match[1] >= 60 else [])
+        return results
+
+    for label, search in (
+        ("index, AMC shards", lambda: indexed(True)),
+        ("index, all schemes", lambda: indexed(False)),
+        ("extractOne, all names", brute_force),
+    ):
+        start = time.perf_counter()
+        results = search()
+        elapsed = time.perf_counter() - start
+        hits = sum(
+            bool(r) and r[0].isin == isin for r, (_, isin) in zip(results, queries, strict=True)
+        )
+        print(
+            f"{label:<22} {elapsed / len(queries) * 1e3:8.3f} ms/query  "
+            f"own ISIN first {hits / len(queries):6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""HDFC scheme lookups: precomputed plan/option columns vs. ``LIKE`` scans.
+
+Samples HDFC holdings without an ISIN (so every lookup takes the HDFC
+``rta_code`` prefix branch of ``MFISINDb.scheme_lookup``) and times them
+against the DB at ``CASPARSER_ISIN_DB`` (or the bundled one), once with
+the dbformat-3 ``plan`` / ``option`` columns and once with the older
+``name LIKE '%direct%'`` statement.
+
+Run via ``python benchmarks/bench_hdfc.py [--size N] [--rounds N]``.
+"""
+
+import argparse
+import functools
+import sqlite3
+import timeit
+
+from casparser_isin import MFISINDb
+from casparser_isin.mf_isin import RTA_MAP
+from casparser_isin.utils import get_isin_db_path, lookup_cache
+
+
+class LikeScanMFISINDb(MFISINDb):
+    """Takes the pre-dbformat-3 ``LIKE`` branch for HDFC schemes."""
+
+    def has_column(self, table, column):
+        return column != "plan" and super().has_column(table, column)
+
+
+def sample_holdings(size):
+    """``size`` HDFC holdings as ``(scheme_name, rta, rta_code)``, repeating rows if needed."""
+    rta_names = {v: k for k, v in RTA_MAP.items()}
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        rows = conn.execute(
+            "SELECT name, rta, rta_code FROM scheme WHERE name LIKE '%hdfc%' "
+            "ORDER BY random() LIMIT ?",
+            (size,),
+        ).fetchall()
+    if not rows:
+        raise SystemExit("no HDFC schemes in the database")
+    return [
+        (name, rta_names[rta], rta_code)
+        for name, rta, rta_code in (rows[n % len(rows)] for n in range(size))
+    ]
+
+
+def scheme_lookups(db, holdings):
+    return [db.scheme_lookup(rta, name, rta_code) for name, rta, rta_code in holdings]
+
+
+def portfolio(db, holdings):
+    results = []
+    for name, rta, rta_code in holdings:
+        try:
+            results.append(db.isin_lookup(name, rta, rta_code))
+        except ValueError as exc:
+            results.append(exc)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # Time the queries, not the result cache.
+    lookup_cache.resize(0)
+    holdings = sample_holdings(args.size)
+    for label, db in (("LIKE scan", LikeScanMFISINDb()), ("plan/option columns", MFISINDb())):
+        if label != "LIKE scan" and not db.has_column("scheme", "plan"):
+            print(f"{label:<22} skipped: DB predates dbformat 3")
+            continue
+        for name, func in (("scheme_lookup", scheme_lookups), ("isin_lookup", portfolio)):
+            best = min(
+                timeit.repeat(functools.partial(func, db, holdings), number=1, repeat=args.rounds)
+            )
+            print(
+                f"{label:<22} {name:<14} {best * 1e3:9.1f} ms  "
+                f"{best / len(holdings) * 1e6:8.1f} us/item"
+            )
+
+
+if __name__ == "__main__":
+    main()
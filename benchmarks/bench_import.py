@@ -0,0 +1,65 @@
+"""Cold import time of the package and the CLI, with a regression budget.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters and
+reports the best cumulative import time of each module. Exits non-zero if a
+module goes over its budget, or if an import drags in a dependency that
+should only load on demand (rapidfuzz, packaging, urllib.request).
+
+Run via ``python benchmarks/bench_import.py [--rounds N] [--scale X]``.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# module -> budget in ms, with generous headroom over the measured times.
+BUDGETS_MS = {
+    "casparser_isin": 5,
+    "casparser_isin.cli": 40,
+}
+DEFERRED = ("rapidfuzz", "packaging", "urllib.request")
+
+
+def import_profile(module):
+    """``{imported module: cumulative µs}`` for a fresh ``import module``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiply every budget (slow machines / CI)"
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        profiles = [import_profile(module) for _ in range(args.rounds)]
+        best = min(profile[module] for profile in profiles) / 1000
+        limit = budget * args.scale
+        loaded = [dep for dep in DEFERRED if dep in profiles[0]]
+        ok = best <= limit and not loaded
+        failed |= not ok
+        print(
+            f"{module:<20} {best:7.1f} ms  (budget {limit:.0f} ms)  "
+            f"{'ok' if ok else 'OVER BUDGET'}" + (f"  eagerly imports {loaded}" if loaded else "")
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Security search: ``isin_fts`` / issuer-code index vs. scanning the ``isin`` table.
+
+Samples names and issuer codes from the ``isin`` table of the DB at
+``CASPARSER_ISIN_DB`` (or the bundled one) and runs ``ISINDb.search`` on
+them (the first ``--words`` words of a name or an issuer, or an issuer
+code), with the DB's indexes and with the table-scan fallback, consuming
+every result. The scan baseline runs ``--scan-size`` queries per criterion.
+
+Run via ``python benchmarks/bench_isin_search.py [--size N] [--scan-size N] [--words N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+
+from casparser_isin import ISINDb
+from casparser_isin.utils import get_isin_db_path
+
+
+class ScanISINDb(ISINDb):
+    """``ISINDb.search`` without ``isin_fts`` or ``idx_isin_issuer_code``."""
+
+    def has_fts(self, table):
+        return False
+
+    def _search_scan(self, where, args):
+        where = [clause.replace("substr(isin", "substr(+isin") for clause in where]
+        return super()._search_scan(where, args)
+
+
+def sample_queries(size, words, rng):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        rows = conn.execute("SELECT isin, name, issuer FROM isin").fetchall()
+    conn.close()
+    queries = []
+    for isin, name, issuer in rng.sample(rows, min(size, len(rows))):
+        kind = rng.randrange(3)
+        if kind == 0:
+            queries.append({"name": " ".join(name.split()[:words])})
+        elif kind == 1:
+            queries.append({"issuer": " ".join(issuer.split()[:words])})
+        else:
+            queries.append({"issuer_code": isin[3:7]})
+    return len(rows), queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--scan-size", type=int, default=30, help="queries for the scan baseline")
+    parser.add_argument("--words", type=int, default=2)
+    args = parser.parse_args()
+
+    total, queries = sample_queries(args.size, args.words, random.Random(0))
+    print(f"{total:,} ISINs")
+    db, scan = ISINDb(), ScanISINDb()
+    if not db.has_fts("isin_fts"):
+        print("no usable isin_fts in this DB: word searches scan the table")
+
+    def run(db_, query):
+        # Just the count and end rows: a query can match many thousand rows.
+        count, first, last = 0, None, None
+        for last in db_.search(**query):
+            count += 1
+            first = first or last
+        return count, first, last
+
+    for criterion in ("name", "issuer", "issuer_code"):
+        subset = [query for query in queries if criterion in query]
+        expected = [run(db, query) for query in subset]
+        for label, db_, n in (("indexes", db, len(subset)), ("table scan", scan, args.scan_size)):
+            n = min(n, len(subset))
+            start = time.perf_counter()
+            found = [run(db_, query) for query in subset[:n]]
+            elapsed = time.perf_counter() - start
+            # The scan also matches words inside other words.
+            assert all(f[0] >= e[0] for f, e in zip(found, expected, strict=False))
+            rows = sum(count for count, _, _ in found)
+            print(
+                f"{criterion:<12} {label:<11} {elapsed / n * 1e3:8.3f} ms/query  "
+                f"{rows / n:9.1f} rows/query"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Grandfathered LTCG cost: per-lot ``nav_lookup`` loop vs. ``grandfathered_cost_many``.
+
+Generates ``--size`` random lots over the ISINs in ``nav20180131`` of the DB
+at ``CASPARSER_ISIN_DB`` (or the bundled one) and computes each lot's cost
+of acquisition with a Python loop calling ``nav_lookup`` per lot, with
+``grandfathered_cost_many`` on lists and, if NumPy is installed, on arrays.
+
+Run via ``python benchmarks/bench_ltcg.py [--size N] [--rounds N]``.
+"""
+
+import argparse
+import datetime
+import random
+import timeit
+from decimal import Decimal
+
+from casparser_isin import MFISINDb
+from casparser_isin.ltcg import GRANDFATHERING_DATE
+
+
+def make_lots(db, size):
+    rng = random.Random(0)
+    isins = list(db._navs()) or ["INF000000000"]
+    start = datetime.date(2015, 1, 1)
+    return (
+        [rng.choice(isins) for _ in range(size)],
+        [start + datetime.timedelta(days=rng.randrange(2000)) for _ in range(size)],
+        [Decimal(rng.randrange(1000, 100_000)) / 100 for _ in range(size)],
+        [Decimal(rng.randrange(1, 10**6)) / 1000 for _ in range(size)],
+        [Decimal(rng.randrange(1000, 100_000)) / 100 for _ in range(size)],
+    )
+
+
+def per_lot(db, isins, dates, purchase_navs, units, sale_navs):
+    costs = []
+    for isin, date, purchase_nav, unit, sale_nav in zip(
+        isins, dates, purchase_navs, units, sale_navs, strict=True
+    ):
+        nav = db.nav_lookup(isin)
+        if nav is None or date > GRANDFATHERING_DATE:
+            costs.append(unit * purchase_nav)
+        else:
+            costs.append(max(unit * purchase_nav, min(unit * nav, unit * sale_nav)))
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    db = MFISINDb()
+    lots = make_lots(db, args.size)
+    runs = [
+        ("per-lot nav_lookup", lambda: per_lot(db, *lots)),
+        ("batch, lists", lambda: db.grandfathered_cost_many(*lots)),
+    ]
+    expected = per_lot(db, *lots)
+    assert db.grandfathered_cost_many(*lots) == expected
+    try:
+        import numpy as np
+    except ImportError:
+        print("numpy not installed: skipping array inputs")
+    else:
+        isins, dates, *decimals = lots
+        arrays = [
+            np.array(isins),
+            np.array(dates, dtype="datetime64[D]"),
+            *(np.array(column, dtype=object) for column in decimals),
+        ]
+        assert db.grandfathered_cost_many(*arrays) == expected
+        runs.append(("batch, NumPy arrays", lambda: db.grandfathered_cost_many(*arrays)))
+
+    for label, func in runs:
+        best = min(timeit.repeat(func, number=1, repeat=args.rounds))
+        print(f"{label:<20} {best:8.3f} s  {best / args.size * 1e6:6.2f} us/lot")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""In-memory vs. file-backed lookups: memory footprint and per-lookup latency.
+
+Run via ``python benchmarks/bench_memory.py [--rounds N]``. Point
+``CASPARSER_ISIN_DB`` at a copy on the storage you care about (e.g. a
+network volume) to see the effect the in-memory mode is meant to remove.
+"""
+
+import argparse
+import resource
+import sqlite3
+import time
+import timeit
+
+from casparser_isin import ISINDb, MFISINDb
+from casparser_isin.utils import connection_pool, get_isin_db_path
+
+
+def rss_mib():
+    """Current resident set size in MiB (Linux), falling back to peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * resource.getpagesize() / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def sample(limit=200):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        schemes = [r[0] for r in conn.execute("SELECT isin FROM scheme LIMIT ?", (limit,))]
+        isins = [r[0] for r in conn.execute("SELECT isin FROM isin LIMIT ?", (limit,))]
+    return schemes, isins
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    path = get_isin_db_path()
+    schemes, isins = sample()
+
+    before = rss_mib()
+    start = time.perf_counter()
+    master = connection_pool.memory_database(path)
+    load_time = time.perf_counter() - start
+    page_size = master.execute("PRAGMA page_size").fetchone()[0]
+    page_count = master.execute("PRAGMA page_count").fetchone()[0]
+    print(f"file size          {path.stat().st_size / 2**20:8.1f} MiB")
+    print(f"in-memory pages    {page_size * page_count / 2**20:8.1f} MiB")
+    print(f"RSS increase       {rss_mib() - before:8.1f} MiB")
+    print(f"load time          {load_time * 1e3:8.1f} ms")
+
+    for label, in_memory in (("file", False), ("memory", True)):
+        mf, generic = MFISINDb(in_memory=in_memory), ISINDb(in_memory=in_memory)
+
+        def run(mf=mf, generic=generic):
+            for isin in schemes:
+                mf.direct_isin_lookup(isin)
+            for isin in isins:
+                generic.isin_lookup(isin)
+
+        best = min(timeit.repeat(run, number=1, repeat=args.rounds))
+        per_lookup = best / (len(schemes) + len(isins)) * 1e6
+        print(f"{label:<18} {per_lookup:8.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
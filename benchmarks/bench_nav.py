@@ -0,0 +1,73 @@
+"""31-Jan-2018 NAV lookups: preloaded NAV map vs. one SQL query per redemption.
+
+Samples ``--size`` redemptions (ISINs from ``nav20180131``, ~5% without a
+NAV) from the DB at ``CASPARSER_ISIN_DB`` (or the bundled one) and looks
+up each one's NAV via the pre-map ``SELECT ... WHERE isin = ?`` path (with
+and without the lookup cache), ``nav_lookup`` and ``nav_lookup_many``.
+
+Run via ``python benchmarks/bench_nav.py [--size N] [--rounds N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import timeit
+from decimal import Decimal
+
+from casparser_isin import MFISINDb
+from casparser_isin.utils import get_isin_db_path, lookup_cache
+
+
+class QueryMFISINDb(MFISINDb):
+    """Runs one query per ``nav_lookup``, as before the NAV map."""
+
+    def nav_lookup(self, isin):
+        return self.cached("nav_lookup", (isin,), lambda: self._query_nav(isin))
+
+    def _query_nav(self, isin):
+        sql = "SELECT nav FROM nav20180131 where isin = :isin"
+        row = self.run_query(sql, {"isin": isin}, fetchone=True, row_factory=None)
+        return Decimal(row[0]) if row is not None else None
+
+
+def sample_redemptions(size):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        isins = [r[0] for r in conn.execute("SELECT isin FROM nav20180131")]
+    conn.close()
+    if not isins:
+        raise SystemExit("no NAVs in the database")
+    rng = random.Random(0)
+    return [rng.choice(isins) if rng.random() > 0.05 else f"INF{n:09d}X" for n in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    redemptions = sample_redemptions(args.size)
+    query_db, db = QueryMFISINDb(), MFISINDb()
+    expected = [query_db._query_nav(isin) for isin in redemptions]
+    assert [db.nav_lookup(isin) for isin in redemptions] == expected
+    assert list(map(db.nav_lookup_many(redemptions).get, redemptions)) == expected
+
+    def per_call(mf):
+        return lambda: [mf.nav_lookup(isin) for isin in redemptions]
+
+    cache_size = lookup_cache.maxsize
+    for label, func, cached in (
+        ("query per call", per_call(query_db), False),
+        ("query per call, cached", per_call(query_db), True),
+        ("nav_lookup", per_call(db), False),
+        ("nav_lookup_many", lambda: db.nav_lookup_many(redemptions), False),
+    ):
+        lookup_cache.resize(cache_size if cached else 0)
+        best = min(timeit.repeat(func, number=1, repeat=args.rounds))
+        print(
+            f"{label:<24} {best * 1e3:9.1f} ms  {best / len(redemptions) * 1e6:7.2f} us/redemption"
+        )
+
+
+if __name__ == "__main__":
+    main()
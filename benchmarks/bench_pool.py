@@ -0,0 +1,54 @@
+"""Per-lookup latency: pooled connections vs. connect-per-query.
+
+``connect-per-query`` reproduces the pre-pool behaviour of ``DB.run_query``
+outside a ``with`` block (resolve path, connect, query, close) so the two
+numbers can be compared on the same machine and database.
+
+Run via ``python benchmarks/bench_pool.py [--rounds N]``.
+"""
+
+import argparse
+import sqlite3
+import timeit
+
+from casparser_isin import MFISINDb
+from casparser_isin.utils import dict_factory, get_isin_db_path
+
+SQL = "SELECT name, isin, amfi_code, type FROM scheme WHERE isin = :isin ORDER BY id DESC"
+
+
+def sample_isins(limit=100):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        return [row[0] for row in conn.execute("SELECT isin FROM scheme LIMIT ?", (limit,))]
+
+
+def connect_per_query(isin):
+    conn = sqlite3.connect(get_isin_db_path())
+    conn.row_factory = dict_factory
+    cursor = conn.cursor()
+    try:
+        cursor.execute(SQL, {"isin": isin})
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    isins = sample_isins()
+    db = MFISINDb()
+    cases = {
+        "connect-per-query": lambda: [connect_per_query(isin) for isin in isins],
+        "pooled": lambda: [db.direct_isin_lookup(isin) for isin in isins],
+    }
+    for label, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.rounds))
+        print(f"{label:<20} {best / len(isins) * 1e6:8.1f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Mixed CAS ISINs: two lookups per ISIN vs. one ``AnyISINDb`` query.
+
+Samples ``--size`` ISINs from the ``scheme`` and ``isin`` tables of the DB
+at ``CASPARSER_ISIN_DB`` (or the bundled one), ~5% unknown, and resolves
+each with ``MFISINDb.direct_isin_lookup`` falling back to
+``ISINDb.isin_lookup`` (as callers did before), ``AnyISINDb.resolve`` and
+``AnyISINDb.resolve_many``. The lookup cache is disabled.
+
+Run via ``python benchmarks/bench_resolver.py [--size N] [--rounds N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import timeit
+
+from casparser_isin import AnyISINDb, ISINDb, MFISINDb
+from casparser_isin.utils import get_isin_db_path, lookup_cache
+
+
+def sample_isins(size):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        isins = [r[0] for r in conn.execute("SELECT isin FROM scheme UNION SELECT isin FROM isin")]
+    conn.close()
+    rng = random.Random(0)
+    return [rng.choice(isins) if rng.random() > 0.05 else f"INE{n:09d}" for n in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    lookup_cache.resize(0)
+    isins = sample_isins(args.size)
+    mf, securities, db = MFISINDb(), ISINDb(), AnyISINDb()
+
+    def two_lookups():
+        for isin in isins:
+            mf.direct_isin_lookup(isin) or securities.isin_lookup(isin)
+
+    def resolve():
+        for isin in isins:
+            db.resolve(isin)
+
+    for label, run in (
+        ("MF, then securities", two_lookups),
+        ("resolve", resolve),
+        ("resolve_many", lambda: db.resolve_many(isins)),
+    ):
+        best = min(timeit.repeat(run, number=1, repeat=args.rounds))
+        print(f"{label:<20} {best / len(isins) * 1e6:8.2f} µs/ISIN")
+
+
+if __name__ == "__main__":
+    main()
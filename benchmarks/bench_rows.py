@@ -0,0 +1,77 @@
+"""Per-row cost of typed row factories vs. the generic ``dict_factory`` path.
+
+``dict-rows`` reproduces the old pipeline: every row built as a dict by
+``dict_factory`` and then re-indexed into ``SchemeData``. ``typed-rows`` runs
+the same lookups the way ``isin_lookup`` does internally: plain tuples of
+:meth:`MFISINDb._scheme_columns` turned into candidates by ``_candidates``,
+so the difference is the per-row construction cost alone.
+
+Run via ``python benchmarks/bench_rows.py [--rounds N]``.
+"""
+
+import argparse
+import sqlite3
+import timeit
+
+from casparser_isin import MFISINDb, SchemeData
+from casparser_isin.mf_isin import _candidates
+from casparser_isin.utils import get_isin_db_path
+
+DIRECT_SQL = "SELECT {columns} FROM scheme WHERE isin = :isin ORDER BY id DESC"
+SCHEME_SQL = (
+    "SELECT {columns} FROM scheme WHERE rta = :rta AND rta_code = :rta_code ORDER BY id DESC"
+)
+
+
+def sample(limit=500):
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        return conn.execute(
+            "SELECT isin, rta, rta_code FROM scheme WHERE name NOT LIKE '%hdfc%' "
+            "AND rta_code NOT LIKE 'FTI%' LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+
+def as_scheme_data(rows):
+    return [
+        SchemeData(
+            name=row["name"],
+            isin=row["isin"],
+            amfi_code=row["amfi_code"],
+            type=row["type"],
+            score=100,
+        )
+        for row in rows
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = sample()
+    db = MFISINDb()
+    queries = {
+        "direct_isin_lookup": (DIRECT_SQL, [{"isin": isin} for isin, _, _ in rows]),
+        "scheme_lookup": (SCHEME_SQL, [{"rta": r, "rta_code": c} for _, r, c in rows]),
+    }
+    for name, (sql, params) in queries.items():
+        dict_sql = sql.format(columns="name, isin, amfi_code, type")
+        typed_sql = sql.format(columns=db._scheme_columns())
+        n_rows = sum(len(db.run_query(dict_sql, p)) for p in params)
+        cases = {
+            "dict-rows": lambda s=dict_sql, ps=params: [
+                as_scheme_data(db.run_query(s, p)) for p in ps
+            ],
+            "typed-rows": lambda s=typed_sql, ps=params: [
+                _candidates(db.run_query(s, p, row_factory=None)) for p in ps
+            ],
+        }
+        for label, func in cases.items():
+            best = min(timeit.repeat(func, number=1, repeat=args.rounds))
+            print(f"{name:<20} {label:<12} {best / n_rows * 1e6:8.2f} us/row")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Type-ahead scheme search: FTS5 trigram index vs. LIKE vs. scoring every name.
+
+Takes the (first ``--words``) words of scheme names sampled from the DB at
+``CASPARSER_ISIN_DB`` (or the bundled one), some cut short as if still
+being typed into a search box, and runs ``MFISINDb.search_schemes`` with the
+``scheme_fts`` index, with its ``LIKE`` fallback, and one rapidfuzz
+``extract`` over every name. Reports latency and how often the sampled
+scheme's name is among the results (only meaningful for whole names).
+
+Run via ``python benchmarks/bench_search.py [--size N] [--limit N] [--words N]``.
+"""
+
+import argparse
+import random
+import sqlite3
+import time
+
+from rapidfuzz import fuzz, process, utils
+
+from casparser_isin import MFISINDb
+from casparser_isin.utils import get_isin_db_path
+
+
+class LikeMFISINDb(MFISINDb):
+    """``search_schemes`` as on an SQLite without FTS5."""
+
+    def _scheme_fts(self):
+        return False
+
+
+def sample_queries(names, size, rng, max_words=None):
+    queries = []
+    for name in rng.sample(names, min(size, len(names))):
+        # The first max_words words, some cut short as if still being typed.
+        words = name.lower().replace("-", " ").split()[:max_words]
+        queries.append((" ".join(w[: max(3, len(w) - rng.randrange(3))] for w in words), name))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--words", type=int, default=None, help="query words (default: all)")
+    args = parser.parse_args()
+
+    path = get_isin_db_path()
+    with sqlite3.connect(path) as conn:
+        names = [r[0] for r in conn.execute("SELECT name FROM scheme WHERE name IS NOT NULL")]
+    conn.close()
+    queries = sample_queries(names, args.size, random.Random(0), args.words)
+    print(f"{len(names):,} scheme names, {path.stat().st_size / 2**20:.1f} MiB DB")
+
+    db, like = MFISINDb(), LikeMFISINDb()
+    if not db._scheme_fts():
+        print("no usable scheme_fts in this DB: both searches use LIKE")
+
+    def all_names(query):
+        matches = process.extract(
+            query, names, scorer=fuzz.WRatio, processor=utils.default_process, limit=args.limit
+        )
+        return [match[0] for match in matches]
+
+    for label, search in (
+        ("search_schemes, FTS5", lambda q: [r.name for r in db.search_schemes(q, args.limit)]),
+        ("search_schemes, LIKE", lambda q: [r.name for r in like.search_schemes(q, args.limit)]),
+        ("extract, all names", all_names),
+    ):
+        search(queries[0][0])  # build / warm up
+        start = time.perf_counter()
+        results = [search(query) for query, _ in queries]
+        elapsed = time.perf_counter() - start
+        hits = sum(name in found for found, (_, name) in zip(results, queries, strict=True))
+        print(
+            f"{label:<22} {elapsed / len(queries) * 1e3:8.3f} ms/query  "
+            f"name found {hits / len(queries):6.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Streaming lookups: memory stays flat over an arbitrarily long input.
+
+Feeds ``--size`` ISINs (or, with ``--mf``, holdings), generated lazily as a
+nightly job would read them from a file, through ``ISINDb.iter_isin_lookup``
+(``MFISINDb.iter_isin_lookup``) and prints throughput and the process's
+resident set size every ``--every`` results. For contrast, ``--list-size``
+items are then resolved the pre-streaming way: read into a list and passed
+to ``isin_lookup_many`` whole.
+
+Inputs cycle through ISINs sampled from the DB at ``CASPARSER_ISIN_DB`` (or
+the bundled one), ~5% of them unknown.
+
+Run via ``python benchmarks/bench_stream.py [--size N] [--every N] [--chunk-size N] [--mf]``.
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+
+from casparser_isin import ISINDb, MFISINDb
+from casparser_isin.utils import STREAM_CHUNK_SIZE, get_isin_db_path
+
+
+def rss_mib():
+    with open("/proc/self/statm") as fp:
+        return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def sample_isins(mf, size=20_000):
+    table = "scheme" if mf else "isin"
+    with sqlite3.connect(get_isin_db_path()) as conn:
+        isins = [r[0] for r in conn.execute(f"SELECT DISTINCT isin FROM {table} WHERE isin != ''")]
+    conn.close()
+    rng = random.Random(0)
+    return [rng.choice(isins) if rng.random() > 0.05 else f"INE{n:08d}X" for n in range(size)]
+
+
+def lines(pool, size, mf):
+    """``size`` inputs, made one at a time like lines read from a file."""
+    for n in range(size):
+        isin = pool[n % len(pool)]
+        yield ("Some Fund - Growth", "CAMS", f"C{n % 997}", isin) if mf else isin
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000_000)
+    parser.add_argument("--every", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE)
+    parser.add_argument("--list-size", type=int, default=1_000_000)
+    parser.add_argument("--mf", action="store_true", help="MFISINDb holdings, not ISINDb ISINs")
+    args = parser.parse_args()
+
+    pool = sample_isins(args.mf)
+    db = MFISINDb() if args.mf else ISINDb()
+    print(f"start{'':<15} rss {rss_mib():7.1f} MiB")
+    start = time.perf_counter()
+    results = db.iter_isin_lookup(lines(pool, args.size, args.mf), chunk_size=args.chunk_size)
+    for n, _ in enumerate(results, 1):
+        if n % args.every == 0 or n == args.size:
+            elapsed = time.perf_counter() - start
+            print(f"{n:>12,} items  rss {rss_mib():7.1f} MiB  {n / elapsed:10,.0f} items/s")
+
+    if args.list_size:
+        before = rss_mib()
+        start = time.perf_counter()
+        items = list(lines(pool, args.list_size, args.mf))
+        found = db.isin_lookup_many(items)
+        elapsed = time.perf_counter() - start
+        print(
+            f"list + isin_lookup_many, {len(items):,} items: rss +{rss_mib() - before:.1f} MiB  "
+            f"{len(items) / elapsed:10,.0f} items/s"
+        )
+        del items, found
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,49 @@
-from .isin import ISINData, ISINDb
-from .mf_isin import MFISINDb, SchemeData
+from typing import TYPE_CHECKING
 
 __all__ = [
     "MFISINDb",
     "SchemeData",
     "ISINDb",
     "ISINData",
+    "AnyISINDb",
+    "ResolvedISIN",
+    "AsyncMFISINDb",
+    "AsyncISINDb",
     "__version__",
 ]
 
 __version__ = "2026.5.1"
+
+# Public classes are imported on first access (PEP 562), so `import
+# casparser_isin` (e.g. by the CLI) doesn't pay for sqlite3 or rapidfuzz.
+_LAZY = {
+    "AnyISINDb": ".resolver",
+    "AsyncISINDb": ".aio",
+    "AsyncMFISINDb": ".aio",
+    "ISINData": ".isin",
+    "ISINDb": ".isin",
+    "MFISINDb": ".mf_isin",
+    "ResolvedISIN": ".resolver",
+    "SchemeData": ".mf_isin",
+}
+
+if TYPE_CHECKING:
+    from .aio import AsyncISINDb, AsyncMFISINDb
+    from .isin import ISINData, ISINDb
+    from .mf_isin import MFISINDb, SchemeData
+    from .resolver import AnyISINDb, ResolvedISIN
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
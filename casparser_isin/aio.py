@@ -0,0 +1,114 @@
+"""
+asyncio front-ends for :class:`~casparser_isin.MFISINDb` and :class:`~casparser_isin.ISINDb`.
+
+Lookups run on a small thread pool owned by each instance, so SQLite I/O and
+rapidfuzz scoring never block the event loop. Every executor thread gets its
+own pooled connection (see :class:`~casparser_isin.utils.ConnectionPool`).
+Concurrent identical requests share one in-flight lookup::
+
+    async with AsyncMFISINDb() as db:
+        scheme = await db.isin_lookup(name, rta, rta_code, isin=isin)
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from .isin import ISINData, ISINDb
+from .mf_isin import MFISINDb, SchemeData, _check_lookup_args, _lookup_key
+
+# SQLite reads release the GIL, but lookups are short; a few threads are
+# enough to keep the event loop from ever waiting on one.
+DEFAULT_MAX_WORKERS = 4
+
+
+class _AsyncDB:
+    """
+    Runs lookups of a synchronous :class:`~casparser_isin.utils.DB` on a
+    dedicated, bounded executor.
+
+    :param max_workers: executor threads (default :data:`DEFAULT_MAX_WORKERS`).
+    :param in_memory: passed through to the synchronous DB class.
+    """
+
+    db_class: type
+
+    def __init__(self, max_workers: int | None = None, in_memory: bool | None = None):
+        self.db = self.db_class(in_memory=in_memory)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or DEFAULT_MAX_WORKERS,
+            thread_name_prefix="casparser-isin",
+        )
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Shut down the executor once queued lookups have finished."""
+        await asyncio.to_thread(self._executor.shutdown)
+
+    async def _run(self, name: str, key: tuple, func, *args):
+        """
+        Await ``func(*args)`` on the executor, joining an identical in-flight
+        call (same ``name`` and ``key``) if there is one.
+        """
+        loop = asyncio.get_running_loop()
+        flight = (loop, name, key)
+        future = self._inflight.get(flight)
+        if future is None:
+            future = loop.run_in_executor(self._executor, functools.partial(func, *args))
+            self._inflight[flight] = future
+            future.add_done_callback(lambda _: self._inflight.pop(flight, None))
+        # Shielded so one cancelled caller doesn't cancel the lookup for the others.
+        return await asyncio.shield(future)
+
+
+class AsyncMFISINDb(_AsyncDB):
+    """asyncio variant of :class:`~casparser_isin.MFISINDb`."""
+
+    db_class = MFISINDb
+
+    async def isin_lookup(
+        self,
+        scheme_name: str,
+        rta: str,
+        rta_code: str,
+        isin: str | None = None,
+        min_score: int = 60,
+        fuzzy_fallback: bool = False,
+    ) -> SchemeData:
+        """See :meth:`MFISINDb.isin_lookup <casparser_isin.MFISINDb.isin_lookup>`."""
+        _check_lookup_args(scheme_name, rta, rta_code, isin)
+        args = (scheme_name, rta, rta_code, isin, min_score, fuzzy_fallback)
+        return await self._run("isin_lookup", _lookup_key(*args), self.db.isin_lookup, *args)
+
+    async def scheme_lookup(self, rta: str, scheme_name: str, rta_code: str) -> list[dict]:
+        """See :meth:`MFISINDb.scheme_lookup <casparser_isin.MFISINDb.scheme_lookup>`."""
+        key = (rta, scheme_name, rta_code)
+        # Coalesced callers share one result; give each its own rows.
+        rows = await self._run("scheme_lookup", key, self.db.scheme_lookup, *key)
+        return [dict(row) for row in rows]
+
+    async def direct_isin_lookup(self, isin: str) -> list[dict]:
+        """See :meth:`MFISINDb.direct_isin_lookup <casparser_isin.MFISINDb.direct_isin_lookup>`."""
+        rows = await self._run("direct_isin_lookup", (isin,), self.db.direct_isin_lookup, isin)
+        return [dict(row) for row in rows]
+
+    async def nav_lookup(self, isin: str) -> Decimal | None:
+        """See :meth:`MFISINDb.nav_lookup <casparser_isin.MFISINDb.nav_lookup>`."""
+        return await self._run("nav_lookup", (isin,), self.db.nav_lookup, isin)
+
+
+class AsyncISINDb(_AsyncDB):
+    """asyncio variant of :class:`~casparser_isin.ISINDb`."""
+
+    db_class = ISINDb
+
+    async def isin_lookup(self, isin: str) -> ISINData | None:
+        """See :meth:`ISINDb.isin_lookup <casparser_isin.ISINDb.isin_lookup>`."""
+        return await self._run("isin_lookup", (isin,), self.db.isin_lookup, isin)
@@ -0,0 +1,96 @@
+"""
+Bloom filters that answer "definitely not in the database" without a query.
+
+The DB builder (``tools/update_isin_db.py``) stores one filter per lookup
+key set in the ``bloom`` table; databases built before that table existed
+simply get no fast path.
+"""
+
+import math
+import sqlite3
+import zlib
+from collections.abc import Iterable
+
+# ~0.8% false positives at 1.25 bytes per key.
+BITS_PER_KEY = 10
+
+
+def _hashes(key: str) -> tuple[int, int]:
+    # Two 32-bit hashes for double hashing. crc32 is stable across processes
+    # (unlike hash()), so filters can be shipped in the DB, and is several
+    # times cheaper than a cryptographic digest; the second hash is seeded
+    # with the first and multiplied to break crc32's linearity.
+    data = key.encode()
+    h1 = zlib.crc32(data)
+    return h1, (zlib.crc32(data, h1) * 0x9E3779B1) & 0xFFFFFFFF | 1
+
+
+class BloomFilter:
+    """
+    Set-membership filter with no false negatives.
+
+    :param bits: filter bit array, bit ``i`` being ``bits[i >> 3] & (1 << (i & 7))``.
+    :param k: number of hash functions.
+    :param n: number of keys the filter was built from.
+    """
+
+    __slots__ = ("bits", "k", "n", "_m")
+
+    def __init__(self, bits: bytes, k: int, n: int):
+        self.bits = bits
+        self.k = k
+        self.n = n
+        self._m = len(bits) * 8
+
+    @classmethod
+    def from_keys(cls, keys: Iterable[str], bits_per_key: int = BITS_PER_KEY) -> "BloomFilter":
+        """Build a filter sized for ``keys`` (duplicates are counted once)."""
+        keys = set(keys)
+        m = max(len(keys) * bits_per_key, 64)
+        k = max(1, round(bits_per_key * math.log(2)))
+        bits = bytearray((m + 7) // 8)
+        m = len(bits) * 8
+        for key in keys:
+            h1, h2 = _hashes(key)
+            for i in range(k):
+                pos = (h1 + i * h2) % m
+                bits[pos >> 3] |= 1 << (pos & 7)
+        return cls(bytes(bits), k, len(keys))
+
+    def __contains__(self, key: str) -> bool:
+        h1, h2 = _hashes(key)
+        bits, m = self.bits, self._m
+        for i in range(self.k):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self.bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected probability that an absent key is reported as present."""
+        return (1 - math.exp(-self.k * self.n / self._m)) ** self.k
+
+    def __repr__(self):
+        return (
+            f"BloomFilter(n={self.n}, k={self.k}, nbytes={self.nbytes}, "
+            f"fpr={self.false_positive_rate:.4f})"
+        )
+
+
+def load_bloom_filter(connection: sqlite3.Connection, name: str) -> BloomFilter | None:
+    """Read filter ``name`` from the ``bloom`` table, or ``None`` if the DB has none."""
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    try:
+        row = cursor.execute("SELECT bits, k, n FROM bloom WHERE name = ?", (name,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    if row is None:
+        return None
+    return BloomFilter(bytes(row[0]), row[1], row[2])
@@ -0,0 +1,105 @@
+"""
+Bulk MF ISIN resolution on a process pool, for re-resolving archives of
+holdings that one process can't get through fast enough::
+
+    from casparser_isin.bulk import isin_lookup_bulk
+
+    for holding, result in zip(holdings, isin_lookup_bulk(holdings)):
+        ...
+
+Input is read lazily in chunks of :data:`DEFAULT_CHUNK_SIZE` items. Each
+chunk is resolved by :meth:`MFISINDb.isin_lookup_many
+<casparser_isin.MFISINDb.isin_lookup_many>` in a worker process that holds its
+own read-only connection, and results are yielded in input order. At most
+``max_pending`` chunks are in flight, so neither the input nor the results
+are ever held in memory in full.
+"""
+
+import functools
+import multiprocessing
+import os
+import pathlib
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from .mf_isin import MFISINDb, SchemeData
+from .utils import _chunks
+
+# Large enough that pickling and IPC overhead is small next to the lookups,
+# small enough to keep every worker busy near the end of the input.
+DEFAULT_CHUNK_SIZE = 2000
+
+_worker_db: MFISINDb | None = None
+
+
+def _init_worker(db_path: str, in_memory: bool):
+    global _worker_db
+    _worker_db = MFISINDb(in_memory=in_memory)
+    # Resolve against the parent's database, whatever the worker's environment says.
+    _worker_db._db_path = pathlib.Path(db_path)
+
+
+def _resolve_chunk(chunk: list, min_score: int, fuzzy_fallback: bool) -> list:
+    return _worker_db.isin_lookup_many(chunk, min_score=min_score, fuzzy_fallback=fuzzy_fallback)
+
+
+def isin_lookup_bulk(
+    items: Iterable[tuple[str, str, str, str | None]],
+    min_score: int = 60,
+    fuzzy_fallback: bool = False,
+    max_workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending: int | None = None,
+    in_memory: bool | None = None,
+    mp_context=None,
+) -> Iterator[SchemeData | Exception]:
+    """
+    Resolve ``(scheme_name, rta, rta_code, isin)`` tuples on a process pool.
+
+    Yields exactly what :meth:`MFISINDb.isin_lookup_many
+    <casparser_isin.MFISINDb.isin_lookup_many>` returns for each item, in
+    input order: the matching :class:`~casparser_isin.SchemeData` or the
+    exception :meth:`~casparser_isin.MFISINDb.isin_lookup` would have raised.
+
+    :param items: holdings; any iterable, consumed as results are taken.
+    :param min_score: as for :meth:`~casparser_isin.MFISINDb.isin_lookup`.
+    :param fuzzy_fallback: as for :meth:`~casparser_isin.MFISINDb.isin_lookup`.
+    :param max_workers: worker processes (default: one per CPU).
+    :param chunk_size: items sent to a worker at a time.
+    :param max_pending: chunks submitted but not yet yielded (default: two per
+        worker). Input is not read further ahead than this.
+    :param in_memory: as for :class:`~casparser_isin.MFISINDb`, per worker.
+    :param mp_context: :mod:`multiprocessing` context for the pool. Defaults
+        to ``spawn``, which behaves the same on every platform; scripts using
+        it need the usual ``if __name__ == "__main__":`` guard. ``fork``
+        works too: forked workers drop the parent's pooled connections.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    max_workers = max_workers or os.cpu_count() or 1
+    db = MFISINDb(in_memory=in_memory)
+    pool_args = {
+        "max_workers": max_workers,
+        "mp_context": mp_context or multiprocessing.get_context("spawn"),
+        "initializer": _init_worker,
+        "initargs": (str(db.db_path), db.in_memory),
+    }
+    resolve = functools.partial(_resolve_chunk, min_score=min_score, fuzzy_fallback=fuzzy_fallback)
+    return _stream(items, chunk_size, max_pending or 2 * max_workers, resolve, pool_args)
+
+
+def _stream(items, chunk_size, max_pending, resolve, pool_args):
+    # A generator of its own, so isin_lookup_bulk checks its arguments on call.
+    executor = ProcessPoolExecutor(**pool_args)
+    pending = deque()
+    try:
+        for chunk in _chunks(items, chunk_size):
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+            pending.append(executor.submit(resolve, chunk))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Also runs when the caller stops early: drop chunks nobody will read.
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -1,17 +1,15 @@
 import argparse
-import hashlib
 import logging
 import os
 import sqlite3
 import sys
-import tempfile
-from urllib import request
 from urllib.error import HTTPError
 
-from packaging import version
-
 from . import __version__
-from .utils import get_isin_db_path
+from .utils import connection_pool, get_isin_db_path
+
+# packaging, urllib.request (http.client, ssl) and hashlib are imported in the
+# functions that need them, so `--help` and a plain import start fast.
 
 META_URL = "https://casparser.atomcoder.com/isin.db.meta"
 DB_URL = "https://casparser.atomcoder.com/isin.db"
@@ -21,8 +19,14 @@ DB_URL = "https://casparser.atomcoder.com/isin.db"
 # bytes straight from socket to disk.
 _DOWNLOAD_CHUNK = 1024 * 1024
 
+# Database formats this version reads, so --update may move between them:
+# format 3 natively, format 2 via the lookups' column / index feature checks.
+SUPPORTED_DBFORMATS = ("2", "3")
+
 
 def get_metadata():
+    from packaging import version
+
     conn = sqlite3.connect(get_isin_db_path())
     cursor = conn.cursor()
     try:
@@ -48,6 +52,8 @@ def print_version():
 
 
 def build_request(url):
+    from urllib import request
+
     hdr = {
         "User-Agent": f"casparser-isin/{__version__}",
         "X-origin-casparser": "true",
@@ -56,6 +62,10 @@ def build_request(url):
 
 
 def get_isin_db_details():
+    from urllib import request
+
+    from packaging import version
+
     local_meta = get_metadata()
     remote_meta = None
     logging.info("Fetching remote isin db metadata")
@@ -78,6 +88,22 @@ def get_isin_db_details():
     return remote_meta, local_meta
 
 
+def _update_available(remote_meta, local_meta) -> bool:
+    """Whether the remote DB is newer than the local one and in a format this version reads."""
+    from packaging import version
+
+    if remote_meta is None or remote_meta["version"] <= local_meta["version"]:
+        return False
+    if remote_meta["dbformat"] not in {version.parse(f) for f in SUPPORTED_DBFORMATS}:
+        logging.info(
+            "Remote database format %s is not supported by this version; "
+            "upgrade casparser-isin to use it.",
+            remote_meta["dbformat"],
+        )
+        return False
+    return True
+
+
 def check_isin_db():
     """Compare remote and local db versions
     Return code:
@@ -85,11 +111,7 @@ def check_isin_db():
     1 - new database available
     """
     remote_meta, local_meta = get_isin_db_details()
-    if (
-        remote_meta is not None
-        and remote_meta["version"] > local_meta["version"]
-        and remote_meta["dbformat"] == local_meta["dbformat"]
-    ):
+    if _update_available(remote_meta, local_meta):
         logging.info("To update the database, re-run the command with --update flag.")
         sys.exit(1)
     else:
@@ -107,6 +129,10 @@ def _download_to_temp(url: str, dest_dir, *, expected_sha256: str | None = None)
     ``expected_sha256`` is supplied, the download is verified and the temp file
     deleted on mismatch.
     """
+    import hashlib
+    import tempfile
+    from urllib import request
+
     fd, tmp_path = tempfile.mkstemp(prefix="isin.db.", suffix=".tmp", dir=str(dest_dir))
     sha = hashlib.sha256()
     try:
@@ -136,10 +162,7 @@ def update_isin_db():
     remote_meta, local_meta = get_isin_db_details()
     if remote_meta is None:
         return
-    elif (
-        remote_meta["version"] > local_meta["version"]
-        and remote_meta["dbformat"] == local_meta["dbformat"]
-    ):
+    elif _update_available(remote_meta, local_meta):
         logging.info("Fetching database version :: %s", remote_meta["version"])
         dest = get_isin_db_path()
         dest_dir = dest.parent
@@ -162,6 +185,8 @@ def update_isin_db():
         # the same filesystem (guaranteed because the temp file was created in
         # dest_dir).
         os.replace(tmp_path, dest)
+        # Reconnect so this process reads (and caches results from) the new file.
+        connection_pool.clear()
         logging.info("Updated casparser-isin database.")
     else:
         logging.info("casparser-isin database is already upto date")
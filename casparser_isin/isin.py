@@ -1,6 +1,14 @@
+import itertools
+import re
+from collections.abc import Iterable, Iterator
 from typing import NamedTuple
 
-from .utils import DB
+from .utils import BATCH_SIZE, DB, STREAM_CHUNK_SIZE, _chunks
+
+_BASE36 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_ISIN_RE = re.compile(r"[A-Z0-9]{12}")
+# Most isin_fts hits ISINDb.search reads per query (bounds its memory use).
+_FTS_PAGE_MAX = 128 * BATCH_SIZE
 
 
 class ISINData(NamedTuple):
@@ -11,6 +19,34 @@ class ISINData(NamedTuple):
     status: str
 
 
+def _isin_data_factory(cursor, row):
+    return ISINData._make(row)
+
+
+def isin_rowid(isin: str) -> int | None:
+    """
+    ``isin`` as a base-36 integer: the rowid of its ``isin_fts`` entry.
+
+    Any 12-character ISIN fits in SQLite's signed 64-bit rowid, and rowid
+    order is ISIN order. None for values that aren't 12 upper-case
+    alphanumerics (those are not in ``isin_fts``).
+    """
+    return int(isin, 36) if _ISIN_RE.fullmatch(isin) else None
+
+
+def _rowid_isin(rowid: int) -> str:
+    chars = []
+    for _ in range(12):
+        rowid, digit = divmod(rowid, 36)
+        chars.append(_BASE36[digit])
+    return "".join(reversed(chars))
+
+
+def _like(term: str) -> str:
+    """A ``LIKE ... ESCAPE '\\'`` pattern matching ``term`` anywhere."""
+    return "%" + re.sub(r"([%_\\])", r"\\\1", term) + "%"
+
+
 class ISINDb(DB):
     """ISIN database for all instruments."""
 
@@ -21,8 +57,150 @@ class ISINDb(DB):
         :param isin: ISIN code
         :return: ISINData if found, else None.
         """
+        return self.cached("isin_lookup", (isin,), lambda: self._isin_lookup(isin))
+
+    def _isin_lookup(self, isin: str) -> ISINData | None:
+        if not self.may_contain("isin", isin):
+            return None
         sql = "SELECT isin, name, issuer, type, status FROM isin WHERE isin = :isin"
-        row = self.run_query(sql, {"isin": isin}, fetchone=True)
-        if row is not None:
-            return ISINData(**row)
-        return None
+        return self.run_query(sql, {"isin": isin}, fetchone=True, row_factory=_isin_data_factory)
+
+    def isin_lookup_many(self, isins: Iterable[str]) -> dict[str, ISINData | None]:
+        """
+        Lookup many ISINs with a handful of set-based queries.
+
+        Duplicate ISINs are resolved once; ISINs are fetched in chunks of
+        :data:`~casparser_isin.utils.BATCH_SIZE` via ``WHERE isin IN (...)``.
+
+        :param isins: ISIN codes
+        :return: ``{isin: ISINData or None}`` for every distinct input ISIN, in
+            first-seen order.
+        """
+        results: dict[str, ISINData | None] = dict.fromkeys(isins)
+        sql = "SELECT isin, name, issuer, type, status FROM isin WHERE isin IN ({params})"
+        present = self.may_contain_many("isin", results)
+        for row in self.run_batch_query(sql, present, row_factory=_isin_data_factory):
+            results[row.isin] = row
+        return results
+
+    def iter_isin_lookup(
+        self, isins: Iterable[str], chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> Iterator[ISINData | None]:
+        """
+        Lookup every ISIN of a possibly unbounded iterable, e.g. a file's lines.
+
+        ``isins`` is read ``chunk_size`` ISINs at a time, as results are
+        taken, and each chunk is resolved by :meth:`isin_lookup_many`, so
+        memory use is bounded by the chunk size, not the input's length.
+
+        :param isins: ISIN codes
+        :param chunk_size: ISINs read and resolved at a time.
+        :return: iterator of ``ISINData`` or None per input ISIN, in input order.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        return itertools.chain.from_iterable(map(self._lookup_chunk, _chunks(isins, chunk_size)))
+
+    def _lookup_chunk(self, isins: list[str]) -> list[ISINData | None]:
+        results = self.isin_lookup_many(isins)
+        return [results[isin] for isin in isins]
+
+    def search(
+        self,
+        name: str | None = None,
+        issuer: str | None = None,
+        type: str | None = None,
+        status: str | None = None,
+        issuer_code: str | None = None,
+    ) -> Iterator[ISINData]:
+        """
+        Find ISINs by name, issuer, type, status and/or issuer code.
+
+        Every given criterion must match: each word of ``name`` / ``issuer``
+        must appear in that column (case-insensitive), ``type`` and
+        ``status`` must be equal (e.g. ``"DEBENTURE"``, ``"ACTIVE"``), and
+        ``issuer_code`` is the 4-character issuer code in ISIN characters
+        4-7 (``"009A"`` for ``INE009A01021``).
+
+        Issuer codes are looked up in an expression index. Otherwise name and
+        issuer words are looked up in the DB's full-text index (``isin_fts``),
+        as type-ahead input: whole words, bar the last of each, which may be
+        the start of a word. ``type`` / ``status`` alone, or word searches on
+        an SQLite without FTS5, scan the table, matching words anywhere.
+
+        Results are read :data:`~casparser_isin.utils.BATCH_SIZE` at a time,
+        so large result sets stream; other lookups may run between items.
+
+        :return: generator of matching :class:`ISINData`, in ISIN order.
+        :raises ValueError: if no criterion is given.
+        """
+        where, args = [], []
+        for column, text in (("name", name), ("issuer", issuer)):
+            for term in (text or "").split():
+                where.append(f"{column} LIKE ? ESCAPE '\\'")
+                args.append(_like(term))
+        for column, value in (("type", type), ("status", status)):
+            if value:
+                where.append(f"{column} = ?")
+                args.append(value.upper())
+        if issuer_code:
+            where.append("substr(isin, 4, 4) = ?")
+            args.append(issuer_code.upper())
+        if not where:
+            raise ValueError("search needs at least one criterion")
+        if issuer_code is None and (name or issuer) and self.has_fts("isin_fts"):
+            terms = []
+            for text in (name, issuer):
+                words = re.findall(r"[^\W_]+", text or "")
+                terms += [f'"{word}"' for word in words[:-1]]
+                terms += [f'"{word}"*' for word in words[-1:]]
+            if terms:
+                return self._search_fts(" ".join(terms), where, args)
+        return self._search_scan(where, args)
+
+    def _search_fts(self, match: str, where: list[str], args: list) -> Iterator[ISINData]:
+        """
+        Page through ``isin_fts`` hits for the FTS5 query ``match`` (its words
+        may be in either column: the index keeps no column details), then
+        check every criterion on the hits' rows,
+        :data:`~casparser_isin.utils.BATCH_SIZE` at a time.
+
+        FTS5 re-reads a prefix's whole doclist for every page, so pages start
+        at one batch and double, up to :data:`_FTS_PAGE_MAX` hits.
+        """
+        sql = (
+            "SELECT isin, name, issuer, type, status FROM isin "
+            f"WHERE isin IN ({{params}}) AND {' AND '.join(where)} ORDER BY isin"
+        )
+        after, page = -1, BATCH_SIZE
+        while True:
+            rowids = self.run_query(
+                "SELECT rowid FROM isin_fts WHERE isin_fts MATCH ? AND rowid > ? "
+                "ORDER BY rowid LIMIT ?",
+                (match, after, page),
+                row_factory=None,
+            )
+            for start in range(0, len(rowids), BATCH_SIZE):
+                isins = [_rowid_isin(rowid) for (rowid,) in rowids[start : start + BATCH_SIZE]]
+                statement = sql.format(params=", ".join("?" * len(isins)))
+                yield from self.run_query(statement, isins + args, row_factory=_isin_data_factory)
+            if len(rowids) < page:
+                return
+            after, page = rowids[-1][0], min(page * 2, _FTS_PAGE_MAX)
+
+    def _search_scan(self, where: list[str], args: list) -> Iterator[ISINData]:
+        """
+        Page through matching rows in ISIN order: over the issuer code
+        expression index if ``where`` has that criterion, else the table.
+        """
+        sql = (
+            "SELECT isin, name, issuer, type, status FROM isin "
+            f"WHERE isin > ? AND {' AND '.join(where)} ORDER BY isin LIMIT ?"
+        )
+        after = ""
+        while True:
+            rows = self.run_query(sql, [after, *args, BATCH_SIZE], row_factory=_isin_data_factory)
+            yield from rows
+            if len(rows) < BATCH_SIZE:
+                return
+            after = rows[-1].isin
@@ -0,0 +1,86 @@
+"""
+Grandfathered cost of acquisition for LTCG on equity-oriented funds.
+
+Units bought on or before 31-Jan-2018 and sold from 1-Apr-2018 are
+grandfathered (section 112A): their cost of acquisition is the higher of the
+actual cost and the lower of the fair market value on 31-Jan-2018 (the NAV
+in the ``nav20180131`` table) and the sale value.
+
+:func:`grandfathered_cost` computes it for many lots at once, as exact
+``Decimal`` values. NumPy arrays and pandas Series (e.g. columns of a
+DataFrame) are accepted and converted to lists first: array operations over
+``Decimal`` objects (``dtype=object``) are no faster than the list path.
+"""
+
+import datetime
+from collections.abc import Mapping, Sequence
+from decimal import Decimal
+
+GRANDFATHERING_DATE = datetime.date(2018, 1, 31)
+
+
+def _lot_cost(nav, purchase_date, purchase_nav, units, sale_nav):
+    if nav is None or purchase_date > GRANDFATHERING_DATE:
+        return units * purchase_nav
+    basis = nav if sale_nav is None or nav <= sale_nav else sale_nav
+    return units * (purchase_nav if purchase_nav >= basis else basis)
+
+
+def _python_costs(navs, purchase_dates, purchase_navs, units, sale_navs):
+    if sale_navs is None:
+        sale_navs = [None] * len(navs)
+    return list(map(_lot_cost, navs, purchase_dates, purchase_navs, units, sale_navs))
+
+
+def _as_list(column):
+    """``column`` as a list, with NumPy datetimes as :class:`datetime.date`."""
+    if not hasattr(column, "__array__"):
+        return column
+    import numpy as np
+
+    array = np.asarray(column)
+    if array.dtype.kind == "M":
+        array = array.astype("datetime64[D]")
+    return array.tolist()
+
+
+def grandfathered_cost(
+    navs: Mapping[str, Decimal],
+    isins: Sequence[str],
+    purchase_dates: Sequence[datetime.date],
+    purchase_navs: Sequence[Decimal],
+    units: Sequence[Decimal],
+    sale_navs: Sequence[Decimal] | None = None,
+) -> list[Decimal]:
+    """
+    Cost of acquisition of each lot, grandfathered where it applies.
+
+    Per lot: ``units * max(purchase_nav, min(nav, sale_nav))`` if it was
+    bought on or before 31-Jan-2018 and ``navs`` has a NAV for its ISIN, else
+    ``units * purchase_nav``. Without ``sale_navs`` the sale value is taken
+    to be at least the fair market value, i.e. ``units * max(purchase_nav, nav)``.
+
+    Only equity-oriented lots sold from 1-Apr-2018 are grandfathered;
+    selecting those is up to the caller.
+
+    :param navs: ``{isin: NAV on 31-Jan-2018}``.
+    :param isins: ISIN of each lot.
+    :param purchase_dates: purchase date of each lot.
+    :param purchase_navs: purchase NAV (price per unit) of each lot.
+    :param units: units in each lot.
+    :param sale_navs: optional sale NAV of each lot.
+    :return: exact ``Decimal`` cost of each lot, in order.
+    :raises ValueError: if the sequences differ in length.
+    """
+    columns = [isins, purchase_dates, purchase_navs, units]
+    if sale_navs is not None:
+        columns.append(sale_navs)
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("all lot sequences must have the same length")
+    isins, purchase_dates, purchase_navs, units = map(
+        _as_list, (isins, purchase_dates, purchase_navs, units)
+    )
+    if sale_navs is not None:
+        sale_navs = _as_list(sale_navs)
+    lot_navs = list(map(navs.get, isins))
+    return _python_costs(lot_navs, purchase_dates, purchase_navs, units, sale_navs)
@@ -1,11 +1,18 @@
+import datetime
+import functools
+import itertools
 import logging
 import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+from types import MappingProxyType
 from typing import NamedTuple
 
-from rapidfuzz import fuzz, process, utils
-
-from .utils import DB
+from .ltcg import grandfathered_cost
+from .utils import DB, STREAM_CHUNK_SIZE, _chunks, connection_pool
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +24,18 @@ RTA_MAP = {
     "KARVY": "KARVY",
 }
 
-# Scheme types use a token_sort_ratio match because RTA-emitted scheme names
-# regularly reorder modifiers ("Direct Growth" vs "Growth - Direct Plan").
-_FUZZ_SCORER = fuzz.token_sort_ratio
+# Sorts after every string that starts with a given prefix: the exclusive
+# upper bound of an indexable prefix range ``prefix <= col < prefix + _MAX_CHAR``.
+_MAX_CHAR = "\U0010ffff"
+
+# Candidate count from which fuzzy matching scores stored keys with plain
+# ``ratio`` against a Python-built query key (see _pick_scheme).
+_SORTED_QUERY_MIN = 4
+
+
+# Matching names that search_schemes re-ranks with rapidfuzz (~1 ms of
+# scoring); a query matching more only sees the newest.
+SEARCH_CANDIDATES = 200
 
 
 class SchemeData(NamedTuple):
@@ -30,20 +46,268 @@ class SchemeData(NamedTuple):
     score: int
 
 
+_tuple_new = tuple.__new__
+
+
+class _Candidates(list):
+    """
+    Candidate :class:`SchemeData` rows plus the builder's ``scheme.fuzzy_key``
+    for each (dbformat 3), so fuzzy disambiguation never re-processes names
+    that come straight from the DB.
+    """
+
+    __slots__ = ("fuzzy_keys",)
+
+
+def _candidates(rows: list[tuple]) -> list[SchemeData]:
+    """
+    Build candidates from rows that start with
+    :meth:`MFISINDb._scheme_columns`; an exact match scores 100 until fuzzy
+    disambiguation says otherwise.
+    """
+    # tuple.__new__ skips the namedtuple's Python-level __new__.
+    candidates = _Candidates([_tuple_new(SchemeData, (r[0], r[1], r[2], r[3], 100)) for r in rows])
+    candidates.fuzzy_keys = [r[4] for r in rows] if rows and rows[0][4] is not None else None
+    return candidates
+
+
+def _scheme_dicts(rows: list[SchemeData]) -> list[dict]:
+    """Rows as the dicts :meth:`MFISINDb.direct_isin_lookup` / ``scheme_lookup`` return."""
+    return [{"name": r[0], "isin": r[1], "amfi_code": r[2], "type": r[3]} for r in rows]
+
+
+def _load_navs(connection) -> Mapping[str, Decimal]:
+    cursor = connection.cursor()
+    cursor.row_factory = None
+    rows = cursor.execute("SELECT isin, nav FROM nav20180131")
+    return MappingProxyType({isin: Decimal(nav) for isin, nav in rows})
+
+
+def _check_lookup_args(scheme_name, rta, rta_code, isin=None):
+    if not (isinstance(scheme_name, str) and isinstance(rta, str) and isinstance(rta_code, str)):
+        raise TypeError("Invalid input")
+    if not (isin is None or isinstance(isin, str)):
+        raise TypeError("Invalid input")
+    if rta.upper() not in RTA_MAP:
+        raise ValueError(f"Invalid RTA : {rta}")
+
+
+def normalize_rta_code(rta_code: str) -> str:
+    """
+    Lookup key for an RTA code: whitespace removed and upper-cased.
+
+    The DB builder stores this for every row in ``scheme.rta_code_key``
+    (dbformat 3), so statement spellings like ``"117 ebrgg"`` match
+    ``117EBRGG`` with a plain equality probe.
+    """
+    return re.sub(r"\s+", "", rta_code).upper()
+
+
+def fuzzy_key(scheme_name: str) -> str:
+    """
+    Scheme name as ``fuzz.token_sort_ratio`` compares it: rapidfuzz's
+    ``default_process``, then tokens sorted and joined by single spaces.
+
+    The DB builder stores this for every row in ``scheme.fuzzy_key``
+    (dbformat 3); ``fuzz.ratio`` on two keys equals ``token_sort_ratio`` on
+    the original names.
+    """
+    from rapidfuzz import utils
+
+    return " ".join(sorted(utils.default_process(scheme_name).split()))
+
+
+def _is_franklin(rta: str, rta_code: str) -> bool:
+    """Franklin codes (``FTInnn``) may be filed under CAMS but live under the FRANKLIN RTA."""
+    return re.search(r"fti(\d+)", rta_code, re.I) is not None and rta.upper() in (
+        "CAMS",
+        "FRANKLIN",
+        "FTAMIL",
+    )
+
+
+def _normalize_name(scheme_name: str) -> str:
+    """Cache-key form of ``scheme_name``: lookups only ever see it case- and spacing-blind."""
+    return " ".join(scheme_name.lower().split())
+
+
+def _lookup_key(scheme_name, rta, rta_code, isin, min_score, fuzzy_fallback=False) -> tuple:
+    """Key under which equal :meth:`MFISINDb.isin_lookup` calls are cached or coalesced."""
+    return (
+        _normalize_name(scheme_name),
+        rta.upper(),
+        re.sub(r"\s+", "", rta_code),
+        isin,
+        min_score,
+        fuzzy_fallback,
+    )
+
+
+def _newest_first(groups: dict) -> dict[object, list[tuple]]:
+    """
+    Turn ``{key: [(id, row), ...]}`` into ``{key: [row, ...]}`` ordered by
+    ``id DESC``, as the single-item queries return them.
+
+    Batched ``IN (...)`` queries sort here rather than in SQL, where the
+    ``ORDER BY`` would need a temp B-tree over the whole result.
+    """
+    return {
+        key: [row for _, row in sorted(rows, key=itemgetter(0), reverse=True)]
+        for key, rows in groups.items()
+    }
+
+
+def _first_match(
+    rows: dict[tuple[str, str], list[tuple]], keys: list[tuple[str, str]], franklin: bool
+) -> list[SchemeData]:
+    """Candidates of the first of ``keys`` that has any (see :meth:`MFISINDb._code_candidates`)."""
+    for n, key in enumerate(keys):
+        if rows.get(key):
+            # The Franklin query never had an ORDER BY and returned rows oldest first.
+            return _candidates(rows[key][::-1] if franklin and n == 0 else rows[key])
+    return []
+
+
+def _pick_scheme(
+    scheme_name: str, results: list[SchemeData], match_path: str, min_score: int
+) -> SchemeData | None:
+    """Pick the single best candidate, fuzzy-matching on ``scheme_name`` if needed."""
+    if len(results) == 1:
+        result = results[0]
+        logger.debug(
+            "isin_lookup matched via %s: isin=%s name=%r",
+            match_path,
+            result.isin,
+            result.name,
+        )
+        return result
+
+    if len(results) > 1:
+        # Path 3: fuzzy disambiguation within the candidate set. rapidfuzz is
+        # only imported once a lookup actually needs it.
+        from rapidfuzz import fuzz, process, utils
+
+        # token_sort_ratio because RTA-emitted scheme names regularly reorder
+        # modifiers ("Direct Growth" vs "Growth - Direct Plan"). Stored keys
+        # are already processed and token-sorted, so plain ratio against the
+        # query's key gives the same scores.
+        keys = getattr(results, "fuzzy_keys", None)
+        if keys is None:
+            query, choices = scheme_name, [x.name for x in results]
+            processor, scorer = utils.default_process, fuzz.token_sort_ratio
+        elif len(keys) < _SORTED_QUERY_MIN:
+            # Re-splitting a few sorted keys in C beats sorting the query in Python.
+            query, choices = utils.default_process(scheme_name), keys
+            processor, scorer = None, fuzz.token_sort_ratio
+        else:
+            query, choices, processor, scorer = fuzzy_key(scheme_name), keys, None, fuzz.ratio
+        match = process.extractOne(
+            query,
+            choices,
+            processor=processor,
+            scorer=scorer,
+            score_cutoff=min(max(min_score, 0), 100),
+        )
+        if match is not None and match[1] >= min_score:
+            _, score, idx = match
+            # Ties go to the first row, but a repeated name resolves to its
+            # last row, as the ``{name: row}`` dict this used to score did.
+            name = results[idx].name
+            for result in reversed(results):
+                if result.name == name:
+                    break
+            logger.debug(
+                "isin_lookup matched via %s+fuzzy(%d): isin=%s name=%r",
+                match_path,
+                score,
+                result.isin,
+                result.name,
+            )
+            return result._replace(score=score)
+
+    return None
+
+
 class MFISINDb(DB):
     """ISIN database for (Indian) Mutual Funds."""
 
-    def direct_isin_lookup(self, isin: str):
+    def direct_isin_lookup(self, isin: str) -> list[dict]:
         """
         Lookup scheme data via ISIN code.
 
         :param isin: Fund ISIN
-        :return: list of scheme rows matching the ISIN (may be empty).
+        :return: list of scheme rows (dicts with ``name``, ``isin``,
+            ``amfi_code`` and ``type``) matching the ISIN (may be empty).
+        """
+        return _scheme_dicts(self._direct_isin_rows(isin))
+
+    def _direct_isin_rows(self, isin: str) -> list[SchemeData]:
+        """:meth:`direct_isin_lookup` as candidates: SchemeData, score 100."""
+        if not self.may_contain("scheme", isin):
+            return []
+        sql = f"SELECT {self._scheme_columns()} FROM scheme WHERE isin = :isin ORDER BY id DESC"
+        return _candidates(self.run_query(sql, {"isin": isin}, row_factory=None))
+
+    def amfi_lookup(self, amfi_code: str) -> list[SchemeData]:
         """
-        sql = "SELECT name, isin, amfi_code, type FROM scheme WHERE isin = :isin ORDER BY id DESC"
-        return self.run_query(sql, {"isin": isin})
+        Lookup scheme data via AMFI scheme code.
 
-    def scheme_lookup(self, rta: str, scheme_name: str, rta_code: str):
+        :param amfi_code: AMFI scheme code, as in the AMFI NAV feed
+        :return: list of SchemeData (score 100) with that code, newest first
+            (may be empty). A code covers one plan of a scheme, so e.g. its
+            IDCW payout and reinvestment ISINs both match.
+        """
+        sql = (
+            f"SELECT {self._scheme_columns()} FROM scheme "
+            "WHERE amfi_code = :amfi_code ORDER BY id DESC"
+        )
+        return _candidates(self.run_query(sql, {"amfi_code": amfi_code}, row_factory=None))
+
+    def amfi_lookup_many(self, amfi_codes: Iterable[str]) -> dict[str, list[SchemeData]]:
+        """
+        :meth:`amfi_lookup` for many AMFI codes in one batched query, e.g. to
+        reconcile a whole AMFI NAV feed against the DB.
+
+        :param amfi_codes: AMFI scheme codes
+        :return: ``{amfi_code: [SchemeData, ...]}`` for every distinct input
+            code, in first-seen order; codes the DB doesn't know map to ``[]``.
+        """
+        codes = dict.fromkeys(amfi_codes)
+        # Walking idx_scheme_amfi_code backwards yields each code's rows
+        # together and newest first, with no sort in SQL or here.
+        rows = self.run_batch_query(
+            f"SELECT {self._scheme_columns()} FROM scheme WHERE amfi_code IN ({{params}}) "
+            "ORDER BY amfi_code DESC, id DESC",
+            codes,
+            row_factory=None,
+        )
+        found = {code: _candidates(list(group)) for code, group in groupby(rows, itemgetter(2))}
+        return {code: found.get(code) or _candidates([]) for code in codes}
+
+    def family_lookup(self, isin: str) -> list[SchemeData]:
+        """
+        Every plan and option of the scheme an ISIN belongs to: direct and
+        regular, growth and IDCW payout / reinvestment.
+
+        Uses the builder's scheme families (dbformat 3); with older DBs only
+        ISINs sharing the ISIN's AMFI code are found.
+
+        :param isin: Fund ISIN
+        :return: list of SchemeData (score 100) in the family, including the
+            ISIN's own rows, newest first (empty if the ISIN is unknown).
+        """
+        if not self.may_contain("scheme", isin):
+            return []
+        column = "family_id" if self.has_column("scheme", "family_id") else "amfi_code"
+        sql = (
+            f"SELECT {self._scheme_columns()}, id FROM scheme "
+            f"WHERE {column} IN (SELECT {column} FROM scheme WHERE isin = :isin)"
+        )
+        rows = self.run_query(sql, {"isin": isin}, row_factory=None)
+        rows.sort(key=itemgetter(5), reverse=True)
+        return _candidates(rows)
+
+    def scheme_lookup(self, rta: str, scheme_name: str, rta_code: str) -> list[dict]:
         """
         Lookup scheme details from the database.
 
@@ -51,54 +315,57 @@ class MFISINDb(DB):
         :param scheme_name: scheme name
         :param rta_code: RTA code for the scheme (must be a string; callers
             should reject None upstream)
-        :return: list of scheme rows matching the query (may be empty).
+        :return: list of scheme rows (dicts, as for :meth:`direct_isin_lookup`)
+            matching the query (may be empty).
         """
+        return _scheme_dicts(self._scheme_rows(rta, scheme_name, rta_code))
+
+    def _scheme_rows(self, rta: str, scheme_name: str, rta_code: str) -> list[SchemeData]:
+        """:meth:`scheme_lookup` as candidates: SchemeData, score 100."""
         rta_code = re.sub(r"\s+", "", rta_code)
+        if "hdfc" not in scheme_name.lower():
+            candidates, franklin = self._code_candidates(rta, rta_code)
+            return _first_match(self._rta_code_rows(set(candidates)), candidates, franklin)
 
-        sql = "SELECT name, isin, amfi_code, type FROM scheme"
+        sql = f"SELECT {self._scheme_columns()} FROM scheme"
         where = ["rta = :rta"]
 
-        if re.search(r"fti(\d+)", rta_code, re.I) and rta.upper() in ("CAMS", "FRANKLIN", "FTAMIL"):
+        if _is_franklin(rta, rta_code):
             # Try searching db for Franklin schemes
             franklin_args = {"rta": "FRANKLIN", "rta_code": rta_code}
             franklin_sql = f"{sql} WHERE rta = :rta AND rta_code = :rta_code"
-            results = self.run_query(franklin_sql, franklin_args)
+            results = self.run_query(franklin_sql, franklin_args, row_factory=None)
             if len(results) != 0:
-                return results
-
-        args = {"rta": RTA_MAP.get(rta.upper(), ""), "rta_code": rta_code}
+                return _candidates(results)
+
+        if self.has_column("scheme", "plan"):
+            return self._hdfc_rows(rta, scheme_name, rta_code)
+
+        # Databases before dbformat 3 have no plan / option columns.
+        # HDFC special-casing: RTA codes for HDFC are prefixes (suffix encodes
+        # plan/option), so use LIKE with a bound parameter rather than `=`.
+        # Plan/option filters are applied via additional LIKE patterns — all
+        # bound, never string-interpolated.
+        args = {"rta": RTA_MAP.get(rta.upper(), "")}
+        if re.search("direct", scheme_name, re.I):
+            where.append("name LIKE :direct_pattern")
+        else:
+            where.append("name NOT LIKE :direct_pattern")
+        args["direct_pattern"] = "%direct%"
 
-        if "hdfc" in scheme_name.lower():
-            # HDFC special-casing: RTA codes for HDFC are prefixes (suffix
-            # encodes plan/option), so use LIKE with a bound parameter rather
-            # than `=`. Plan/option filters are applied via additional LIKE
-            # patterns — all bound, never string-interpolated.
-            if re.search("direct", scheme_name, re.I):
-                where.append("name LIKE :direct_pattern")
-                args["direct_pattern"] = "%direct%"
+        if re.search("dividend|idcw", scheme_name, re.I):
+            where.append("name LIKE :payout_pattern")
+            if re.search("re-*invest", scheme_name, re.I):
+                args["payout_pattern"] = "%reinvest%"
             else:
-                where.append("name NOT LIKE :direct_pattern")
-                args["direct_pattern"] = "%direct%"
-
-            if re.search("dividend|idcw", scheme_name, re.I):
-                where.append("name LIKE :payout_pattern")
-                if re.search("re-*invest", scheme_name, re.I):
-                    args["payout_pattern"] = "%reinvest%"
-                else:
-                    args["payout_pattern"] = "%payout%"
-            where.append("rta_code LIKE :rta_code_d")
-            args["rta_code_d"] = f"{rta_code}%"
-        else:
-            where.append("rta_code = :rta_code")
+                args["payout_pattern"] = "%payout%"
+        where.append("rta_code LIKE :rta_code_d")
+        args["rta_code_d"] = f"{rta_code}%"
 
+        # No trimmed-code retry: it never applied to the prefix pattern (the
+        # old retry re-ran this same statement).
         sql_statement = f"{sql} WHERE {' AND '.join(where)} ORDER BY id DESC"
-        results = self.run_query(sql_statement, args)
-        if len(results) == 0 and "rta_code" in args and args["rta_code"]:
-            # Retry once after trimming the last character of the RTA code
-            # (covers off-by-one suffixes seen in older CAMS statements).
-            args["rta_code"] = args["rta_code"][:-1]
-            results = self.run_query(sql_statement, args)
-        return results
+        return _candidates(self.run_query(sql_statement, args, row_factory=None))
 
     def isin_lookup(
         self,
@@ -107,6 +374,7 @@ class MFISINDb(DB):
         rta_code: str,
         isin: str | None = None,
         min_score: int = 60,
+        fuzzy_fallback: bool = False,
     ) -> SchemeData:
         """
         Return the closest matching scheme from the MF ISIN database.
@@ -133,6 +401,11 @@ class MFISINDb(DB):
         3. **Fuzzy on scheme_name** -- last-resort disambiguation when
            any of the above paths return multiple candidates.
 
+        4. **Global fuzzy fallback** (opt-in, ``fuzzy_fallback=True``) --
+           when neither path finds any candidate (e.g. a garbled RTA code in
+           an old scanned statement), the best :meth:`fuzzy_search` match
+           across all schemes.
+
         :param scheme_name: Scheme Name (used as the fuzzy-match key when
             multiple rows are returned).
         :param rta: RTA (CAMS, KARVY, KFINTECH).
@@ -141,76 +414,369 @@ class MFISINDb(DB):
             this is the primary lookup key.
         :param min_score: Minimum score (out of 100) required from the
             fuzzy-match algorithm.
+        :param fuzzy_fallback: search all scheme names when the ISIN and
+            ``(rta, rta_code)`` paths find nothing. Off by default: a name
+            alone can match the wrong plan or option, so consider a higher
+            ``min_score`` with it.
 
         :return: matching scheme. ``score`` is 100 when the match was by
             ISIN or exact rta_code; otherwise it's the fuzzy score.
-        :raises TypeError: if any of scheme_name/rta/rta_code is not a string.
+        :raises TypeError: if any of scheme_name/rta/rta_code is not a string,
+            or isin is neither a string nor ``None``.
         :raises ValueError: if rta is unknown or no scheme is found.
         """
-        if not (
-            isinstance(scheme_name, str) and isinstance(rta, str) and isinstance(rta_code, str)
-        ):
-            raise TypeError("Invalid input")
-        if rta.upper() not in RTA_MAP:
-            raise ValueError(f"Invalid RTA : {rta}")
-
+        _check_lookup_args(scheme_name, rta, rta_code, isin)
+        result = self.cached(
+            "isin_lookup",
+            _lookup_key(scheme_name, rta, rta_code, isin, min_score, fuzzy_fallback),
+            lambda: self._isin_lookup(scheme_name, rta, rta_code, isin, min_score, fuzzy_fallback),
+        )
+        if result is None:
+            raise ValueError("No schemes found")
+        return result
+
+    def _isin_lookup(
+        self, scheme_name, rta, rta_code, isin, min_score, fuzzy_fallback
+    ) -> SchemeData | None:
         # Path 1: ISIN-first.
         results = []
         match_path = "rta_code"  # tracked for debug logging
         if isin is not None:
-            results = self.direct_isin_lookup(isin)
+            results = self._direct_isin_rows(isin)
             if results:
                 match_path = "isin"
 
         # Path 2: legacy (rta, rta_code) + HDFC/Franklin special cases.
         if not results:
-            results = self.scheme_lookup(rta, scheme_name, rta_code)
+            results = self._scheme_rows(rta, scheme_name, rta_code)
 
-        if len(results) == 1:
-            result = results[0]
-            logger.debug(
-                "isin_lookup matched via %s: isin=%s name=%r",
-                match_path,
-                result["isin"],
-                result["name"],
-            )
-            return SchemeData(
-                name=result["name"],
-                isin=result["isin"],
-                amfi_code=result["amfi_code"],
-                type=result["type"],
-                score=100,
+        if not results and fuzzy_fallback:
+            return self._fallback(scheme_name, min_score)
+        return _pick_scheme(scheme_name, results, match_path, min_score)
+
+    def isin_lookup_many(
+        self,
+        items: Iterable[tuple[str, str, str, str | None]],
+        min_score: int = 60,
+        fuzzy_fallback: bool = False,
+    ) -> list[SchemeData | Exception]:
+        """
+        Resolve many holdings at once, with the same semantics as :meth:`isin_lookup`.
+
+        All ISIN-first lookups run as one batched query and all
+        ``(rta, rta_code)`` fallbacks (including the Franklin and
+        trimmed-code candidates) as another; only the HDFC special case is
+        resolved one by one, as :meth:`scheme_lookup` does. Fuzzy disambiguation
+        then runs only on items that are still ambiguous.
+
+        :param items: ``(scheme_name, rta, rta_code, isin)`` tuples; ``isin``
+            may be ``None``.
+        :param min_score: Minimum fuzzy-match score, as for :meth:`isin_lookup`.
+        :param fuzzy_fallback: as for :meth:`isin_lookup`.
+        :return: one entry per input item, in order: the matching
+            :class:`SchemeData`, or the exception :meth:`isin_lookup` would
+            have raised for that item. Never raises for bad items.
+        """
+        items = list(items)
+        out: list[SchemeData | Exception | None] = [None] * len(items)
+        pending: list[int] = []
+        for idx, item in enumerate(items):
+            try:
+                scheme_name, rta, rta_code, isin = item
+            except (TypeError, ValueError):
+                out[idx] = TypeError("Invalid input")
+                continue
+            try:
+                _check_lookup_args(scheme_name, rta, rta_code, isin)
+            except (TypeError, ValueError) as exc:
+                out[idx] = exc
+            else:
+                pending.append(idx)
+
+        # Path 1: every supplied ISIN in one batched query.
+        isin_rows: dict[str, list[tuple[int, tuple]]] = defaultdict(list)
+        isins = {items[idx][3] for idx in pending if items[idx][3] is not None}
+        isins = self.may_contain_many("scheme", isins)
+        for row in self.run_batch_query(
+            f"SELECT {self._scheme_columns()}, id FROM scheme WHERE isin IN ({{params}})",
+            isins,
+            row_factory=None,
+        ):
+            isin_rows[row[1]].append((row[5], row))
+        by_isin = _newest_first(isin_rows)
+
+        candidates: dict[int, tuple[list[SchemeData], str]] = {}
+        by_code_keys: dict[int, tuple[list[tuple[str, str]], bool]] = {}
+        for idx in pending:
+            scheme_name, rta, rta_code, isin = items[idx]
+            if isin is not None and by_isin.get(isin):
+                candidates[idx] = (_candidates(by_isin[isin]), "isin")
+            elif "hdfc" in scheme_name.lower():
+                candidates[idx] = (self._scheme_rows(rta, scheme_name, rta_code), "rta_code")
+            else:
+                by_code_keys[idx] = self._code_candidates(rta, re.sub(r"\s+", "", rta_code))
+
+        # Path 2: every (rta, rta_code) candidate of every item in one batch.
+        by_code = self._rta_code_rows({key for keys, _ in by_code_keys.values() for key in keys})
+        for idx, (keys, franklin) in by_code_keys.items():
+            candidates[idx] = (_first_match(by_code, keys, franklin), "rta_code")
+
+        for idx, (results, match_path) in candidates.items():
+            if not results and fuzzy_fallback:
+                result = self._fallback(items[idx][0], min_score)
+            else:
+                result = _pick_scheme(items[idx][0], results, match_path, min_score)
+            out[idx] = result if result is not None else ValueError("No schemes found")
+        return out
+
+    def iter_isin_lookup(
+        self,
+        items: Iterable[tuple[str, str, str, str | None]],
+        min_score: int = 60,
+        fuzzy_fallback: bool = False,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[SchemeData | Exception]:
+        """
+        :meth:`isin_lookup_many` for a possibly unbounded iterable of holdings,
+        e.g. the rows of a nightly file.
+
+        ``items`` is read ``chunk_size`` items at a time, as results are
+        taken, and each chunk is resolved by :meth:`isin_lookup_many`, so
+        memory use is bounded by the chunk size, not the input's length. For
+        more throughput on many CPUs, see
+        :func:`casparser_isin.bulk.isin_lookup_bulk`.
+
+        :param items: ``(scheme_name, rta, rta_code, isin)`` tuples.
+        :param min_score: as for :meth:`isin_lookup`.
+        :param fuzzy_fallback: as for :meth:`isin_lookup`.
+        :param chunk_size: items read and resolved at a time.
+        :return: iterator of one entry per input item, in input order, as for
+            :meth:`isin_lookup_many`.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        resolve = functools.partial(
+            self.isin_lookup_many, min_score=min_score, fuzzy_fallback=fuzzy_fallback
+        )
+        return itertools.chain.from_iterable(map(resolve, _chunks(items, chunk_size)))
+
+    def fuzzy_search(
+        self, scheme_name: str, limit: int = 5, min_score: int = 60, by_amc: bool = True
+    ) -> list[SchemeData]:
+        """
+        Search every scheme name for ``scheme_name``, ignoring ISINs and RTA codes.
+
+        Candidates come from a token inverted index over all scheme names
+        (:class:`~casparser_isin.name_index.NameIndex`, built on first use and
+        shared by the process) and only those are scored, with
+        ``token_sort_ratio`` as in :meth:`isin_lookup`.
+
+        :param scheme_name: scheme name to look for.
+        :param limit: return at most this many schemes.
+        :param min_score: minimum fuzzy-match score (out of 100).
+        :param by_amc: search the schemes of ``scheme_name``'s fund house
+            (its first word) first, and all schemes only if none match.
+        :return: matching schemes, best score first (may be empty).
+        """
+        from rapidfuzz import fuzz, process, utils
+
+        index = self._name_index()
+        processed = utils.default_process(scheme_name)
+        key = " ".join(sorted(processed.split()))
+        shards = [None]
+        if by_amc and (shard := index.shard(processed)) is not None:
+            shards.insert(0, shard)
+        for shard in shards:
+            rows, keys = index.rows_for(index.candidates(key, shard))
+            matches = process.extract(
+                key,
+                keys,
+                scorer=fuzz.ratio,
+                processor=None,
+                limit=limit,
+                score_cutoff=min(max(min_score, 0), 100),
             )
+            results = [rows[idx]._replace(score=score) for _, score, idx in matches]
+            results = [result for result in results if result.score >= min_score]
+            if results:
+                return results
+        return []
 
-        if len(results) > 1:
-            # Path 3: fuzzy disambiguation within the candidate set.
-            schemes = {
-                x["name"]: (x["name"], x["isin"], x["amfi_code"], x["type"]) for x in results
-            }
-            key, score, _ = process.extractOne(
-                scheme_name,
-                schemes.keys(),
-                processor=utils.default_process,
-                scorer=_FUZZ_SCORER,
+    def search_schemes(self, query: str, limit: int = 10) -> list[SchemeData]:
+        """
+        Type-ahead search over scheme names, e.g. for manual reconciliation.
+
+        Every word of ``query`` must appear somewhere in a name (``"axis
+        long ter"`` finds ``"Axis Long Term Equity Fund"``). The newest
+        :data:`SEARCH_CANDIDATES` such names, found through the DB's
+        full-text index (``scheme_fts``), are re-ranked with rapidfuzz
+        ``WRatio``. Without the index (older DBs, or an SQLite lacking FTS5
+        trigram support) the same names are found by scanning ``scheme``.
+
+        :param query: (partial) scheme name.
+        :param limit: return at most this many schemes.
+        :return: matching schemes, best score first (may be empty).
+        """
+        from rapidfuzz import fuzz, process, utils
+
+        words = re.findall(r"[a-z0-9]+", query.lower())
+        if not words or limit < 1:
+            return []
+        if self._scheme_fts() and (indexed := [word for word in words if len(word) >= 3]):
+            # Words under 3 characters are checked on scheme.name: the index
+            # can't serve them, and SQLite 3.40's trigram LIKE crashes on a
+            # short pattern followed by a longer one. Not ORDER BY rank: bm25
+            # scores every match, slow for words like "fund" in most names.
+            short = [word for word in words if len(word) < 3]
+            where = " AND ".join(
+                ["scheme_fts.name LIKE ?"] * len(indexed) + ["scheme.name LIKE ?"] * len(short)
             )
-            if score >= min_score:
-                name, matched_isin, amfi_code, scheme_type = schemes[key]
-                logger.debug(
-                    "isin_lookup matched via %s+fuzzy(%d): isin=%s name=%r",
-                    match_path,
-                    score,
-                    matched_isin,
-                    name,
-                )
-                return SchemeData(
-                    name=name,
-                    isin=matched_isin,
-                    amfi_code=amfi_code,
-                    type=scheme_type,
-                    score=score,
+            sql = (
+                f"SELECT {self._scheme_columns('scheme')} FROM scheme_fts "
+                f"JOIN scheme ON scheme.id = scheme_fts.rowid WHERE {where} "
+                "ORDER BY scheme_fts.rowid DESC LIMIT ?"
+            )
+            words = indexed + short
+        else:
+            where = " AND ".join(["name LIKE ?"] * len(words))
+            sql = (
+                f"SELECT {self._scheme_columns()} FROM scheme "
+                f"WHERE {where} ORDER BY id DESC LIMIT ?"
+            )
+        args = [f"%{word}%" for word in words] + [max(limit, SEARCH_CANDIDATES)]
+        rows = self.run_query(sql, args, row_factory=None)
+        matches = process.extract(
+            query,
+            [row[0] or "" for row in rows],
+            scorer=fuzz.WRatio,
+            processor=utils.default_process,
+            limit=limit,
+        )
+        return [_tuple_new(SchemeData, (*rows[idx][:4], score)) for _, score, idx in matches]
+
+    def _scheme_fts(self) -> bool:
+        """Whether this DB has ``scheme_fts`` and the local SQLite can query it."""
+        return self.has_fts("scheme_fts")
+
+    def _fallback(self, scheme_name: str, min_score: int) -> SchemeData | None:
+        results = self.fuzzy_search(scheme_name, limit=1, min_score=min_score)
+        if not results:
+            return None
+        result = results[0]
+        logger.debug(
+            "isin_lookup matched via fallback+fuzzy(%d): isin=%s name=%r",
+            result.score,
+            result.isin,
+            result.name,
+        )
+        return result
+
+    def _name_index(self):
+        """The process-wide :class:`~casparser_isin.name_index.NameIndex` for this DB."""
+        return connection_pool.derived(
+            self.db_path, "name_index", self._build_name_index, self.in_memory
+        )
+
+    def _build_name_index(self, connection):
+        from rapidfuzz import utils
+
+        from .name_index import NameIndex
+
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        rows = []
+        for row in cursor.execute(f"SELECT {self._scheme_columns()}, id FROM scheme"):
+            processed = utils.default_process(row[0] or "")
+            # Databases before dbformat 3 have no stored keys.
+            key = row[4] if row[4] is not None else " ".join(sorted(processed.split()))
+            rows.append(
+                (
+                    row[5],
+                    _tuple_new(SchemeData, (row[0], row[1], row[2], row[3], 100)),
+                    processed,
+                    key,
                 )
+            )
+        logger.debug("built scheme name index over %d rows", len(rows))
+        return NameIndex(rows)
 
-        raise ValueError("No schemes found")
+    def _scheme_columns(self, table: str = "") -> str:
+        """
+        Columns that candidate queries select (see :func:`_candidates`),
+        qualified with ``table`` if given.
+        """
+        if self.has_column("scheme", "fuzzy_key"):
+            columns = "name, isin, amfi_code, type, fuzzy_key"
+        else:
+            columns = "name, isin, amfi_code, type, NULL"
+        if table:
+            columns = ", ".join(
+                name if name == "NULL" else f"{table}.{name}" for name in columns.split(", ")
+            )
+        return columns
+
+    def _code_candidates(self, rta: str, rta_code: str) -> tuple[list[tuple[str, str]], bool]:
+        """
+        ``(rta, code key)`` pairs to try for a non-HDFC scheme, in priority
+        order: the FRANKLIN RTA for Franklin codes, the exact code, then the
+        code without its last character (off-by-one suffixes seen in older
+        CAMS statements). Also returns whether the first pair is the Franklin one.
+        """
+        if self.has_column("scheme", "rta_code_key"):
+            code = normalize_rta_code(rta_code)
+        else:
+            code = rta_code
+        mapped = RTA_MAP.get(rta.upper(), "")
+        franklin = _is_franklin(rta, code)
+        keys = [("FRANKLIN", code)] if franklin else []
+        keys.append((mapped, code))
+        if code:
+            keys.append((mapped, code[:-1]))
+        return keys, franklin
+
+    def _hdfc_rows(self, rta: str, scheme_name: str, rta_code: str) -> list[SchemeData]:
+        """
+        HDFC candidates, newest first: RTA codes for HDFC are prefixes (the
+        suffix encodes plan/option), so match an ``rta_code_key`` prefix range
+        plus the builder's precomputed ``plan`` / ``option`` columns.
+        """
+        prefix = normalize_rta_code(rta_code)
+        args = {
+            "low": prefix,
+            "high": prefix + _MAX_CHAR,
+            "rta": RTA_MAP.get(rta.upper(), ""),
+            "plan": "direct" if re.search("direct", scheme_name, re.I) else "regular",
+        }
+        sql = (
+            f"SELECT {self._scheme_columns()}, id FROM scheme "
+            "WHERE rta_code_key >= :low AND rta_code_key < :high AND rta = :rta AND plan = :plan"
+        )
+        if re.search("dividend|idcw", scheme_name, re.I):
+            args["option"] = "reinvest" if re.search("re-*invest", scheme_name, re.I) else "payout"
+            sql += " AND option IN (:option, 'payout_reinvest')"
+        rows = self.run_query(sql, args, row_factory=None)
+        rows.sort(key=itemgetter(5), reverse=True)
+        return _candidates(rows)
+
+    def _rta_code_rows(self, keys: set[tuple[str, str]]) -> dict[tuple[str, str], list[tuple]]:
+        """
+        Rows for each ``(rta, code key)`` pair, newest first, in one batched query.
+
+        Probes ``scheme.rta_code_key`` when the DB has it (dbformat 3), else
+        the raw ``rta_code``.
+        """
+        column = "rta_code_key" if self.has_column("scheme", "rta_code_key") else "rta_code"
+        rows: dict[tuple[str, str], list[tuple[int, tuple]]] = defaultdict(list)
+        for row in self.run_batch_query(
+            f"SELECT {self._scheme_columns()}, id, rta, {column} FROM scheme "
+            f"WHERE {column} IN ({{params}})",
+            {code for _, code in keys},
+            row_factory=None,
+        ):
+            key = row[6:]
+            if key in keys:
+                rows[key].append((row[5], row))
+        return _newest_first(rows)
 
     def nav_lookup(self, isin: str) -> Decimal | None:
         """
@@ -218,7 +784,47 @@ class MFISINDb(DB):
         :param isin: Fund ISIN
         :return: nav value as a Decimal if available, else return None
         """
-        sql = """SELECT nav FROM nav20180131 where isin = :isin"""
-        result = self.run_query(sql, {"isin": isin}, fetchone=True)
-        if result is not None:
-            return Decimal(result["nav"])
+        return self._navs().get(isin)
+
+    def nav_lookup_many(self, isins: Iterable[str]) -> dict[str, Decimal | None]:
+        """
+        NAVs on 31st Jan 2018 of many funds, e.g. for every redemption in a
+        transaction history.
+
+        :param isins: Fund ISINs
+        :return: ``{isin: Decimal or None}`` for every distinct input ISIN, in
+            first-seen order.
+        """
+        navs = self._navs()
+        return {isin: navs.get(isin) for isin in isins}
+
+    def grandfathered_cost_many(
+        self,
+        isins: Sequence[str],
+        purchase_dates: Sequence[datetime.date],
+        purchase_navs: Sequence[Decimal],
+        units: Sequence[Decimal],
+        sale_navs: Sequence[Decimal] | None = None,
+    ) -> list[Decimal]:
+        """
+        Grandfathered cost of acquisition of many lots, using the 31st Jan
+        2018 NAVs (see :func:`casparser_isin.ltcg.grandfathered_cost`).
+
+        :param isins: Fund ISIN of each lot
+        :param purchase_dates: purchase date of each lot
+        :param purchase_navs: purchase NAV of each lot
+        :param units: units in each lot
+        :param sale_navs: sale NAV of each lot, if known
+        :return: cost of each lot as an exact Decimal, in order
+        """
+        return grandfathered_cost(
+            self._navs(), isins, purchase_dates, purchase_navs, units, sale_navs
+        )
+
+    def _navs(self) -> Mapping[str, Decimal]:
+        """
+        The whole (small, frozen) ``nav20180131`` table as a read-only
+        ``{isin: Decimal}`` map, loaded once per process and DB version and
+        shared by every instance and thread.
+        """
+        return connection_pool.derived(self.db_path, "nav20180131", _load_navs, self.in_memory)
@@ -0,0 +1,124 @@
+"""
+Token inverted index over every scheme name, for fuzzy searches that have no
+ISIN or RTA code to narrow them down (:meth:`MFISINDb.fuzzy_search
+<casparser_isin.MFISINDb.fuzzy_search>`).
+
+The index is built lazily, once per process and database version (see
+:meth:`ConnectionPool.derived <casparser_isin.utils.ConnectionPool.derived>`).
+A query reads the posting lists of its rarest tokens only, up to
+:data:`POSTINGS_BUDGET` entries, and hands at most :data:`CANDIDATES` rows to
+rapidfuzz, so its cost does not grow with the size of the ``scheme`` table.
+"""
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from operator import itemgetter
+
+# Posting-list entries read per query. Tokens are read rarest first; a token
+# whose posting list alone exceeds the budget (e.g. "fund", "growth") is too
+# common to narrow anything down and is skipped.
+POSTINGS_BUDGET = 4096
+
+# Rows scored with rapidfuzz per query.
+CANDIDATES = 64
+
+
+def shard_key(processed_name: str) -> str:
+    """
+    AMC shard of a ``default_process``-ed scheme name: its first token, the
+    fund house's brand ("hdfc", "axis", "icici", ...) in AMFI and RTA names.
+    """
+    return processed_name.split(" ", 1)[0]
+
+
+class NameIndex:
+    """
+    Inverted index from name tokens to rows.
+
+    Rows are stored grouped by :func:`shard_key` (newest first within a
+    shard), so a shard is a contiguous range of row numbers and restricting
+    a posting list to one shard is a pair of bisections.
+
+    :param rows: ``(id, row, processed_name, key)`` tuples, where ``key`` is the
+        name's :func:`~casparser_isin.mf_isin.fuzzy_key` and ``row`` is what
+        a search returns for it.
+    """
+
+    __slots__ = ("rows", "keys", "_postings", "_shards", "_weights")
+
+    def __init__(self, rows: Iterable[tuple[int, tuple, str, str]]):
+        ordered = sorted(
+            ((shard_key(name), -id_, row, key) for id_, row, name, key in rows),
+            key=itemgetter(0, 1),
+        )
+        self.rows: list[tuple] = [row for _, _, row, _ in ordered]
+        self.keys: list[str] = [key for _, _, _, key in ordered]
+        self._shards: dict[str, tuple[int, int]] = {}
+        postings: dict[str, list[int]] = defaultdict(list)
+        for n, (shard, _, _, key) in enumerate(ordered):
+            low, _ = self._shards.get(shard, (n, n))
+            self._shards[shard] = (low, n + 1)
+            # Keys are token-sorted, so a repeated token is always adjacent.
+            previous = None
+            for token in key.split():
+                if token != previous:
+                    postings[token].append(n)
+                    previous = token
+        self._postings = {token: array("I", rows) for token, rows in postings.items()}
+        size = len(self.rows)
+        self._weights = {token: math.log(1 + size / len(rows)) for token, rows in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def shard(self, processed_name: str) -> tuple[int, int] | None:
+        """Row range of ``processed_name``'s AMC shard, or None if no row shares it."""
+        return self._shards.get(shard_key(processed_name))
+
+    def candidates(
+        self,
+        key: str,
+        shard: tuple[int, int] | None = None,
+        limit: int = CANDIDATES,
+        budget: int = POSTINGS_BUDGET,
+    ) -> list[int]:
+        """
+        Row numbers sharing the most (IDF-weighted) tokens with fuzzy key
+        ``key``, best first.
+
+        :param shard: restrict to this row range (see :meth:`shard`).
+        :param limit: at most this many rows.
+        :param budget: at most this many posting-list entries are read.
+        """
+        low, high = shard if shard is not None else (0, len(self.rows))
+        lists: list[tuple[int, str, int, int]] = []
+        for token in set(key.split()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            start = bisect_left(postings, low)
+            stop = bisect_left(postings, high, start)
+            if start < stop <= start + budget:
+                lists.append((stop - start, token, start, stop))
+        lists.sort()
+
+        scores: dict[int, float] = defaultdict(float)
+        for size, token, start, stop in lists:
+            if size > budget:
+                break
+            budget -= size
+            weight = self._weights[token]
+            for n in self._postings[token][start:stop]:
+                scores[n] += weight
+        # nlargest is stable: ties keep first-seen order, ascending row
+        # numbers of the rarest token, i.e. newest first within a shard.
+        return heapq.nlargest(limit, scores, key=scores.__getitem__)
+
+    def rows_for(self, numbers: Sequence[int]) -> tuple[list[tuple], list[str]]:
+        """Rows and fuzzy keys for row numbers from :meth:`candidates`."""
+        rows, keys = self.rows, self.keys
+        return [rows[n] for n in numbers], [keys[n] for n in numbers]
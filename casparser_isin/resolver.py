@@ -0,0 +1,146 @@
+"""
+Resolve any ISIN, mutual fund or listed security, with one query.
+
+NSDL / CDSL CAS files list mutual fund units next to shares and bonds.
+:class:`AnyISINDb` looks an ISIN up in the ``scheme`` and ``isin`` tables
+with one statement (a ``UNION ALL`` of a covering-index and a primary-key
+probe) and says which kind of instrument it found::
+
+    with AnyISINDb() as db:
+        match = db.resolve("INF846K01EW2")
+        if match is not None and match.kind == MUTUAL_FUND:
+            amfi_code = match.data.amfi_code
+
+:meth:`AnyISINDb.enrich` does the same for a whole column of ISINs (a NumPy
+array or pandas Series) and returns column-aligned arrays; it needs NumPy
+(``pip install casparser-isin[numpy]``).
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, NamedTuple
+
+from .isin import ISINData
+from .mf_isin import SchemeData
+from .utils import BATCH_SIZE, DB
+
+if TYPE_CHECKING:
+    import numpy
+
+MUTUAL_FUND = "mutual_fund"
+SECURITY = "security"
+
+# The arrays AnyISINDb.enrich returns: the ISIN's kind and name, the issuer and
+# type of a security, the AMFI code and scheme type of a mutual fund.
+ENRICH_COLUMNS = ("kind", "name", "issuer", "type", "amfi_code", "scheme_type")
+
+# scheme rows sort before isin rows, newest scheme row first; see _pick.
+_SQL = (
+    "SELECT 0, id, isin, name, amfi_code, type, NULL FROM scheme WHERE isin {match} "
+    "UNION ALL "
+    "SELECT 1, 0, isin, name, issuer, type, status FROM isin WHERE isin {match}"
+)
+
+
+class ResolvedISIN(NamedTuple):
+    """An ISIN's details, tagged with the kind of instrument it belongs to."""
+
+    kind: str  # MUTUAL_FUND or SECURITY
+    data: SchemeData | ISINData
+
+
+def _pick(rows: list[tuple]) -> ResolvedISIN | None:
+    """
+    The result for one ISIN's rows: its newest scheme row if it is a mutual
+    fund (the ``isin`` table also lists some fund units), else its security.
+    """
+    if not rows:
+        return None
+    row = rows[0] if len(rows) == 1 else min(rows, key=lambda r: (r[0], -r[1]))
+    source, _, isin, name, code, type_, status = row
+    if source == 0:
+        return ResolvedISIN(MUTUAL_FUND, SchemeData(name, isin, code, type_, 100))
+    return ResolvedISIN(SECURITY, ISINData(isin, name, code, type_, status))
+
+
+def _enrich_row(match: ResolvedISIN | None) -> tuple:
+    if match is None:
+        return (None,) * len(ENRICH_COLUMNS)
+    data = match.data
+    if match.kind == MUTUAL_FUND:
+        return (MUTUAL_FUND, data.name, None, None, data.amfi_code, data.type)
+    return (SECURITY, data.name, data.issuer, data.type, None, None)
+
+
+class AnyISINDb(DB):
+    """ISIN database for mutual funds and listed securities alike."""
+
+    def resolve(self, isin: str) -> ResolvedISIN | None:
+        """
+        Classify and look up an ISIN.
+
+        :param isin: ISIN code
+        :return: :class:`ResolvedISIN` with ``kind`` :data:`MUTUAL_FUND` (``data``
+            is the scheme's :class:`~casparser_isin.SchemeData`, score 100) or
+            :data:`SECURITY` (``data`` is its :class:`~casparser_isin.ISINData`),
+            or None if the ISIN is in neither table.
+        """
+        return self.cached("resolve", (isin,), lambda: self._resolve(isin))
+
+    def _resolve(self, isin: str) -> ResolvedISIN | None:
+        # No Bloom filter pre-checks: two filter probes cost more than this
+        # one statement's two index probes.
+        sql = _SQL.format(match="= :isin")
+        return _pick(self.run_query(sql, {"isin": isin}, row_factory=None))
+
+    def resolve_many(self, isins: Iterable[str]) -> dict[str, ResolvedISIN | None]:
+        """
+        :meth:`resolve` many ISINs, one query per
+        :data:`~casparser_isin.utils.BATCH_SIZE` distinct ISINs.
+
+        :param isins: ISIN codes
+        :return: ``{isin: ResolvedISIN or None}`` for every distinct input ISIN,
+            in first-seen order.
+        """
+        results: dict[str, ResolvedISIN | None] = dict.fromkeys(isins)
+        keys = list(results)
+        rows: dict[str, list[tuple]] = defaultdict(list)
+        for start in range(0, len(keys), BATCH_SIZE):
+            chunk = keys[start : start + BATCH_SIZE]
+            # Numbered parameters: both halves of the UNION bind the same chunk.
+            params = ", ".join(f"?{n}" for n in range(1, len(chunk) + 1))
+            sql = _SQL.format(match=f"IN ({params})")
+            for row in self.run_query(sql, chunk, row_factory=None):
+                rows[row[2]].append(row)
+        for isin, isin_rows in rows.items():
+            results[isin] = _pick(isin_rows)
+        return results
+
+    def enrich(self, isins) -> dict[str, "numpy.ndarray"]:
+        """
+        Look up a whole column of ISINs at once, e.g. a portfolio DataFrame's::
+
+            df = df.assign(**db.enrich(df["isin"]))
+
+        A hash join: the input is factorized into distinct ISINs, which are
+        resolved set-wise by :meth:`resolve_many`, and each output column is
+        one NumPy take from the distinct ISINs' values.
+
+        :param isins: ISIN codes; a NumPy array, pandas Series or any sequence.
+            Entries that aren't strings (None, NaN) match nothing.
+        :return: ``{column: array}`` for each of :data:`ENRICH_COLUMNS`, every
+            array (``dtype=object``) aligned with ``isins``. Values are None
+            where an ISIN is unknown or the column doesn't apply to its kind.
+        :raises ImportError: if NumPy is not installed.
+        """
+        import numpy as np
+
+        values = isins.tolist() if hasattr(isins, "tolist") else list(isins)
+        # Factorize: each distinct ISIN's code is its index in the table below.
+        codes = {isin: n for n, isin in enumerate(dict.fromkeys(values))}
+        row_codes = np.fromiter(map(codes.__getitem__, values), dtype=np.intp, count=len(values))
+        found = self.resolve_many(isin for isin in codes if isinstance(isin, str))
+        table = np.empty((len(codes), len(ENRICH_COLUMNS)), dtype=object)
+        for n, isin in enumerate(codes):
+            table[n] = _enrich_row(found.get(isin))
+        return {column: table[:, n][row_codes] for n, column in enumerate(ENRICH_COLUMNS)}
@@ -1,13 +1,90 @@
+import functools
+import itertools
 import logging
 import os
 import pathlib
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from .bloom import BloomFilter, load_bloom_filter
 
 logger = logging.getLogger(__name__)
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 INTERNAL_ISIN_DB_PATH = BASE_DIR / "isin.db"
 
+# Fast-open tuning. The DB is ~50 MB and never written at runtime, so map it
+# whole and give the page cache room for the hot index pages.
+DEFAULT_MMAP_SIZE = 64 * 1024 * 1024
+CACHE_SIZE_KIB = 16 * 1024
+
+# Values bound per statement by batch lookups. SQLite builds older than 3.32
+# cap host parameters at 999, so stay well below that.
+BATCH_SIZE = 500
+
+# Input items the iter_* lookups read and resolve at a time: a few batches,
+# so duplicates within a chunk are resolved once.
+STREAM_CHUNK_SIZE = 4 * BATCH_SIZE
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Seconds between checks for a replaced database file.
+DEFAULT_RELOAD_INTERVAL = 5.0
+
+
+def _truthy_env(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def fast_open_disabled() -> bool:
+    """True when ``CASPARSER_ISIN_DB_NO_FAST_OPEN`` opts out of the immutable open mode."""
+    return _truthy_env("CASPARSER_ISIN_DB_NO_FAST_OPEN")
+
+
+def in_memory_enabled() -> bool:
+    """True when ``CASPARSER_ISIN_DB_IN_MEMORY`` opts in to serving lookups from RAM."""
+    return _truthy_env("CASPARSER_ISIN_DB_IN_MEMORY")
+
+
+def get_mmap_size() -> int:
+    """``PRAGMA mmap_size`` in bytes; override with ``CASPARSER_ISIN_DB_MMAP_SIZE``."""
+    value = os.environ.get("CASPARSER_ISIN_DB_MMAP_SIZE")
+    if value:
+        try:
+            return int(value)
+        except ValueError:
+            logger.warning("Ignoring invalid CASPARSER_ISIN_DB_MMAP_SIZE=%r", value)
+    return DEFAULT_MMAP_SIZE
+
+
+def get_cache_size() -> int:
+    """Lookup-cache capacity; override with ``CASPARSER_ISIN_CACHE_SIZE`` (``0`` disables)."""
+    value = os.environ.get("CASPARSER_ISIN_CACHE_SIZE")
+    if value:
+        try:
+            return max(int(value), 0)
+        except ValueError:
+            logger.warning("Ignoring invalid CASPARSER_ISIN_CACHE_SIZE=%r", value)
+    return DEFAULT_CACHE_SIZE
+
+
+def get_reload_interval() -> float:
+    """
+    Seconds between checks for a replaced DB file; override with
+    ``CASPARSER_ISIN_DB_RELOAD_INTERVAL`` (``0`` disables the check).
+    """
+    value = os.environ.get("CASPARSER_ISIN_DB_RELOAD_INTERVAL")
+    if value:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            logger.warning("Ignoring invalid CASPARSER_ISIN_DB_RELOAD_INTERVAL=%r", value)
+    return DEFAULT_RELOAD_INTERVAL
+
 
 def get_isin_db_path() -> pathlib.Path:
     """
@@ -35,16 +112,450 @@ def get_isin_db_path() -> pathlib.Path:
     return INTERNAL_ISIN_DB_PATH
 
 
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Consecutive lists of ``size`` items (the last may be shorter), read lazily."""
+    iterator = iter(items)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
 def dict_factory(cursor, row):
     return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
 
 
-class DB:
-    """Base class for database queries."""
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used mapping with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (marking it recently used), else ``default``."""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key, value):
+        """Cache ``value`` under ``key``, evicting the least recently used entries if full."""
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int):
+        """Change the capacity, evicting entries if it shrank."""
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._evictions, self.maxsize, len(self._data)
+            )
+
+    def _evict(self):
+        while len(self._data) > max(self.maxsize, 0):
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+
+# Shared by every DB instance. Keys include the DB path and its meta.version,
+# so results never outlive the database they were read from.
+lookup_cache = LRUCache(get_cache_size())
+
+
+def _read_version(connection: sqlite3.Connection) -> str | None:
+    try:
+        cursor = connection.cursor()
+        cursor.row_factory = None
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    return row[0] if row is not None else None
+
+
+def _probe_fts(table: str, connection: sqlite3.Connection) -> bool:
+    try:
+        connection.execute(f"SELECT rowid FROM {table} WHERE {table} MATCH 'probe' LIMIT 0")
+    except sqlite3.OperationalError as exc:
+        logger.debug("no usable full-text index %s: %s", table, exc)
+        return False
+    return True
+
+
+def _file_signature(path: pathlib.Path) -> tuple | None:
+    """Identity of the file at ``path``; changes when the file is replaced or rewritten."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _connect(path: pathlib.Path) -> sqlite3.Connection:
+    """
+    Open a read-only connection to the database at ``path``.
+
+    By default the file is opened ``immutable``: SQLite skips file locking
+    and change detection entirely, reads pages through ``mmap`` and the
+    connection refuses writes (``query_only``). This is safe because the DB
+    is never modified in place -- ``casparser-isin --update`` swaps in a new
+    file with ``os.replace``. Set ``CASPARSER_ISIN_DB_NO_FAST_OPEN=1`` to fall
+    back to a plain read-only open.
+    """
+    uri = f"{path.resolve().as_uri()}?mode=ro"
+    if fast_open_disabled():
+        connection = sqlite3.connect(uri, uri=True)
+    else:
+        connection = sqlite3.connect(f"{uri}&immutable=1", uri=True)
+        connection.execute(f"PRAGMA mmap_size = {get_mmap_size():d}")
+        connection.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB:d}")
+        connection.execute("PRAGMA query_only = ON")
+    connection.row_factory = dict_factory
+    return connection
+
+
+def _load_into_memory(path: pathlib.Path, uri: str) -> sqlite3.Connection:
+    """
+    Copy the database at ``path`` into the shared in-memory database ``uri``.
+
+    Returns the connection that owns the in-memory copy; the copy lives for as
+    long as at least one connection to ``uri`` stays open.
+    """
+    master = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    source = _connect(path)
+    try:
+        source.backup(master)
+    finally:
+        source.close()
+    return master
+
+
+class _PooledConnection:
+    """One thread's connection to one database, and what was read through it."""
+
+    __slots__ = ("connection", "version", "reloads", "filters", "columns")
+
+    def __init__(self, connection: sqlite3.Connection, version: str | None, reloads: int):
+        self.connection = connection
+        self.version = version
+        self.reloads = reloads
+        self.filters: dict[str, BloomFilter | None] = {}
+        self.columns: dict[str, frozenset[str]] = {}
+
+
+class ConnectionPool:
+    """
+    Process-wide pool of read-only SQLite connections.
+
+    Connections are keyed by database path and held per thread (sqlite3
+    connections must not be shared across threads), so every :class:`DB`
+    instance on a thread reuses the same connection instead of opening a new
+    one per query. A thread's connections are closed when the thread exits
+    and its thread-local storage is released.
+
+    With ``in_memory=True`` the whole database is copied once per process
+    into a shared-cache ``:memory:`` database (via the sqlite backup API)
+    and every thread's connection reads from that copy instead of the file.
+
+    :meth:`clear` invalidates every pooled connection and cached result. The
+    calling thread's connections are closed immediately; other threads close
+    theirs and reconnect on their next :meth:`acquire`.
+
+    The ``meta.version`` of each database is read whenever a connection is
+    opened; when it differs from the version last seen for that path (the
+    file was replaced by ``casparser-isin --update``), :data:`lookup_cache`
+    is cleared.
+
+    Long-running processes also pick up a database replaced by another
+    process: at most once every :attr:`check_interval` seconds (see
+    :func:`get_reload_interval`), :meth:`acquire` stats each pooled DB file
+    and, if its inode, size or mtime changed, every thread reconnects on its
+    next :meth:`acquire` and the in-memory copies, Bloom filters,
+    :meth:`derived` structures and :data:`lookup_cache` are dropped. Between
+    checks :meth:`acquire` makes no system calls.
+
+    SQLite connections must not be used across ``fork()``: in a forked child
+    (e.g. a gunicorn or celery prefork worker) the pool of the module-level
+    :data:`connection_pool` starts empty and reconnects on first use. The
+    parent's connections and in-memory copies are left open, not closed.
+    """
 
     def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._memory: dict[pathlib.Path, tuple[str, sqlite3.Connection]] = {}
+        self._memory_count = 0
+        self._versions: dict[pathlib.Path, str | None] = {}
+        self._filters: dict[tuple, BloomFilter | None] = {}
+        self._derived: dict[tuple, object] = {}
+        self._build_lock = threading.Lock()
+        self._signatures: dict[pathlib.Path, tuple | None] = {}
+        self._reloads: dict[pathlib.Path, int] = {}
+        self._next_check = 0.0
+        self.check_interval = get_reload_interval()
+        # What a forked child inherited from its parent: kept referenced so it
+        # is never used or closed in the child (closing could touch the parent's
+        # SQLite state), and never released.
+        self._inherited: list = []
+
+    def acquire(self, path: pathlib.Path, in_memory: bool = False) -> sqlite3.Connection:
+        """Return this thread's connection to ``path``, opening it if needed."""
+        return self._pooled(path, in_memory).connection
+
+    def _pooled(self, path: pathlib.Path, in_memory: bool) -> _PooledConnection:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            self._close_local()
+            local.connections = {}
+            local.generation = self._generation
+        if self.check_interval and time.monotonic() >= self._next_check:
+            self.check_for_updates()
+        key = (path, in_memory)
+        pooled = local.connections.get(key)
+        # Skip hashing ``path`` again in the common case of no reloads at all.
+        reloads = self._reloads.get(path, 0) if self._reloads else 0
+        if pooled is not None and pooled.reloads != reloads:
+            pooled.connection.close()
+            pooled = None
+        if pooled is None:
+            signature = _file_signature(path)
+            if in_memory:
+                connection = self._connect_memory(path)
+            else:
+                connection = _connect(path)
+            with self._lock:
+                self._signatures.setdefault(path, signature)
+            version = self._check_version(path, connection)
+            pooled = local.connections[key] = _PooledConnection(connection, version, reloads)
+        return pooled
+
+    def check_for_updates(self) -> bool:
+        """
+        Stat every pooled DB file now and reload those that were replaced.
+
+        :return: True if any database was reloaded.
+        """
+        self._next_check = time.monotonic() + self.check_interval
+        with self._lock:
+            known = list(self._signatures.items())
+        changed = []
+        for path, signature in known:
+            current = _file_signature(path)
+            # A missing file is mid-swap (or gone); keep serving the open one.
+            if current is not None and current != signature:
+                changed.append((path, current))
+        if not changed:
+            return False
+        masters = []
+        with self._lock:
+            for path, signature in changed:
+                self._signatures[path] = signature
+                self._reloads[path] = self._reloads.get(path, 0) + 1
+                entry = self._memory.pop(path, None)
+                if entry is not None:
+                    masters.append(entry[1])
+                for key in [key for key in self._filters if key[0] == path]:
+                    del self._filters[key]
+                for key in [key for key in self._derived if key[0] == path]:
+                    del self._derived[key]
+        # Threads still reading an old in-memory copy keep it alive until they reconnect.
+        for master in masters:
+            master.close()
+        lookup_cache.clear()
+        logger.info("reloading replaced isin database(s): %s", [str(p) for p, _ in changed])
+        return True
+
+    def db_version(self, path: pathlib.Path, in_memory: bool = False) -> str | None:
+        """``meta.version`` of the database this thread's connection to ``path`` reads."""
+        return self._pooled(path, in_memory).version
+
+    def membership_filter(
+        self, path: pathlib.Path, name: str, in_memory: bool = False
+    ) -> BloomFilter | None:
+        """The DB's shipped :class:`~casparser_isin.bloom.BloomFilter` ``name``, loaded once."""
+        pooled = self._pooled(path, in_memory)
+        try:
+            return pooled.filters[name]
+        except KeyError:
+            pass
+        key = (path, pooled.version, name)
+        try:
+            bloom = self._filters[key]
+        except KeyError:
+            bloom = load_bloom_filter(pooled.connection, name)
+            with self._lock:
+                bloom = self._filters.setdefault(key, bloom)
+        pooled.filters[name] = bloom
+        return bloom
+
+    def derived(self, path: pathlib.Path, name: str, build, in_memory: bool = False):
+        """
+        ``build(connection)`` for the DB at ``path``: built once per process
+        and database version under ``name``, shared by every thread and
+        dropped when the DB is reloaded. The result must not be mutated.
+        """
+        pooled = self._pooled(path, in_memory)
+        key = (path, pooled.version, name)
+        value = self._derived.get(key, _MISSING)
+        if value is _MISSING:
+            # One build at a time: concurrent first callers wait rather than
+            # each building their own copy.
+            with self._build_lock:
+                value = self._derived.get(key, _MISSING)
+                if value is _MISSING:
+                    value = self._derived[key] = build(pooled.connection)
+        return value
+
+    def columns(self, path: pathlib.Path, table: str, in_memory: bool = False) -> frozenset[str]:
+        """
+        Column names of ``table`` in the DB at ``path`` (empty if missing),
+        read once per pooled connection so a reload re-reads them.
+        """
+        pooled = self._pooled(path, in_memory)
+        try:
+            return pooled.columns[table]
+        except KeyError:
+            pass
+        cursor = pooled.connection.cursor()
+        cursor.row_factory = None
+        names = frozenset(row[1] for row in cursor.execute(f"PRAGMA table_info({table})"))
+        pooled.columns[table] = names
+        return names
+
+    def _check_version(self, path: pathlib.Path, connection: sqlite3.Connection) -> str | None:
+        version = _read_version(connection)
+        with self._lock:
+            previous = self._versions.get(path, version)
+            self._versions[path] = version
+        if previous != version:
+            logger.info("isin database at %s changed to version %s", path, version)
+            lookup_cache.clear()
+        return version
+
+    def memory_database(self, path: pathlib.Path) -> sqlite3.Connection:
+        """Return the connection owning the in-memory copy of ``path``, loading it once."""
+        return self._memory_entry(path)[1]
+
+    def _memory_entry(self, path: pathlib.Path) -> tuple[str, sqlite3.Connection]:
+        with self._lock:
+            entry = self._memory.get(path)
+            if entry is None:
+                self._memory_count += 1
+                uri = f"file:casparser-isin-{self._memory_count}?mode=memory&cache=shared"
+                entry = self._memory[path] = (uri, _load_into_memory(path, uri))
+        return entry
+
+    def _connect_memory(self, path: pathlib.Path) -> sqlite3.Connection:
+        uri, _ = self._memory_entry(path)
+        connection = sqlite3.connect(uri, uri=True)
+        connection.execute("PRAGMA query_only = ON")
+        connection.row_factory = dict_factory
+        return connection
+
+    def clear(self):
+        """
+        Close and forget all pooled connections and in-memory copies, and
+        empty :data:`lookup_cache`: a DB rebuilt in place may keep its
+        ``meta.version``.
+        """
+        with self._lock:
+            self._generation += 1
+            masters = [master for _, master in self._memory.values()]
+            self._memory.clear()
+            self._filters.clear()
+            self._derived.clear()
+            self._signatures.clear()
+            self._reloads.clear()
+        self._close_local()
+        for master in masters:
+            master.close()
+        lookup_cache.clear()
+
+    def _after_fork_in_child(self):
+        """Drop, without closing, every connection and copy inherited across ``fork()``."""
+        self._inherited.append((self._local, self._memory))
+        # A lock held by another parent thread at fork time would never be released.
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._local = threading.local()
+        self._generation += 1
+        self._memory = {}
+        self._filters = {}
+        self._derived = {}
+        self._signatures = {}
+        self._reloads = {}
+        self._next_check = 0.0
+
+    def _close_local(self):
+        connections = getattr(self._local, "connections", None)
+        if connections:
+            for pooled in connections.values():
+                pooled.connection.close()
+            connections.clear()
+
+
+connection_pool = ConnectionPool()
+
+
+def _after_fork_in_child():
+    lookup_cache._lock = threading.Lock()
+    connection_pool._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):  # not on Windows
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class DB:
+    """
+    Base class for database queries.
+
+    Queries run on a connection borrowed from :data:`connection_pool`, both
+    inside and outside a ``with`` block. Every query borrows it afresh, so a
+    ``with`` block outlives a reload of the DB file or
+    ``connection_pool.clear()``. ``close()`` releases the borrowed connection
+    back to the pool rather than closing it.
+
+    :param in_memory: serve queries from an in-memory copy of the database,
+        loaded once per process. Defaults to the ``CASPARSER_ISIN_DB_IN_MEMORY``
+        environment variable. Worth it when the DB lives on slow storage and
+        the process does many lookups; costs roughly the DB file size in RAM.
+    """
+
+    def __init__(self, in_memory: bool | None = None):
         self.connection: sqlite3.Connection | None = None
-        self.cursor: sqlite3.Cursor | None = None
+        self.in_memory = in_memory_enabled() if in_memory is None else in_memory
+        self._db_path: pathlib.Path | None = None
+        self._cursor: sqlite3.Cursor | None = None
 
     def __enter__(self):
         self.initialize()
@@ -53,31 +564,127 @@ class DB:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
 
+    @property
+    def db_path(self) -> pathlib.Path:
+        """Database path, resolved once per instance via :func:`get_isin_db_path`."""
+        if self._db_path is None:
+            self._db_path = get_isin_db_path()
+        return self._db_path
+
+    @property
+    def cursor(self) -> sqlite3.Cursor | None:
+        """
+        Cursor (dict rows) on this thread's pooled connection between
+        :meth:`initialize` and :meth:`close`, else None. Like queries, it
+        follows the pool across reloads.
+        """
+        if self.connection is None:
+            return None
+        connection = connection_pool.acquire(self.db_path, self.in_memory)
+        if self._cursor is None or self._cursor.connection is not connection:
+            self._cursor = connection.cursor()
+        return self._cursor
+
     def initialize(self):
-        """Initialize database."""
-        self.connection = sqlite3.connect(get_isin_db_path())
-        self.connection.row_factory = dict_factory
-        self.cursor = self.connection.cursor()
+        """Initialize database: connect (or reuse this thread's pooled connection) now."""
+        self.connection = connection_pool.acquire(self.db_path, self.in_memory)
 
     def close(self):
-        """Close database connection."""
-        if self.cursor is not None:
-            self.cursor.close()
-            self.cursor = None
-        if self.connection is not None:
-            self.connection.close()
-            self.connection = None
-
-    def run_query(self, sql, arguments, fetchone=False):
-        self_initialized = False
-        if self.connection is None:
-            self.initialize()
-            self_initialized = True
-        try:
-            self.cursor.execute(sql, arguments)
-            if fetchone:
-                return self.cursor.fetchone()
-            return self.cursor.fetchall()
-        finally:
-            if self_initialized:
-                self.close()
+        """Release the database connection."""
+        self.connection = None
+        self._cursor = None
+
+    @staticmethod
+    def cache_info() -> CacheInfo:
+        """Hit/miss/eviction statistics of the shared :data:`lookup_cache`."""
+        return lookup_cache.info()
+
+    @staticmethod
+    def cache_clear():
+        """Empty the shared :data:`lookup_cache`."""
+        lookup_cache.clear()
+
+    def cached(self, name: str, key: tuple, compute):
+        """
+        Return ``compute()``, memoised in :data:`lookup_cache` under ``(name, key)``.
+
+        ``key`` must already be normalised (equal keys must give equal
+        results). Cached values are shared between callers, so ``compute``
+        must return immutable values.
+        """
+        if lookup_cache.maxsize <= 0:
+            return compute()
+        cache_key = (
+            self.db_path,
+            connection_pool.db_version(self.db_path, self.in_memory),
+            name,
+            key,
+        )
+        value = lookup_cache.get(cache_key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            lookup_cache.put(cache_key, value)
+        return value
+
+    def may_contain(self, name: str, key: str) -> bool:
+        """
+        False if ``key`` is definitely absent from key set ``name`` (``"isin"``
+        for the ``isin`` table, ``"scheme"`` for ``scheme.isin``), per the
+        DB's Bloom filter. Always True for databases shipped without one.
+        """
+        bloom = connection_pool.membership_filter(self.db_path, name, self.in_memory)
+        return bloom is None or not isinstance(key, str) or key in bloom
+
+    def may_contain_many(self, name: str, keys: Iterable[str]) -> list[str]:
+        """The ``keys`` :meth:`may_contain` keeps, in order; one filter fetch per call."""
+        bloom = connection_pool.membership_filter(self.db_path, name, self.in_memory)
+        if bloom is None:
+            return list(keys)
+        return [key for key in keys if not isinstance(key, str) or key in bloom]
+
+    def has_column(self, table: str, column: str) -> bool:
+        """True if the database has ``table.column``; lets lookups support older dbformats."""
+        return column in connection_pool.columns(self.db_path, table, self.in_memory)
+
+    def has_fts(self, table: str) -> bool:
+        """
+        True if the database has the FTS5 table ``table`` and this SQLite can
+        query it (it may lack FTS5 or the table's tokenizer); probed once
+        per DB version.
+        """
+        return connection_pool.derived(
+            self.db_path, f"fts:{table}", functools.partial(_probe_fts, table), self.in_memory
+        )
+
+    def run_query(self, sql, arguments, fetchone=False, row_factory=dict_factory):
+        """
+        Run ``sql`` and return the fetched row(s).
+
+        :param row_factory: builds each result row, as for
+            :attr:`sqlite3.Cursor.row_factory`. Defaults to :func:`dict_factory`;
+            pass ``None`` for plain tuples.
+        """
+        # Not self.connection: a reload since initialize() may have closed it.
+        cursor = connection_pool.acquire(self.db_path, self.in_memory).cursor()
+        cursor.row_factory = row_factory
+        cursor.execute(sql, arguments)
+        if fetchone:
+            return cursor.fetchone()
+        return cursor.fetchall()
+
+    def run_batch_query(self, sql, values, row_factory=dict_factory):
+        """
+        Run ``sql`` once per :data:`BATCH_SIZE` chunk of ``values``.
+
+        ``sql`` must contain a ``{params}`` placeholder, which is replaced with
+        the bound-parameter list for each chunk (e.g. ``WHERE isin IN ({params})``).
+
+        :return: rows from all chunks, in chunk order.
+        """
+        values = list(values)
+        rows = []
+        for start in range(0, len(values), BATCH_SIZE):
+            chunk = values[start : start + BATCH_SIZE]
+            statement = sql.format(params=", ".join("?" * len(chunk)))
+            rows.extend(self.run_query(statement, chunk, row_factory=row_factory))
+        return rows
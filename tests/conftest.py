@@ -3,7 +3,15 @@ import shutil
 
 import pytest
 
-from casparser_isin.utils import INTERNAL_ISIN_DB_PATH
+from casparser_isin.utils import INTERNAL_ISIN_DB_PATH, lookup_cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_lookup_cache():
+    """Start every test with an empty lookup cache so spies see real queries."""
+    lookup_cache.clear()
+    yield
+    lookup_cache.clear()
 
 
 @pytest.fixture
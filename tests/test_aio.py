@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from casparser_isin import AsyncISINDb, AsyncMFISINDb, ISINDb, MFISINDb
+
+HOLDING = ("Axis Long Term Equity Fund - Direct Growth", "KFINTECH", "128TSDGG")
+
+
+class TestAsyncLookups:
+    def test_same_results_as_sync(self):
+        async def lookups():
+            async with AsyncMFISINDb() as mf, AsyncISINDb() as db:
+                return await asyncio.gather(
+                    mf.isin_lookup(*HOLDING),
+                    mf.scheme_lookup("KFINTECH", HOLDING[0], HOLDING[2]),
+                    mf.direct_isin_lookup("INF846K01EW2"),
+                    mf.nav_lookup("INF846K01EW2"),
+                    db.isin_lookup("INE009A01021"),
+                )
+
+        mf, db = MFISINDb(), ISINDb()
+        assert asyncio.run(lookups()) == [
+            mf.isin_lookup(*HOLDING),
+            mf.scheme_lookup("KFINTECH", HOLDING[0], HOLDING[2]),
+            mf.direct_isin_lookup("INF846K01EW2"),
+            mf.nav_lookup("INF846K01EW2"),
+            db.isin_lookup("INE009A01021"),
+        ]
+
+    def test_runs_off_the_event_loop(self):
+        async def lookup():
+            async with AsyncISINDb(max_workers=1) as db:
+                db.db.isin_lookup = lambda isin: threading.current_thread().name
+                return await db.isin_lookup("INE009A01021")
+
+        assert asyncio.run(lookup()).startswith("casparser-isin")
+
+    def test_errors_propagate(self):
+        async def lookup():
+            async with AsyncMFISINDb() as db:
+                with pytest.raises(TypeError):
+                    await db.isin_lookup(None, "CAMS", "X")
+                with pytest.raises(ValueError, match="No schemes found"):
+                    await db.isin_lookup("No such fund", "CAMS", "XXXX")
+
+        asyncio.run(lookup())
+
+
+class TestSingleFlight:
+    def test_identical_requests_coalesce(self):
+        calls = []
+        release = threading.Event()
+
+        def slow_lookup(*args):
+            calls.append(args)
+            release.wait(5)
+            return "result"
+
+        async def lookups():
+            async with AsyncMFISINDb() as db:
+                db.db.isin_lookup = slow_lookup
+                tasks = [
+                    asyncio.ensure_future(db.isin_lookup(*HOLDING)),
+                    # Same lookup key: case and spacing are ignored.
+                    asyncio.ensure_future(
+                        db.isin_lookup(HOLDING[0].upper(), "kfintech", "128 TSDGG")
+                    ),
+                    asyncio.ensure_future(db.isin_lookup(*HOLDING, min_score=90)),
+                ]
+                await asyncio.sleep(0.05)
+                release.set()
+                return await asyncio.gather(*tasks), db._inflight
+
+        results, inflight = asyncio.run(lookups())
+        assert results == ["result"] * 3
+        assert len(calls) == 2
+        assert inflight == {}
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        release = threading.Event()
+
+        def slow_lookup(isin):
+            release.wait(5)
+            return isin
+
+        async def lookups():
+            async with AsyncISINDb() as db:
+                db.db.isin_lookup = slow_lookup
+                first = asyncio.ensure_future(db.isin_lookup("INE009A01021"))
+                second = asyncio.ensure_future(db.isin_lookup("INE009A01021"))
+                await asyncio.sleep(0.05)
+                first.cancel()
+                release.set()
+                return await second, first.cancelled()
+
+        assert asyncio.run(lookups()) == ("INE009A01021", True)
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+from casparser_isin import ISINDb, MFISINDb
+from casparser_isin.bloom import BloomFilter, load_bloom_filter
+from casparser_isin.utils import connection_pool
+
+
+def _isins(prefix, count):
+    return [f"{prefix}{i:09d}" for i in range(count)]
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        keys = _isins("INE", 5000)
+        bloom = BloomFilter.from_keys(keys)
+        assert all(key in bloom for key in keys)
+        assert bloom.n == 5000
+        assert bloom.nbytes == 5000 * 10 // 8
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter.from_keys(_isins("INE", 5000))
+        absent = _isins("INF", 20000)
+        observed = sum(key in bloom for key in absent) / len(absent)
+        assert bloom.false_positive_rate < 0.01
+        assert observed < 2 * bloom.false_positive_rate
+
+    def test_empty(self):
+        bloom = BloomFilter.from_keys([])
+        assert "INE009A01021" not in bloom
+        assert bloom.false_positive_rate == 0
+
+    def test_load(self, tmp_path):
+        bloom = BloomFilter.from_keys(["INE009A01021"])
+        with sqlite3.connect(tmp_path / "x.db") as conn:
+            assert load_bloom_filter(conn, "isin") is None
+            conn.execute("CREATE TABLE bloom(name NOT NULL PRIMARY KEY, bits, k, n)")
+            conn.execute(
+                "INSERT INTO bloom VALUES ('isin', ?, ?, ?)", (bloom.bits, bloom.k, bloom.n)
+            )
+            loaded = load_bloom_filter(conn, "isin")
+            assert load_bloom_filter(conn, "scheme") is None
+        conn.close()
+        assert (loaded.bits, loaded.k, loaded.n) == (bloom.bits, bloom.k, bloom.n)
+
+
+class TestNegativeLookup:
+    """ISINs rejected by the shipped filters never reach SQLite."""
+
+    def test_misses_skip_query(self, monkeypatch):
+        isin_db, mf_db = ISINDb(), MFISINDb()
+        if connection_pool.membership_filter(isin_db.db_path, "isin") is None:
+            pytest.skip("database predates shipped Bloom filters")
+        assert isin_db.may_contain("isin", "INE009A01021")
+        # Any given absent ISIN may be a false positive; pick ones that aren't.
+        absent_isin = next(k for k in _isins("INE", 100) if not isin_db.may_contain("isin", k))
+        absent_mf = next(k for k in _isins("INF", 100) if not mf_db.may_contain("scheme", k))
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("query issued for an absent ISIN")
+
+        monkeypatch.setattr(isin_db, "run_query", _fail)
+        monkeypatch.setattr(mf_db, "run_query", _fail)
+        assert isin_db.isin_lookup(absent_isin) is None
+        assert isin_db.isin_lookup_many([absent_isin]) == {absent_isin: None}
+        assert mf_db.direct_isin_lookup(absent_mf) == []
+
+    def test_db_without_filters(self, tmp_path, monkeypatch):
+        path = tmp_path / "old.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE isin(isin PRIMARY KEY, name, issuer, type, status)")
+            conn.execute("INSERT INTO isin VALUES ('INE000000000', 'X', 'Y', 'EQUITY', 'ACTIVE')")
+        conn.close()
+        monkeypatch.setenv("CASPARSER_ISIN_DB", str(path))
+        assert ISINDb().may_contain("isin", "INE111111111")
+        assert ISINDb().isin_lookup("INE000000000").name == "X"
@@ -0,0 +1,47 @@
+import pytest
+
+from casparser_isin import MFISINDb
+from casparser_isin.bulk import isin_lookup_bulk
+
+HOLDINGS = [
+    ("Axis Long Term Equity Fund - Direct Growth", "KFINTECH", "128TSDGG", None),
+    ("Axis Long Term Equity Fund - Growth", "KFINTECH", "128TSDGG", "INF846K01EW2"),
+    ("No such fund", "CAMS", "XXXX", None),
+    ("Mirae Asset Tax Saver Fund - Direct Growth", "KARVY", "117TSD1G", None),
+    ("HDFC TaxSaver - Regular Plan - Growth", "CAMS", "HTS", None),
+    (None, "CAMS", "X", None),
+    ("Bad RTA", "NOPE", "X", None),
+]
+
+
+def _comparable(results):
+    return [r if not isinstance(r, Exception) else (type(r), str(r)) for r in results]
+
+
+def test_same_results_in_order():
+    items = HOLDINGS * 5
+    expected = _comparable(MFISINDb().isin_lookup_many(items))
+    results = list(isin_lookup_bulk(iter(items), max_workers=2, chunk_size=3))
+    assert _comparable(results) == expected
+
+
+def test_backpressure_and_early_exit():
+    consumed = []
+
+    def holdings():
+        for n in range(10_000):
+            consumed.append(n)
+            yield HOLDINGS[n % len(HOLDINGS)]
+
+    results = isin_lookup_bulk(holdings(), max_workers=1, chunk_size=10, max_pending=2)
+    assert consumed == []
+    next(results)
+    # Two chunks in flight plus the one read while waiting for the first.
+    assert len(consumed) == 30
+    results.close()
+    assert len(consumed) == 30
+
+
+def test_bad_chunk_size():
+    with pytest.raises(ValueError, match="chunk_size"):
+        isin_lookup_bulk(HOLDINGS, chunk_size=0)
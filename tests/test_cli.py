@@ -1,5 +1,6 @@
 import functools
 import logging
+import sqlite3
 from urllib import request
 
 import pytest
@@ -128,6 +129,28 @@ class TestCLI:
         # The bundled DB must be untouched.
         assert isolated_isin_db.read_bytes() == original_payload
 
+    @pytest.mark.parametrize("local_dbformat,remote_dbformat", [("2", "3"), ("3", "2"), ("3", "3")])
+    def test_update_across_supported_dbformats(
+        self, monkeypatch, update_cli, caplog, isolated_isin_db, local_dbformat, remote_dbformat
+    ):
+        """A newer remote DB in any supported format replaces the local one, e.g. 2 -> 3."""
+        conn = sqlite3.connect(isolated_isin_db)
+        with conn:
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'dbformat'", (local_dbformat,))
+        conn.close()
+
+        def mock_urlopen(request_obj):
+            return MockResponse(
+                request_obj, remote_db_version="3099.01.01", remote_dbformat=remote_dbformat
+            )
+
+        caplog.set_level(logging.INFO)
+        with monkeypatch.context() as m:
+            m.setattr(request, "urlopen", mock_urlopen)
+            cli.main()
+        assert caplog.records[-1].message == "Updated casparser-isin database."
+        assert isolated_isin_db.read_bytes() == b"mock_data"
+
     def test_dbformat_mismatch_check_returns_zero(
         self, monkeypatch, check_cli, caplog, isolated_isin_db
     ):
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+import pytest
+
+import casparser_isin
+
+
+def _loaded_after(statement):
+    """Top-level modules present in ``sys.modules`` after ``statement`` in a fresh interpreter."""
+    code = f"import sys; {statement}; print(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(out.stdout.split())
+
+
+class TestLazyImports:
+    def test_package_import_is_light(self):
+        loaded = _loaded_after("import casparser_isin")
+        assert not {"rapidfuzz", "sqlite3", "casparser_isin.mf_isin"} & loaded
+
+    def test_cli_defers_heavy_imports(self):
+        loaded = _loaded_after("import casparser_isin.cli")
+        assert not {"rapidfuzz", "packaging", "urllib.request"} & loaded
+
+    def test_rapidfuzz_only_for_fuzzy_matching(self):
+        loaded = _loaded_after("from casparser_isin import MFISINDb, SchemeData")
+        assert "casparser_isin.mf_isin" in loaded
+        assert "rapidfuzz" not in loaded
+
+    def test_public_names(self):
+        assert casparser_isin.MFISINDb.__name__ == "MFISINDb"
+        assert set(casparser_isin.__all__) <= set(dir(casparser_isin))
+        with pytest.raises(AttributeError):
+            casparser_isin.NoSuchThing  # noqa: B018
@@ -1,11 +1,14 @@
 import csv
+import sqlite3
 from decimal import Decimal
 from pathlib import Path
 
 # noinspection PyPackageRequirements
 import pytest
+from rapidfuzz import fuzz, process, utils
 
-from casparser_isin import ISINDb, MFISINDb
+from casparser_isin import ISINData, ISINDb, MFISINDb, SchemeData
+from casparser_isin.mf_isin import fuzzy_key
 
 BASE_DIR = Path(__file__).resolve().parent
 FIXTURES_PATH = BASE_DIR / "fixtures.csv"
@@ -64,6 +67,43 @@ class TestISINSearch:
             nav = db.nav_lookup("invalid_isin")
             assert nav is None
 
+    def test_nav_lookup_many(self):
+        isins = ["INF209K01BS7", "invalid_isin", "INF090I01635", "INF209K01BS7"]
+        with MFISINDb() as db:
+            navs = db.nav_lookup_many(isins)
+            assert navs == {
+                "INF209K01BS7": Decimal("151.06"),
+                "invalid_isin": None,
+                "INF090I01635": Decimal("15.7036"),
+            }
+            assert list(navs) == ["INF209K01BS7", "invalid_isin", "INF090I01635"]
+            assert db.nav_lookup_many([]) == {}
+
+    def test_amfi_lookup(self):
+        with MFISINDb() as db:
+            assert [row.isin for row in db.amfi_lookup("120503")] == ["INF846K01EW2"]
+            assert db.amfi_lookup("000000") == []
+            found = db.amfi_lookup_many(["120503", "000000", "120503"])
+            assert list(found) == ["120503", "000000"]
+            assert found["120503"] == db.amfi_lookup("120503")
+            assert found["000000"] == []
+
+    def test_family_lookup(self):
+        with MFISINDb() as db:
+            family = {row.isin for row in db.family_lookup("INF846K01EW2")}
+            assert "INF846K01EW2" in family
+            assert db.family_lookup("invalid_isin") == []
+            if not db.has_column("scheme", "family_id"):
+                pytest.skip("database predates scheme families (grouped by AMFI code)")
+            assert "INF846K01131" in family
+
+    def test_nav_map_shared(self):
+        navs = MFISINDb()._navs()
+        assert MFISINDb(in_memory=True)._navs() is navs
+        assert navs["INF209K01BS7"] == Decimal("151.06")
+        with pytest.raises(TypeError):
+            navs["INF209K01BS7"] = Decimal(0)
+
     def test_isin(self):
         # ISINDb covers the generic `isin` table, scoped to retail-relevant
         # instrument types (equities / bonds / preference shares / etc.).
@@ -76,6 +116,36 @@ class TestISINSearch:
             for isin in ("invalid_isin", "INF090I0163"):
                 assert db.isin_lookup(isin) is None
 
+    def test_isin_lookup_many(self, monkeypatch):
+        monkeypatch.setattr("casparser_isin.utils.BATCH_SIZE", 2)
+        isins = ["INE009A01021", "invalid_isin", "INE001A01036", "INE009A01021", "INE001A07629"]
+        with ISINDb() as db:
+            results = db.isin_lookup_many(isins)
+            assert list(results) == ["INE009A01021", "invalid_isin", "INE001A01036", "INE001A07629"]
+            assert results["invalid_isin"] is None
+            for isin, data in results.items():
+                assert data == db.isin_lookup(isin)
+            assert db.isin_lookup_many([]) == {}
+
+    def test_iter_isin_lookup(self):
+        isins = ["INE009A01021", "invalid_isin", "INE001A07629"]
+        read = []
+
+        def lines():
+            for n in range(999):
+                read.append(n)
+                yield isins[n % 3]
+
+        with ISINDb() as db:
+            results = db.iter_isin_lookup(lines(), chunk_size=4)
+            assert read == []
+            first = [next(results) for _ in range(5)]
+            assert len(read) == 8  # two chunks
+            assert first == [db.isin_lookup(isin) for isin in isins * 2][:5]
+            assert sum(result is None for result in results) == 333 - 2
+            with pytest.raises(ValueError, match="chunk_size"):
+                db.iter_isin_lookup([], chunk_size=0)
+
     def test_isin_returns_full_record(self):
         """ISINDb.isin_lookup must populate every ISINData field, not just isin/name."""
         with ISINDb() as db:
@@ -145,6 +215,79 @@ class TestFranklinLookup:
         assert data.isin == "INF090I01726"
 
 
+class TestRtaCodeKey:
+    """RTA codes are matched on the normalized ``scheme.rta_code_key``."""
+
+    def test_case_and_spacing_insensitive(self):
+        with MFISINDb() as db:
+            if not db.has_column("scheme", "rta_code_key"):
+                pytest.skip("database predates rta_code_key (see test_db_without_key_column)")
+            expected = db.scheme_lookup("KARVY", "Mirae Asset Large Cap Fund", "117IOD1G")
+            assert expected
+            assert db.scheme_lookup("KARVY", "Mirae Asset Large Cap Fund", "117 iod1g") == expected
+
+    def test_db_without_key_column(self, tmp_path, monkeypatch):
+        # Databases built before dbformat 3 only have the raw rta_code.
+        path = tmp_path / "isin.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE scheme(id INTEGER PRIMARY KEY, name, isin, amfi_code, type, "
+                "rta, rta_code)"
+            )
+            conn.execute(
+                "INSERT INTO scheme VALUES (1, 'fund a - growth', 'INF000000001', '1', 'EQUITY', "
+                "'CAMS', 'ABC1')"
+            )
+        conn.close()
+        monkeypatch.setenv("CASPARSER_ISIN_DB", str(path))
+        with MFISINDb() as db:
+            for rta_code in ("ABC1", "ABC1X"):
+                rows = db.scheme_lookup("CAMS", "Fund A", rta_code)
+                assert [row["isin"] for row in rows] == ["INF000000001"]
+            assert db.scheme_lookup("CAMS", "Fund A", "abc1") == []
+
+
+class TestFuzzyKeys:
+    """Fuzzy disambiguation scores stored ``scheme.fuzzy_key`` values."""
+
+    def test_candidates_carry_stored_keys(self):
+        with MFISINDb() as db:
+            if not db.has_column("scheme", "fuzzy_key"):
+                pytest.skip("database predates stored fuzzy keys")
+            rows = db._direct_isin_rows("INF044D01583")
+            assert len(rows) > 1
+            assert rows.fuzzy_keys == [fuzzy_key(row.name) for row in rows]
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "TAURUS SHORT TERM INCOME FUND REGULAR PLAN IDCW PAYOUT",
+            "Taurus Short Term Income Fund - IDCW Payout",
+            "Payout IDCW - Regular - Taurus Short Term Income",
+            "taurus",
+            "",
+        ],
+    )
+    @pytest.mark.parametrize("min_score", [0, 60, 95, 101])
+    def test_scores_match_token_sort_ratio(self, name, min_score):
+        with MFISINDb() as db:
+            candidates = db._direct_isin_rows("INF044D01583")
+            assert len(candidates) > 1
+            schemes = {x.name: x for x in candidates}
+            key, score, _ = process.extractOne(
+                name,
+                schemes.keys(),
+                processor=utils.default_process,
+                scorer=fuzz.token_sort_ratio,
+            )
+            args = (name, "KARVY", "X", "INF044D01583", min_score)
+            if score >= min_score:
+                assert db.isin_lookup(*args) == schemes[key]._replace(score=score)
+            else:
+                with pytest.raises(ValueError):
+                    db.isin_lookup(*args)
+
+
 class TestDirectIsinLookup:
     """Behaviour when an ISIN is supplied directly."""
 
@@ -175,6 +318,117 @@ class TestDirectIsinLookup:
         assert data.isin == "INF179K01319"
 
 
+class TestBatchLookup:
+    """MFISINDb.isin_lookup_many must match isin_lookup item for item."""
+
+    def test_matches_single_item_semantics(self, monkeypatch):
+        monkeypatch.setattr("casparser_isin.utils.BATCH_SIZE", 3)
+        items = []
+        with open(FIXTURES_PATH) as fp:
+            reader = csv.reader(fp)
+            next(reader)
+            for name, rta, rta_code, _, isin, _ in reader:
+                items.append((name, rta, rta_code, None))
+                items.append((name, rta, rta_code, isin))
+        items += [
+            ("HDFC ARBITRAGE FUND - RETAIL PLAN - GROWTH OPTION", "CAMS", "HAFRG", "ZZZZZZZZZZZZ"),
+            (
+                "TAURUS SHORT TERM INCOME FUND REGULAR PLAN IDCW PAYOUT",
+                "KARVY",
+                "X",
+                "INF044D01583",
+            ),
+            ("Franklin India Prima Fund - IDCW - Payout", "CAMS", "FTI 001", None),
+            ("ICICI Prudential MIP - Direct Plan growth", "CAMS", "P80245", None),
+            ("", "", "", None),
+            (None, "CAMS", "", None),
+            ("", "KARVY", "", None),
+            ("Axis Long Term Equity Fund - Growth", "CAMS", "128TSGP", ["INF846K01131"]),
+            ("too", "short"),
+        ]
+        with MFISINDb() as db:
+            results = db.isin_lookup_many(items)
+            assert len(results) == len(items)
+            for item, result in zip(items, results, strict=True):
+                try:
+                    expected = db.isin_lookup(*item)
+                except (TypeError, ValueError) as exc:
+                    assert type(result) is type(exc)
+                else:
+                    assert result == expected
+
+    def test_iter_isin_lookup(self):
+        items = [
+            ("Axis Long Term Equity Fund - Growth", "KFINTECH", "128TSDGG", "INF846K01EW2"),
+            ("No such fund", "CAMS", "XXXX", None),
+            ("too", "short"),
+        ] * 3
+        with MFISINDb() as db:
+            results = db.iter_isin_lookup(iter(items), chunk_size=2)
+            expected = db.isin_lookup_many(items)
+            for result, want in zip(results, expected, strict=True):
+                assert result == want or type(result) is type(want)
+
+
+class TestTypedRows:
+    """Lookups build typed rows internally; the public row lookups still return dicts."""
+
+    def test_direct_isin_lookup_rows(self):
+        with MFISINDb() as db:
+            rows = db._direct_isin_rows("INF179K01319")
+            assert rows
+            assert all(isinstance(row, SchemeData) and row.score == 100 for row in rows)
+            assert rows[0].isin == "INF179K01319"
+            assert db.direct_isin_lookup("INF179K01319") == [
+                {"name": row.name, "isin": row.isin, "amfi_code": row.amfi_code, "type": row.type}
+                for row in rows
+            ]
+
+    def test_scheme_lookup_rows(self):
+        args = ("CAMS", "HDFC ARBITRAGE FUND - RETAIL PLAN - GROWTH", "HAFRG")
+        with MFISINDb() as db:
+            rows = db._scheme_rows(*args)
+            assert rows
+            assert [type(row) for row in rows] == [SchemeData] * len(rows)
+            dicts = db.scheme_lookup(*args)
+        assert [row["isin"] for row in dicts] == [row.isin for row in rows]
+        assert all(list(row) == ["name", "isin", "amfi_code", "type"] for row in dicts)
+
+    def test_isin_data(self):
+        data = ISINDb().isin_lookup("INE009A01021")
+        assert type(data) is ISINData
+
+
+class TestLookupCache:
+    """Repeated lookups are answered from the shared LRU cache."""
+
+    def test_repeat_lookup_hits_cache(self, monkeypatch):
+        args = ("Axis Long Term Equity Fund - Direct Growth", "KFINTECH", "128TSDGG")
+        with MFISINDb() as db:
+            first = db.isin_lookup(*args)
+            hits = MFISINDb.cache_info().hits
+            monkeypatch.setattr(db, "_scheme_rows", pytest.fail)
+            # Case and spacing differences share the cache entry.
+            again = db.isin_lookup(args[0].upper() + "  ", "kfintech", "128 TSDGG")
+        assert again == first
+        assert MFISINDb.cache_info().hits == hits + 1
+
+    def test_misses_are_cached(self):
+        hits = MFISINDb.cache_info().hits
+        with MFISINDb() as db:
+            for _ in range(2):
+                with pytest.raises(ValueError):
+                    db.isin_lookup("No such fund", "CAMS", "XXXX")
+        assert ISINDb().isin_lookup("INE000000000") is None
+        assert ISINDb().isin_lookup("INE000000000") is None
+        assert MFISINDb.cache_info().hits == hits + 2
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr("casparser_isin.utils.lookup_cache.maxsize", 0)
+        ISINDb().isin_lookup("INE009A01021")
+        assert ISINDb.cache_info().currsize == 0
+
+
 class TestIsinFirstPriority:
     """Lock down the documented lookup priority: ISIN > rta_code > fuzzy.
 
@@ -193,13 +447,13 @@ class TestIsinFirstPriority:
         """
         with MFISINDb() as db:
             sentinel = {"called": False}
-            original_scheme_lookup = db.scheme_lookup
+            original_scheme_lookup = db._scheme_rows
 
             def _spy(*args, **kwargs):
                 sentinel["called"] = True
                 return original_scheme_lookup(*args, **kwargs)
 
-            monkeypatch.setattr(db, "scheme_lookup", _spy)
+            monkeypatch.setattr(db, "_scheme_rows", _spy)
 
             # INE009A01021 is Infosys (well-known equity); but we want an MF
             # ISIN that the scheme table covers. Use a real one with rta_code
@@ -253,13 +507,13 @@ class TestIsinFirstPriority:
         """Backward-compat: callers that don't supply ISIN still resolve."""
         with MFISINDb() as db:
             sentinel = {"called": False}
-            original_scheme_lookup = db.scheme_lookup
+            original_scheme_lookup = db._scheme_rows
 
             def _spy(*args, **kwargs):
                 sentinel["called"] = True
                 return original_scheme_lookup(*args, **kwargs)
 
-            monkeypatch.setattr(db, "scheme_lookup", _spy)
+            monkeypatch.setattr(db, "_scheme_rows", _spy)
 
             data = db.isin_lookup(
                 "HDFC ARBITRAGE FUND - RETAIL PLAN - GROWTH OPTION",
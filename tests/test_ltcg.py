@@ -0,0 +1,90 @@
+import datetime
+import random
+from decimal import Decimal
+
+import pytest
+
+from casparser_isin import MFISINDb
+from casparser_isin.ltcg import grandfathered_cost
+
+NAVS = {"INF000000001": Decimal("100.0"), "INF000000002": Decimal("20.5")}
+BEFORE = datetime.date(2017, 6, 1)
+CUTOFF = datetime.date(2018, 1, 31)
+AFTER = datetime.date(2018, 2, 1)
+
+
+def _reference(isin, purchase_date, purchase_nav, units, sale_nav):
+    nav = NAVS.get(isin)
+    if nav is None or purchase_date > CUTOFF:
+        return units * purchase_nav
+    fmv = units * nav if sale_nav is None else min(units * nav, units * sale_nav)
+    return max(units * purchase_nav, fmv)
+
+
+def _lots(count, seed=0):
+    rng = random.Random(seed)
+    isins = [rng.choice([*NAVS, "INF999999999"]) for _ in range(count)]
+    dates = [CUTOFF + datetime.timedelta(days=rng.randint(-3, 3)) for _ in range(count)]
+    # Few distinct values, so ties between NAVs come up often.
+    navs = [Decimal(rng.choice(["20.5", "20.50", "99.9", "100", "150.0001"])) for _ in range(count)]
+    units = [Decimal(rng.randint(1, 10**6)) / 1000 for _ in range(count)]
+    sales = [Decimal(rng.choice(["10", "20.5", "100.00", "120"])) for _ in range(count)]
+    return isins, dates, navs, units, sales
+
+
+@pytest.mark.parametrize(
+    "isin,purchase_date,purchase_nav,sale_nav,expected",
+    [
+        ("INF000000001", BEFORE, Decimal("80"), None, Decimal("1000.0")),
+        ("INF000000001", CUTOFF, Decimal("80"), Decimal("90"), Decimal("900")),
+        ("INF000000001", BEFORE, Decimal("120"), Decimal("150"), Decimal("1200")),
+        ("INF000000001", AFTER, Decimal("80"), None, Decimal("800")),
+        ("INF999999999", BEFORE, Decimal("80"), None, Decimal("800")),
+    ],
+)
+def test_rule(isin, purchase_date, purchase_nav, sale_nav, expected):
+    sale_navs = None if sale_nav is None else [sale_nav]
+    costs = grandfathered_cost(NAVS, [isin], [purchase_date], [purchase_nav], [10], sale_navs)
+    assert costs == [expected]
+
+
+@pytest.mark.parametrize("with_sale", [False, True])
+def test_matches_decimal_reference(with_sale):
+    isins, dates, navs, units, sales = _lots(5000)
+    sales = sales if with_sale else None
+    costs = grandfathered_cost(NAVS, isins, dates, navs, units, sales)
+    expected = list(map(_reference, isins, dates, navs, units, sales or [None] * len(isins)))
+    assert costs == expected
+    assert all(isinstance(cost, Decimal) for cost in costs)
+
+
+@pytest.mark.parametrize("with_sale", [False, True])
+def test_numpy_arrays(with_sale):
+    np = pytest.importorskip("numpy")
+    isins, dates, navs, units, sales = _lots(5000, seed=1)
+    sales = sales if with_sale else None
+    expected = grandfathered_cost(NAVS, isins, dates, navs, units, sales)
+    for purchase_dates in (np.array(dates, dtype="datetime64[D]"), np.array(dates, dtype=object)):
+        costs = grandfathered_cost(
+            NAVS,
+            np.array(isins),
+            purchase_dates,
+            np.array(navs, dtype=object),
+            np.array(units, dtype=object),
+            None if sales is None else np.array(sales, dtype=object),
+        )
+        assert isinstance(costs, list)
+        # Same Decimals down to the exponent, not just equal values.
+        assert [str(cost) for cost in costs] == [str(cost) for cost in expected]
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError, match="same length"):
+        grandfathered_cost(NAVS, ["INF000000001"], [BEFORE], [Decimal(1)], [])
+
+
+def test_mf_isin_db():
+    costs = MFISINDb().grandfathered_cost_many(
+        ["INF209K01BS7", "INF209K01BS7"], [BEFORE, AFTER], [Decimal("100")] * 2, [Decimal(2)] * 2
+    )
+    assert costs == [Decimal("302.12"), Decimal("200")]
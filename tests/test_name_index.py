@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+from rapidfuzz import fuzz, process, utils
+
+from casparser_isin import SchemeData
+from casparser_isin.mf_isin import fuzzy_key
+from casparser_isin.name_index import CANDIDATES, POSTINGS_BUDGET, NameIndex
+
+AMCS = ["axis", "hdfc", "icici prudential", "mirae asset", "sbi", "uti", "dsp", "kotak"]
+KINDS = ["large cap", "mid cap", "small cap", "flexi cap", "tax saver", "liquid", "gilt"]
+PLANS = ["direct plan", "regular plan"]
+OPTIONS = ["growth", "idcw payout", "idcw reinvestment"]
+
+
+def _index(names):
+    rows = []
+    for id_, name in enumerate(names, 1):
+        row = SchemeData(name, f"INF{id_:09d}", None, "EQUITY", 100)
+        rows.append((id_, row, utils.default_process(name), fuzzy_key(name)))
+    return NameIndex(rows)
+
+
+def _names(count):
+    combos = itertools.cycle(itertools.product(AMCS, KINDS, PLANS, OPTIONS))
+    return [
+        f"{amc} {kind} fund {n} - {plan} - {option}"
+        for n, (amc, kind, plan, option) in zip(range(count), combos, strict=False)
+    ]
+
+
+class TestNameIndex:
+    def test_candidates_share_rare_tokens(self):
+        index = _index(_names(2000))
+        numbers = index.candidates(fuzzy_key("Mirae Asset Tax Saver Fund 150 - Direct Growth"))
+        rows, _ = index.rows_for(numbers)
+        assert rows[0].name == "mirae asset tax saver fund 150 - direct plan - growth"
+        assert 0 < len(numbers) <= 64
+
+    def test_shards_are_contiguous(self):
+        names = _names(2000)
+        index = _index(names)
+        low, high = index.shard(utils.default_process("HDFC Gilt Fund - Growth"))
+        assert high - low == sum(name.startswith("hdfc ") for name in names)
+        assert all(row.name.startswith("hdfc ") for row in index.rows[low:high])
+        assert index.shard("franklin india prima fund") is None
+
+        numbers = index.candidates(fuzzy_key("hdfc gilt fund growth"), (low, high))
+        assert numbers and all(low <= n < high for n in numbers)
+
+    def test_newest_row_first_on_ties(self):
+        index = _index(["Axis Gilt Fund - Growth", "Axis Gilt Fund - Growth"])
+        rows, _ = index.rows_for(index.candidates(fuzzy_key("axis gilt fund growth")))
+        assert [row.isin for row in rows] == ["INF000000002", "INF000000001"]
+
+    def test_common_tokens_are_skipped(self):
+        index = _index(_names(2000))
+        # Every token occurs in more rows than the budget allows reading.
+        assert index.candidates(fuzzy_key("fund growth plan"), budget=100) == []
+        assert index.candidates(fuzzy_key("fund growth plan 7"), budget=100)
+
+    @pytest.mark.parametrize("budget", [POSTINGS_BUDGET, 500])
+    def test_work_is_bounded(self, budget):
+        # Latency is measured by benchmarks/bench_fuzzy_search.py; here, that a
+        # query's work stays within its bounds however large the index is.
+        names = _names(20_000)
+        index = _index(names)
+        reads = []
+        index._postings = {
+            token: _CountingPostings(postings, reads) for token, postings in index._postings.items()
+        }
+        for name in names[:200]:
+            reads.clear()
+            key = fuzzy_key(name.replace("fund", "fnd"))
+            numbers = index.candidates(key, budget=budget)
+            assert sum(reads) <= budget
+            assert 0 < len(numbers) <= CANDIDATES
+            _, keys = index.rows_for(numbers)
+            best = process.extractOne(key, keys, scorer=fuzz.ratio, processor=None)
+            assert best[0] == fuzzy_key(name)
+
+
+class _CountingPostings:
+    """A posting list that records how many entries each slice of it reads."""
+
+    def __init__(self, postings, reads):
+        self.postings = postings
+        self.reads = reads
+
+    def __len__(self):
+        return len(self.postings)
+
+    def __getitem__(self, item):
+        found = self.postings[item]
+        if isinstance(item, slice):
+            self.reads.append(len(found))
+        return found
@@ -0,0 +1,70 @@
+import pytest
+
+from casparser_isin import AnyISINDb, ISINDb, MFISINDb, SchemeData
+from casparser_isin.resolver import ENRICH_COLUMNS, MUTUAL_FUND, SECURITY
+
+
+class TestAnyISINDb:
+    def test_resolve_mutual_fund(self):
+        with AnyISINDb() as db:
+            match = db.resolve("INF846K01EW2")
+        assert match.kind == MUTUAL_FUND
+        fund = MFISINDb().direct_isin_lookup("INF846K01EW2")[0]
+        assert match.data == SchemeData(**fund, score=100)
+
+    def test_resolve_security(self):
+        with AnyISINDb() as db:
+            match = db.resolve("INE009A01021")
+        assert match.kind == SECURITY
+        assert match.data == ISINDb().isin_lookup("INE009A01021")
+
+    def test_resolve_unknown(self):
+        db = AnyISINDb()
+        assert db.resolve("INE000X00000") is None
+        assert db.resolve("") is None
+
+    def test_resolve_many(self):
+        isins = ["INE009A01021", "INF846K01EW2", "unknown", "INE009A01021", "INF044D01583"]
+        db = AnyISINDb()
+        results = db.resolve_many(isins)
+        assert list(results) == ["INE009A01021", "INF846K01EW2", "unknown", "INF044D01583"]
+        assert results == {isin: db.resolve(isin) for isin in results}
+        # Several scheme rows share this ISIN: the newest wins, as for direct_isin_lookup.
+        newest = MFISINDb().direct_isin_lookup("INF044D01583")[0]
+        assert results["INF044D01583"].data == SchemeData(**newest, score=100)
+        assert db.resolve_many([]) == {}
+
+
+class TestEnrich:
+    ISINS = ["INE009A01021", "INF846K01EW2", "unknown", None, "INE009A01021", float("nan")]
+
+    def test_columns_aligned(self):
+        np = pytest.importorskip("numpy")
+        columns = AnyISINDb().enrich(np.array(self.ISINS, dtype=object))
+        assert list(columns) == list(ENRICH_COLUMNS)
+        assert all(column.dtype == object and len(column) == 6 for column in columns.values())
+        fund = SchemeData(**MFISINDb().direct_isin_lookup("INF846K01EW2")[0], score=100)
+        security = ISINDb().isin_lookup("INE009A01021")
+        rows = list(zip(*columns.values(), strict=True))
+        assert rows[0] == (SECURITY, security.name, security.issuer, security.type, None, None)
+        assert rows[1] == (MUTUAL_FUND, fund.name, None, None, fund.amfi_code, fund.type)
+        assert rows[2] == rows[3] == rows[5] == (None,) * len(ENRICH_COLUMNS)
+        assert rows[4] == rows[0]
+
+    def test_sequences(self):
+        np = pytest.importorskip("numpy")
+        db = AnyISINDb()
+        expected = db.enrich(np.array(self.ISINS, dtype=object))
+        assert all(len(column) == 0 for column in db.enrich([]).values())
+        for isins in (self.ISINS, tuple(self.ISINS)):
+            columns = db.enrich(isins)
+            assert all(columns[c].tolist() == expected[c].tolist() for c in ENRICH_COLUMNS)
+
+    def test_series(self):
+        np = pytest.importorskip("numpy")
+        pd = pytest.importorskip("pandas")
+        db = AnyISINDb()
+        expected = db.enrich(np.array(self.ISINS, dtype=object))
+        series = pd.Series(self.ISINS, index=range(10, 16))
+        columns = db.enrich(series)
+        assert all(columns[c].tolist() == expected[c].tolist() for c in ENRICH_COLUMNS)
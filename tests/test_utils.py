@@ -1,6 +1,34 @@
 import logging
+import os
+import sqlite3
+import threading
 
-from casparser_isin.utils import INTERNAL_ISIN_DB_PATH, get_isin_db_path
+import pytest
+
+from casparser_isin.utils import (
+    DB,
+    INTERNAL_ISIN_DB_PATH,
+    ConnectionPool,
+    LRUCache,
+    connection_pool,
+    get_cache_size,
+    get_isin_db_path,
+    get_mmap_size,
+    get_reload_interval,
+    lookup_cache,
+)
+
+
+@pytest.fixture
+def tiny_db(tmp_path, monkeypatch):
+    """A throwaway single-table DB pointed at by ``CASPARSER_ISIN_DB``."""
+    path = tmp_path / "tiny.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t(k PRIMARY KEY, v)")
+        conn.execute("INSERT INTO t VALUES ('a', 1)")
+    conn.close()
+    monkeypatch.setenv("CASPARSER_ISIN_DB", str(path))
+    return path
 
 
 class TestUtils:
@@ -42,3 +70,276 @@ class TestUtils:
     def test_unset_env_returns_bundled(self, monkeypatch):
         monkeypatch.delenv("CASPARSER_ISIN_DB", raising=False)
         assert get_isin_db_path() == INTERNAL_ISIN_DB_PATH
+
+
+class TestConnectionPool:
+    """Pooled read-only connections shared across DB instances."""
+
+    def test_reused_across_instances(self, tiny_db):
+        first, second = DB(), DB()
+        assert first.run_query("SELECT v FROM t WHERE k = :k", {"k": "a"}, fetchone=True) == {
+            "v": 1
+        }
+        second.run_query("SELECT v FROM t", {})
+        assert connection_pool.acquire(tiny_db) is connection_pool.acquire(tiny_db)
+        # Instances never hold on to the pooled connection outside a with block.
+        assert first.connection is None and second.connection is None
+
+        with DB() as db:
+            assert db.connection is connection_pool.acquire(tiny_db)
+        assert db.connection is None
+        # Leaving the with block must not close the shared connection.
+        assert connection_pool.acquire(tiny_db).execute("SELECT 1").fetchone()
+
+    def test_one_connection_per_thread(self, tiny_db):
+        pool = ConnectionPool()
+        main = pool.acquire(tiny_db)
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(pool.acquire(tiny_db)))
+        thread.start()
+        thread.join()
+        assert seen[0] is not main
+
+    def test_read_only(self, tiny_db):
+        pool = ConnectionPool()
+        with pytest.raises(sqlite3.OperationalError):
+            pool.acquire(tiny_db).execute("INSERT INTO t VALUES ('b', 2)")
+
+    def test_clear(self, tiny_db):
+        pool = ConnectionPool()
+        before = pool.acquire(tiny_db)
+        pool.clear()
+        with pytest.raises(sqlite3.ProgrammingError):
+            before.execute("SELECT 1")
+        assert pool.acquire(tiny_db) is not before
+
+
+class TestFastOpen:
+    """Immutable / mmap open mode (default) and its opt-out."""
+
+    def test_fast_open_pragmas(self, tiny_db, monkeypatch):
+        monkeypatch.delenv("CASPARSER_ISIN_DB_NO_FAST_OPEN", raising=False)
+        monkeypatch.setenv("CASPARSER_ISIN_DB_MMAP_SIZE", str(1024 * 1024))
+        conn = ConnectionPool().acquire(tiny_db)
+        assert conn.execute("PRAGMA query_only").fetchone() == {"query_only": 1}
+        assert conn.execute("PRAGMA mmap_size").fetchone() == {"mmap_size": 1024 * 1024}
+
+    def test_opt_out(self, tiny_db, monkeypatch):
+        monkeypatch.setenv("CASPARSER_ISIN_DB_NO_FAST_OPEN", "1")
+        conn = ConnectionPool().acquire(tiny_db)
+        assert conn.execute("PRAGMA query_only").fetchone() == {"query_only": 0}
+        assert conn.execute("SELECT v FROM t").fetchone() == {"v": 1}
+
+    def test_bad_mmap_size_warns(self, monkeypatch, caplog):
+        monkeypatch.setenv("CASPARSER_ISIN_DB_MMAP_SIZE", "lots")
+        with caplog.at_level(logging.WARNING, logger="casparser_isin.utils"):
+            assert get_mmap_size() > 0
+        assert caplog.records
+
+
+class TestInMemory:
+    """Opt-in in-memory copy of the database."""
+
+    def test_in_memory_serves_queries(self, tiny_db):
+        db = DB(in_memory=True)
+        assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 1}
+        conn = connection_pool.acquire(tiny_db, in_memory=True)
+        assert conn is not connection_pool.acquire(tiny_db)
+        assert conn.execute("PRAGMA database_list").fetchone()["file"] == ""
+
+    def test_loaded_once_and_shared_across_threads(self, tiny_db):
+        pool = ConnectionPool()
+        master = pool.memory_database(tiny_db)
+        pool.acquire(tiny_db, in_memory=True)
+        # Deleting the file after the load must not affect lookups.
+        tiny_db.unlink()
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(
+                pool.acquire(tiny_db, in_memory=True).execute("SELECT v FROM t").fetchone()
+            )
+        )
+        thread.start()
+        thread.join()
+        assert results == [{"v": 1}]
+        assert pool.memory_database(tiny_db) is master
+
+    def test_env_opt_in(self, tiny_db, monkeypatch):
+        monkeypatch.setenv("CASPARSER_ISIN_DB_IN_MEMORY", "1")
+        assert DB().in_memory is True
+        monkeypatch.delenv("CASPARSER_ISIN_DB_IN_MEMORY")
+        assert DB().in_memory is False
+
+
+class TestLookupCache:
+    """LRU result cache shared by all DB instances."""
+
+    def test_lru_eviction_and_counters(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", None)
+        assert cache.get("a") == 1
+        assert cache.get("b", "miss") is None
+        cache.put("c", 3)  # evicts "a", the least recently used
+        assert cache.get("a", "miss") == "miss"
+        assert cache.info() == (2, 1, 1, 2, 2)
+        cache.resize(1)
+        assert cache.info().currsize == 1
+        assert cache.get("c") == 3
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setenv("CASPARSER_ISIN_CACHE_SIZE", "0")
+        assert get_cache_size() == 0
+        cache = LRUCache(get_cache_size())
+        cache.put("a", 1)
+        assert cache.info().currsize == 0
+
+    def test_invalid_size_env(self, monkeypatch, caplog):
+        monkeypatch.setenv("CASPARSER_ISIN_CACHE_SIZE", "lots")
+        with caplog.at_level(logging.WARNING):
+            assert get_cache_size() == 4096
+
+    def test_cached_until_version_changes(self, tiny_db):
+        with sqlite3.connect(tiny_db) as conn:
+            conn.execute("CREATE TABLE meta(key PRIMARY KEY, value)")
+            conn.execute("INSERT INTO meta VALUES ('version', '1')")
+        conn.close()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        db = DB()
+        assert db.cached("test", ("a",), compute) == 1
+        assert db.cached("test", ("a",), compute) == 1
+        assert DB.cache_info().hits >= 1
+
+        # Simulate ``casparser-isin --update`` replacing the file.
+        replacement = tiny_db.with_name("new.db")
+        with sqlite3.connect(replacement) as conn:
+            conn.execute("CREATE TABLE meta(key PRIMARY KEY, value)")
+            conn.execute("INSERT INTO meta VALUES ('version', '2')")
+        conn.close()
+        replacement.replace(tiny_db)
+        connection_pool.clear()
+
+        assert db.cached("test", ("a",), compute) == 2
+        assert connection_pool.db_version(tiny_db) == "2"
+        assert lookup_cache.info().currsize == 1
+
+
+def _replace_db(path, value):
+    """Atomically swap ``path`` for a fresh tiny DB, as ``casparser-isin --update`` does."""
+    replacement = path.with_name("replacement.db")
+    with sqlite3.connect(replacement) as conn:
+        conn.execute("CREATE TABLE t(k PRIMARY KEY, v)")
+        conn.execute("INSERT INTO t VALUES ('a', ?)", (value,))
+    conn.close()
+    replacement.replace(path)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+class TestFork:
+    """A forked child never uses the connections it inherited."""
+
+    @pytest.mark.parametrize("in_memory", [False, True])
+    def test_fork_after_lookup(self, tiny_db, in_memory):
+        db = DB(in_memory=in_memory)
+        assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 1}
+        inherited = connection_pool.acquire(tiny_db, in_memory)
+        pid = os.fork()
+        if pid == 0:
+            try:
+                fresh = connection_pool.acquire(tiny_db, in_memory) is not inherited
+                ok = fresh and db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 1}
+            except BaseException:
+                ok = False
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        # The parent's connection was neither replaced nor closed.
+        assert connection_pool.acquire(tiny_db, in_memory) is inherited
+        assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 1}
+
+
+class TestHotReload:
+    """Replaced DB files are picked up without a restart."""
+
+    @pytest.mark.parametrize("in_memory", [False, True])
+    def test_reload_after_replace(self, tiny_db, in_memory):
+        db = DB(in_memory=in_memory)
+        assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 1}
+        db.cached("test", ("a",), lambda: 1)
+        assert not connection_pool.check_for_updates()
+
+        _replace_db(tiny_db, 2)
+        assert connection_pool.check_for_updates()
+        assert lookup_cache.info().currsize == 0
+        assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 2}
+
+    def test_clear_drops_cached_results(self, tiny_db):
+        db = DB()
+        db.cached("test", ("a",), lambda: 1)
+        # Rebuilt in place (e.g. a same-day --update): same meta.version, if any.
+        _replace_db(tiny_db, 2)
+        connection_pool.clear()
+        assert lookup_cache.info().currsize == 0
+        assert db.cached("test", ("a",), lambda: 2) == 2
+
+    def test_with_block_across_reload(self, tiny_db):
+        with DB() as db:
+            assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 1}
+            _replace_db(tiny_db, 2)
+            assert connection_pool.check_for_updates()
+            assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 2}
+            connection_pool.clear()
+            assert db.run_query("SELECT v FROM t", {}, fetchone=True) == {"v": 2}
+        assert db.connection is None
+
+    def test_cursor_across_reload(self, tiny_db):
+        with DB() as db:
+            assert db.cursor.execute("SELECT v FROM t").fetchone() == {"v": 1}
+            _replace_db(tiny_db, 2)
+            assert connection_pool.check_for_updates()
+            assert db.cursor.execute("SELECT v FROM t").fetchone() == {"v": 2}
+        assert db.cursor is None
+
+    def test_other_threads_reconnect(self, tiny_db):
+        pool = ConnectionPool()
+        results = []
+
+        def lookup():
+            results.append(pool.acquire(tiny_db).execute("SELECT v FROM t").fetchone()["v"])
+
+        connected, replaced = threading.Event(), threading.Event()
+        thread = threading.Thread(
+            target=lambda: [lookup(), connected.set(), replaced.wait(), lookup()]
+        )
+        thread.start()
+        connected.wait()
+        _replace_db(tiny_db, 2)
+        pool.check_for_updates()
+        replaced.set()
+        thread.join()
+        assert results == [1, 2]
+
+    def test_rate_limited(self, tiny_db, monkeypatch):
+        pool = ConnectionPool()
+        pool.check_interval = 3600
+        calls = []
+        monkeypatch.setattr(
+            "casparser_isin.utils._file_signature", lambda path: calls.append(path) or ("sig",)
+        )
+        for _ in range(100):
+            pool.acquire(tiny_db)
+        # One stat when first connecting; none per lookup until the interval elapses.
+        assert len(calls) == 1
+        monkeypatch.setattr("casparser_isin.utils._file_signature", lambda path: ("new",))
+        assert pool.check_for_updates()
+
+    def test_interval_env(self, monkeypatch):
+        monkeypatch.setenv("CASPARSER_ISIN_DB_RELOAD_INTERVAL", "0")
+        assert ConnectionPool().check_interval == 0
+        monkeypatch.setenv("CASPARSER_ISIN_DB_RELOAD_INTERVAL", "soon")
+        assert get_reload_interval() == 5.0
@@ -15,9 +15,11 @@ from cptools.builder import (
     SchemeRow,
     build_rows_from_bse,
     build_rows_from_franklin,
+    classify_scheme,
     merge_isin_rows,
     merge_rows,
     read_baseline_isin,
+    scheme_family_key,
     sebi_category_to_tax_type,
 )
 from cptools.fetchers.isin import KEEP_TYPES
@@ -544,6 +546,81 @@ class TestSebiCategoryToTaxType:
         assert sebi_category_to_tax_type("Some Other New Category") is None
 
 
+class TestClassifyScheme:
+    """Plan / option columns backing the HDFC branch of scheme_lookup."""
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("hdfc tax saver - growth option", ("regular", "growth")),
+            ("hdfc tax saver - direct plan - growth option", ("direct", "growth")),
+            ("HDFC Arbitrage Fund - Direct Plan - Quarterly IDCW Payout", ("direct", "payout")),
+            ("hdfc money market fund-weekly idcw reinvestment", ("regular", "reinvest")),
+            ("hdfc income fund - dividend payout / reinvestment", ("regular", "payout_reinvest")),
+            (None, ("regular", "growth")),
+        ],
+    )
+    def test_classify(self, name, expected):
+        assert classify_scheme(name) == expected
+
+
+class TestSchemeFamilyKey:
+    """Family grouping behind MFISINDb.family_lookup."""
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("Axis Long Term Equity Fund - Direct Growth", "axis long term equity fund"),
+            ("axis long term equity fund regular growth", "axis long term equity fund"),
+            ("HDFC Arbitrage Fund - Direct Plan - Quarterly IDCW Payout", "hdfc arbitrage fund"),
+            ("hdfc money market fund-weekly idcw reinvestment", "hdfc money market fund"),
+            ("Quant Growth Fund - Growth", "quant growth fund"),
+            (
+                "ICICI Prudential Fixed Maturity Plan - Series 82 - 1223 Days Plan Q - "
+                "Direct Plan Cumulative Option",
+                "icici prudential fixed maturity plan series 82 1223 days plan q",
+            ),
+            (
+                "Nippon India Fixed Horizon Fund - XXXIX - Series 4 - Growth Option",
+                "nippon india fixed horizon fund xxxix series 4",
+            ),
+            ("Growth", ""),
+            (None, ""),
+        ],
+    )
+    def test_family_key(self, name, expected):
+        assert scheme_family_key(name) == expected
+
+    @pytest.mark.parametrize(
+        "first,second",
+        [
+            (
+                "ICICI Prudential Fixed Maturity Plan - Series 82 - 1223 Days Plan Q - Growth",
+                "ICICI Prudential Fixed Maturity Plan - Series 85 - 1225 Days Plan C - Growth",
+            ),
+            (
+                "Nippon India Fixed Horizon Fund - XXXIX - Series 4 - Growth Option",
+                "Nippon India Fixed Horizon Fund - XLI - Series 7 - Growth Option",
+            ),
+            (
+                "Aditya Birla Sun Life Fixed Term Plan - Series TI (1837 days) - Regular - Growth",
+                "Aditya Birla Sun Life Fixed Term Plan - Series TQ (1879 days) - Direct - Growth",
+            ),
+        ],
+    )
+    def test_series_are_separate_families(self, first, second):
+        assert scheme_family_key(first) != scheme_family_key(second)
+
+    def test_plans_and_options_share_a_family(self):
+        names = [
+            "ICICI Prudential Fixed Maturity Plan - Series 82 - 1223 Days Plan Q - Growth",
+            "ICICI Prudential Fixed Maturity Plan - Series 82 - 1223 Days Plan Q - Direct Plan "
+            "- Cumulative Option",
+            "ICICI Prudential Fixed Maturity Plan - Series 82 - 1223 Days Plan Q - Quarterly IDCW",
+        ]
+        assert len({scheme_family_key(name) for name in names}) == 1
+
+
 class TestBuildRowsFromBseWithSebi:
     """SEBI category overrides BSE-derived type when both are present."""
 
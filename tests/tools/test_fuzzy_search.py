@@ -0,0 +1,102 @@
+"""Whole-table fuzzy searches, run against a small DB built by ``prepare_db``."""
+
+import sqlite3
+
+import pytest
+from cptools.builder import SchemeRow
+from update_isin_db import prepare_db
+
+from casparser_isin import MFISINDb
+from casparser_isin.utils import connection_pool
+
+SCHEMES = [
+    ("Axis Long Term Equity Fund - Growth", "INF846K01EW2", "KFINTECH", "128TSGG"),
+    ("Axis Long Term Equity Fund - Direct Growth", "INF846K01131", "KFINTECH", "128TSDGG"),
+    ("Axis Bluechip Fund - Growth", "INF846K01164", "KFINTECH", "128EFGG"),
+    ("Mirae Asset Tax Saver Fund - Direct Growth", "INF769K01DM9", "KARVY", "117TSD1G"),
+    ("Mirae Asset Tax Saver Fund - Regular Growth", "INF769K01DK3", "KARVY", "117TSG"),
+    ("Mirae Asset Large Cap Fund - Regular Plan - Growth", "INF769K01010", "KARVY", "117IOG"),
+    ("Mirae Asset Large Cap Fund - Direct Plan - Growth", "INF769K01AX2", "KARVY", "117IOD1G"),
+    (
+        "Mirae Asset Emerging Bluechip Fund - Regular Plan - Growth",
+        "INF769K01101",
+        "KARVY",
+        "117EBG",
+    ),
+    ("HDFC TaxSaver - Regular Plan - Growth", "INF179K01BB8", "CAMS", "HTSG"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fuzzy_db(tmp_path, monkeypatch):
+    path = tmp_path / "isin.db"
+    schemes = [
+        SchemeRow(
+            id=i,
+            name=name,
+            isin=isin,
+            amfi_code=str(120000 + i),
+            type="EQUITY",
+            rta=rta,
+            rta_code=rta_code,
+            amc_code="01",
+            sebi_category=None,
+            last_seen=None,
+        )
+        for i, (name, isin, rta, rta_code) in enumerate(SCHEMES, 1)
+    ]
+    conn = sqlite3.connect(path)
+    try:
+        prepare_db(conn, schemes, [], [])
+    finally:
+        conn.close()
+    monkeypatch.setenv("CASPARSER_ISIN_DB", str(path))
+    yield path
+    connection_pool.clear()
+
+
+class TestFuzzySearch:
+    def test_search(self):
+        results = MFISINDb().fuzzy_search("Mirae Asset Tax Saver Fund Direct Growth")
+        assert results[0].isin == "INF769K01DM9"
+        assert results[0].score == 100
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+
+    def test_limit_and_min_score(self):
+        mf = MFISINDb()
+        assert len(mf.fuzzy_search("Mirae Asset Large Cap Fund", limit=2, min_score=0)) == 2
+        assert mf.fuzzy_search("Mirae Asset Large Cap Fund", min_score=101) == []
+
+    def test_falls_back_to_all_amcs(self):
+        mf = MFISINDb()
+        # Nothing in the "axis" shard scores 60; the whole table is searched next.
+        name = "Axis Mirae Asset Emerging Bluechip Fund - Regular Plan - Growth Option"
+        assert mf.fuzzy_search(name, min_score=0)[0].isin.startswith("INF846K")
+        assert mf.fuzzy_search(name)[0].isin == "INF769K01101"
+        assert mf.fuzzy_search(name, by_amc=False)[0].isin == "INF769K01101"
+
+    def test_index_shared_and_reloaded(self):
+        index = MFISINDb()._name_index()
+        assert MFISINDb()._name_index() is index
+        connection_pool.clear()
+        assert MFISINDb()._name_index() is not index
+
+
+class TestFuzzyFallback:
+    # A garbled RTA code and no ISIN: neither lookup path finds anything.
+    HOLDING = ("Axis Long Term Equity Fund - Direct Growth", "KFINTECH", "l28T5DGG")
+
+    def test_off_by_default(self):
+        mf = MFISINDb()
+        with pytest.raises(ValueError, match="No schemes found"):
+            mf.isin_lookup(*self.HOLDING)
+        assert isinstance(mf.isin_lookup_many([(*self.HOLDING, None)])[0], ValueError)
+
+    def test_fallback(self):
+        mf = MFISINDb()
+        result = mf.isin_lookup(*self.HOLDING, fuzzy_fallback=True)
+        assert result.isin == "INF846K01131"
+        assert result.score == 100
+        assert mf.isin_lookup_many([(*self.HOLDING, None)], fuzzy_fallback=True) == [result]
+        with pytest.raises(ValueError, match="No schemes found"):
+            mf.isin_lookup("Unrelated Words", "CAMS", "XXXX", fuzzy_fallback=True)
@@ -18,7 +18,9 @@ import sqlite3
 from pathlib import Path
 
 from cptools.builder import IsinRow, SchemeRow
-from update_isin_db import prepare_db
+from update_isin_db import DBFORMAT, prepare_db
+
+from casparser_isin import cli
 
 
 def _populate_baseline(path: Path, *, scheme_rows: list[SchemeRow], isin_rows: list[IsinRow]):
@@ -277,3 +279,50 @@ def test_live_reconfirmation_preserves_baseline_id(tmp_path, monkeypatch):
     assert 777 not in out
     # last_seen got bumped (was None, now today).
     assert out[42][3] is not None
+
+
+def test_bloom_filters_cover_every_lookup_key(tmp_path):
+    """The shipped Bloom filters must never report a stored ISIN as absent."""
+    from casparser_isin.bloom import load_bloom_filter
+
+    path = tmp_path / "isin.db"
+    schemes = [
+        SchemeRow(
+            id=i,
+            name=f"Fund {i}",
+            isin=f"INF000FUND{i:03d}",
+            amfi_code=str(100 + i),
+            type="EQUITY",
+            rta="CAMS",
+            rta_code=f"F{i}",
+            amc_code="01",
+            sebi_category=None,
+            last_seen=None,
+        )
+        for i in range(1, 50)
+    ]
+    isins = [
+        IsinRow(
+            isin=f"INE{i:03d}A01036",
+            name=f"Company {i}",
+            issuer=f"COMPANY {i} LIMITED",
+            type="EQUITY SHARES",
+            status="ACTIVE",
+            last_seen=None,
+        )
+        for i in range(200)
+    ]
+    _populate_baseline(path, scheme_rows=schemes, isin_rows=isins)
+
+    with sqlite3.connect(path) as conn:
+        scheme_filter = load_bloom_filter(conn, "scheme")
+        isin_filter = load_bloom_filter(conn, "isin")
+    conn.close()
+    assert scheme_filter.n == len(schemes) and isin_filter.n == len(isins)
+    assert all(row.isin in scheme_filter for row in schemes)
+    assert all(row.isin in isin_filter for row in isins)
+
+
+def test_built_dbformat_is_accepted_by_cli_update():
+    """Installed packages must be able to ``--update`` to the format the builder ships."""
+    assert DBFORMAT in cli.SUPPORTED_DBFORMATS
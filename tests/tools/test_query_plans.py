@@ -0,0 +1,209 @@
+"""EXPLAIN QUERY PLAN regression tests for the runtime lookups.
+
+Every statement the lookup APIs issue against a freshly built DB must be
+answered from a covering index or a WITHOUT ROWID primary key: no table
+scans (bar loading the small ``nav20180131`` table whole, once, and
+ISINDb.search paging through the table by key for type / status alone), no
+rowid lookups back into the table (bar the capped full-text hits of
+search_schemes), no temp B-tree sorts. A
+change to a runtime query or to the indexes in ``prepare_db`` that breaks
+this shows up here as an unexpected plan.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+from cptools.builder import IsinRow, SchemeRow
+from update_isin_db import prepare_db
+
+from casparser_isin import AnyISINDb, ISINDb, MFISINDb
+from casparser_isin.mf_isin import fuzzy_key
+from casparser_isin.utils import connection_pool
+
+EXPECTED_PLANS = {
+    "SEARCH scheme USING COVERING INDEX idx_scheme_isin (isin=?)",
+    "SEARCH scheme USING COVERING INDEX idx_scheme_rta_code_key (rta_code_key=?)",
+    "SEARCH scheme USING COVERING INDEX idx_scheme_rta_code_key "
+    "(rta_code_key>? AND rta_code_key<?)",
+    "SEARCH scheme USING COVERING INDEX idx_scheme_amfi_code (amfi_code=?)",
+    # family_lookup: the ISIN's families, then every row in them.
+    "SEARCH scheme USING COVERING INDEX idx_scheme_family (family_id=?)",
+    "LIST SUBQUERY 1",
+    "SEARCH isin USING PRIMARY KEY (isin=?)",
+    # ISINDb.search: pages of full-text hits (then their rows by key, above),
+    # of one issuer code's rows, or, for type / status alone, of the table.
+    "SCAN isin_fts VIRTUAL TABLE INDEX 64:M2>",
+    "SEARCH isin USING INDEX idx_isin_issuer_code (<expr>=? AND isin>?)",
+    "SEARCH isin USING PRIMARY KEY (isin>?)",
+    # AnyISINDb: both probes above in one UNION ALL.
+    "COMPOUND QUERY",
+    "LEFT-MOST SUBQUERY",
+    "UNION ALL",
+    # search_schemes: the newest full-text hits, then their scheme rows by rowid.
+    "SCAN scheme_fts VIRTUAL TABLE INDEX 192:L0L0",
+    "SEARCH scheme USING INTEGER PRIMARY KEY (rowid=?)",
+    # The probes for usable scheme_fts / isin_fts (once per DB), and FTS5
+    # reading their one-row config tables as each connection first uses them.
+    "SCAN scheme_fts VIRTUAL TABLE INDEX 0:M1",
+    "SCAN main.scheme_fts_config",
+    "SCAN isin_fts VIRTUAL TABLE INDEX 0:M2",
+    "SCAN main.isin_fts_config",
+    # Read whole, once per process: the NAV map behind nav_lookup.
+    "SCAN nav20180131",
+    "SEARCH bloom USING PRIMARY KEY (name=?)",
+}
+
+
+def _scheme(i, rta="CAMS", rta_code=None, name=None):
+    return SchemeRow(
+        id=i,
+        name=name or f"Fund {i} - Growth",
+        isin=f"INF{i:09d}",
+        amfi_code=str(100000 + i),
+        type="EQUITY",
+        rta=rta,
+        rta_code=rta_code or f"C{i}",
+        amc_code="01",
+        sebi_category=None,
+        last_seen=None,
+    )
+
+
+@pytest.fixture
+def traced_db(tmp_path, monkeypatch):
+    """A DB built by ``prepare_db`` plus the list of statements run against it."""
+    path = tmp_path / "isin.db"
+    schemes = [_scheme(i) for i in range(1, 2000)]
+    schemes += [
+        _scheme(2000, "FRANKLIN", "FTI001", "Franklin India Prima Fund - Growth"),
+        _scheme(2001, "CAMS", "FTI001", "Franklin India Prima Fund - Growth"),
+        _scheme(2002, "CAMS", "HTSG", "hdfc tax saver - growth option"),
+        _scheme(2003, "CAMS", "HTSDR", "hdfc tax saver - idcw reinvestment"),
+    ]
+    isins = [
+        IsinRow(f"INE{i:09d}", f"Company {i}", f"ISSUER {i}", "EQUITY SHARES", "ACTIVE", None)
+        for i in range(5000)
+    ]
+    isins += [
+        IsinRow(f"INE{i:04d}A01010", f"Company {i} NCD", f"ISSUER {i}", "DEBENTURE", "ACTIVE", None)
+        for i in range(1, 2000)
+    ]
+    navs = [(f"INF{i:09d}", "10.5") for i in range(1, 2000)]
+    conn = sqlite3.connect(path)
+    try:
+        prepare_db(conn, schemes, navs, isins)
+    finally:
+        conn.close()
+    monkeypatch.setenv("CASPARSER_ISIN_DB", str(path))
+
+    statements = []
+    connection_pool.acquire(MFISINDb().db_path).set_trace_callback(statements.append)
+    yield path, statements
+    connection_pool.clear()
+
+
+def _plans(path, statements):
+    plans = set()
+    with sqlite3.connect(path) as conn:
+        for statement in set(statements):
+            if statement.startswith("-- "):
+                continue  # nested: FTS5 querying its own shadow tables
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}"):
+                plans.add(row[3])
+    conn.close()
+    return plans
+
+
+def test_runtime_queries_use_covering_indexes(traced_db):
+    path, statements = traced_db
+    mf, db = MFISINDb(), ISINDb()
+
+    mf.direct_isin_lookup("INF000000001")
+    mf.scheme_lookup("CAMS", "Fund 2 - Growth", "C2")
+    mf.scheme_lookup("CAMS", "Franklin India Prima Fund - Growth", "FTI001")
+    mf.scheme_lookup("CAMS", "HDFC TaxSaver - Regular Plan - Growth", "HTS")
+    mf.scheme_lookup("CAMS", "HDFC TaxSaver - IDCW - Reinvest", "HTS")
+    mf.isin_lookup("Fund 3 - Growth", "CAMS", "C3", isin="INF000000003")
+    mf.isin_lookup_many(
+        [
+            ("Fund 4 - Growth", "CAMS", "C4", "INF000000004"),
+            ("Fund 5 - Growth", "CAMS", "C5", None),
+            ("Fund 6 - Growth", "CAMS", "C6X", None),  # trimmed-code retry
+        ]
+    )
+    mf.amfi_lookup("100001")
+    mf.amfi_lookup_many(["100002", "100003"])
+    mf.family_lookup("INF000000001")
+    mf.search_schemes("fund 1234")
+    mf.nav_lookup("INF000000001")
+    db.isin_lookup("INE000000001")
+    db.isin_lookup_many(["INE000000002", "INE000000003"])
+    list(db.search(name="company 1234"))
+    list(db.search(issuer_code="0123", type="debenture"))
+    list(db.search(status="active"))
+    AnyISINDb().resolve("INE000000004")
+    AnyISINDb().resolve_many(["INF000000005", "INE000000005"])
+
+    assert statements, "trace callback saw no statements"
+    assert _plans(path, statements) == EXPECTED_PLANS
+
+
+def test_planner_statistics_shipped(traced_db):
+    path, _ = traced_db
+    with sqlite3.connect(path) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT idx FROM sqlite_stat1")}
+    conn.close()
+    assert {
+        "idx_scheme_isin",
+        "idx_scheme_rta_code_key",
+        "idx_scheme_amfi_code",
+        "idx_scheme_family",
+    } <= indexes
+
+
+def test_scheme_lookup_is_one_statement(traced_db):
+    _, statements = traced_db
+    mf = MFISINDb()
+    mf.has_column("scheme", "rta_code_key")  # schema probe, read once per DB
+
+    statements.clear()
+    assert mf.scheme_lookup("CAMS", "Franklin India Prima Fund - Growth", " fti 001 ")
+    assert mf.scheme_lookup("CAMS", "Fund 7 - Growth", "c7x")  # trimmed-code candidate
+    assert mf.scheme_lookup("CAMS", "Fund 8 - Growth", "C 8") == mf.scheme_lookup(
+        "CAMS", "Fund 8 - Growth", "C8"
+    )
+    assert len([s for s in statements if "FROM scheme" in s]) == 4
+
+
+@pytest.mark.parametrize(
+    "scheme_name,rta_code,expected",
+    [
+        ("HDFC TaxSaver - Regular Plan - Growth", "HTS", ["INF000002003", "INF000002002"]),
+        ("HDFC TaxSaver - IDCW - Reinvest", "hts", ["INF000002003"]),
+        ("HDFC TaxSaver - IDCW - Payout", "HTS", []),
+        ("HDFC TaxSaver - Direct Plan - Growth", "HTS", []),
+    ],
+)
+def test_hdfc_plan_option_columns(traced_db, scheme_name, rta_code, expected):
+    rows = MFISINDb().scheme_lookup("CAMS", scheme_name, rta_code)
+    assert [row["isin"] for row in rows] == expected
+
+
+def test_fuzzy_keys_stored(traced_db):
+    path, _ = traced_db
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT name, fuzzy_key FROM scheme").fetchall()
+    conn.close()
+    assert rows and all(key == fuzzy_key(name) for name, key in rows)
+
+
+def test_scheme_families(traced_db):
+    mf = MFISINDb()
+    assert [row.isin for row in mf.family_lookup("INF000002002")] == [
+        "INF000002003",
+        "INF000002002",
+    ]
+    assert [row.isin for row in mf.family_lookup("INF000000001")] == ["INF000000001"]
+    assert mf.family_lookup("INF999999999") == []
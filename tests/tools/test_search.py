@@ -0,0 +1,133 @@
+"""Name searches, run against a small DB built by ``prepare_db`` with its search indexes."""
+
+import sqlite3
+import types
+
+import pytest
+from cptools.builder import IsinRow, SchemeRow
+from update_isin_db import prepare_db
+
+from casparser_isin import ISINDb, MFISINDb
+from casparser_isin.isin import _rowid_isin, isin_rowid
+from casparser_isin.utils import connection_pool
+
+SCHEMES = [
+    ("Axis Long Term Equity Fund - Growth", "INF846K01EW2", "KFINTECH", "128TSGG"),
+    ("Axis Long Term Equity Fund - Direct Growth", "INF846K01131", "KFINTECH", "128TSDGG"),
+    ("Axis Bluechip Fund - Growth", "INF846K01164", "KFINTECH", "128EFGG"),
+    ("Mirae Asset Tax Saver Fund - Direct Plan - Growth", "INF769K01DM9", "KARVY", "117TSD1G"),
+    ("Mirae Asset Large Cap Fund - Regular Plan - Growth", "INF769K01010", "KARVY", "117IOG"),
+    ("HDFC TaxSaver - Regular Plan - Growth", "INF179K01BB8", "CAMS", "HTSG"),
+    ("Franklin India Prima Fund - Growth", "INF090I01239", "FRANKLIN", "FTI001"),
+]
+
+ISINS = [
+    ("INE001A01028", "HDFC LIMITED EQ OLD", "HDFC LIMITED", "EQUITY SHARES", "DELISTED"),
+    ("INE001A01036", "HDFC LIMITED EQ", "HDFC LIMITED", "EQUITY SHARES", "ACTIVE"),
+    ("INE001A07629", "HDFC LIMITED NCD", "HDFC LIMITED", "DEBENTURE", "ACTIVE"),
+    ("INE009A01021", "INFOSYS LIMITED EQ FV RS 5", "INFOSYS LIMITED", "EQUITY SHARES", "ACTIVE"),
+]
+
+
+@pytest.fixture(autouse=True)
+def search_db(tmp_path, monkeypatch):
+    path = tmp_path / "isin.db"
+    schemes = [
+        SchemeRow(
+            id=i,
+            name=name,
+            isin=isin,
+            amfi_code=str(120000 + i),
+            type="EQUITY",
+            rta=rta,
+            rta_code=rta_code,
+            amc_code="01",
+            sebi_category=None,
+            last_seen=None,
+        )
+        for i, (name, isin, rta, rta_code) in enumerate(SCHEMES, 1)
+    ]
+    conn = sqlite3.connect(path)
+    try:
+        prepare_db(conn, schemes, [], [IsinRow(*row, None) for row in ISINS])
+    finally:
+        conn.close()
+    monkeypatch.setenv("CASPARSER_ISIN_DB", str(path))
+    yield path
+    connection_pool.clear()
+
+
+class TestSearchSchemes:
+    @pytest.fixture(params=[True, False], ids=["fts", "like"])
+    def mf(self, request, monkeypatch):
+        mf = MFISINDb()
+        if not request.param:
+            monkeypatch.setattr(MFISINDb, "_scheme_fts", lambda self: False)
+        elif not mf._scheme_fts():
+            pytest.skip("this SQLite can't build FTS5 trigram indexes")
+        return mf
+
+    def test_type_ahead(self, mf):
+        results = mf.search_schemes("axis long ter")
+        assert {r.isin for r in results} == {"INF846K01EW2", "INF846K01131"}
+        assert [r.score for r in results] == sorted((r.score for r in results), reverse=True)
+
+    def test_every_word_must_match(self, mf):
+        assert {r.isin for r in mf.search_schemes("mirae tax")} == {"INF769K01DM9"}
+        assert mf.search_schemes("mirae arbitrage") == []
+
+    def test_short_words(self, mf):
+        assert mf.search_schemes("axi lo")[0].isin in {"INF846K01EW2", "INF846K01131"}
+        # A short word first used to crash SQLite 3.40's trigram LIKE.
+        assert {r.isin for r in mf.search_schemes("lo axi")} == {"INF846K01EW2", "INF846K01131"}
+        assert mf.search_schemes("ax lo")
+
+    def test_limit(self, mf):
+        assert len(mf.search_schemes("fund", limit=3)) == 3
+        assert mf.search_schemes("fund", limit=0) == []
+        assert mf.search_schemes(" - ") == []
+
+
+class TestISINSearch:
+    @pytest.fixture(params=[True, False], ids=["fts", "scan"])
+    def db(self, request, monkeypatch):
+        db = ISINDb()
+        if not request.param:
+            monkeypatch.setattr(ISINDb, "has_fts", lambda self, table: False)
+        elif not db.has_fts("isin_fts"):
+            pytest.skip("this SQLite can't build FTS5 indexes")
+        return db
+
+    def test_words(self, db):
+        hdfc = ["INE001A01028", "INE001A01036", "INE001A07629"]
+        assert [r.isin for r in db.search(issuer="hdfc")] == hdfc
+        assert [r.isin for r in db.search(name="infosys eq")] == ["INE009A01021"]
+        # The last word may be cut short; each word must be in its own column.
+        assert [r.isin for r in db.search(name="hdfc nc")] == ["INE001A07629"]
+        assert [r.isin for r in db.search(name="infosys", issuer="info")] == ["INE009A01021"]
+        assert list(db.search(name="infosys", issuer="hdfc")) == []
+
+    def test_filters(self, db):
+        assert [r.isin for r in db.search(type="debenture")] == ["INE001A07629"]
+        assert [r.isin for r in db.search(issuer_code="009a")] == ["INE009A01021"]
+        assert [r.isin for r in db.search(issuer_code="001A", status="delisted")] == [
+            "INE001A01028"
+        ]
+        results = db.search(name="hdfc", type="EQUITY SHARES", status="active")
+        assert isinstance(results, types.GeneratorType)
+        assert [r.name for r in results] == ["HDFC LIMITED EQ"]
+
+    def test_no_criterion(self, db):
+        with pytest.raises(ValueError, match="criterion"):
+            db.search()
+        with pytest.raises(ValueError, match="criterion"):
+            db.search(name="  ")
+
+
+def test_isin_rowid():
+    isins = ["000000000000", "INE001A01036", "INE001A07629", "INE009A01021", "ZZZZZZZZZZZZ"]
+    rowids = [isin_rowid(isin) for isin in isins]
+    assert rowids == sorted(rowids) and rowids[-1] < 2**63
+    assert [_rowid_isin(rowid) for rowid in rowids] == isins
+    assert isin_rowid("ine001a01036") is None
+    assert isin_rowid("INE001A0103") is None
@@ -187,6 +187,60 @@ class SchemeRow:
         return (self.name, self.isin, self.amfi_code, self.rta, self.rta_code, self.amc_code)
 
 
+def classify_scheme(name: str | None) -> tuple[str, str]:
+    """Return the ``(plan, option)`` columns stored for a scheme row.
+
+    ``plan`` is ``"direct"`` or ``"regular"``; ``option`` is ``"payout"``,
+    ``"reinvest"``, ``"payout_reinvest"`` (names carrying both) or
+    ``"growth"`` for everything else. These are exactly the substring tests
+    the HDFC branch of ``MFISINDb.scheme_lookup`` used to run as
+    ``name LIKE '%direct%'`` / ``'%payout%'`` / ``'%reinvest%'`` on every
+    lookup; precomputing them lets it use equality predicates instead.
+    """
+    name = (name or "").lower()
+    plan = "direct" if "direct" in name else "regular"
+    payout, reinvest = "payout" in name, "reinvest" in name
+    if payout and reinvest:
+        option = "payout_reinvest"
+    elif payout or reinvest:
+        option = "payout" if payout else "reinvest"
+    else:
+        option = "growth"
+    return plan, option
+
+
+# Words that name a plan or option rather than the fund itself, dropped by
+# scheme_family_key.
+_FAMILY_SUFFIX_WORDS = frozenset(
+    "direct regular retail institutional plan growth option options idcw dividend payout "
+    "reinvest reinvestment cumulative bonus daily weekly fortnightly monthly quarterly half "
+    "yearly annual".split()
+)
+
+
+def scheme_family_key(name: str | None) -> str:
+    """Return the key that groups every plan and option of one fund.
+
+    AMFI and BSE names read ``"<fund> - <plan> - <option>"``, and closed-end
+    series add their own parts (``"<fund> - Series 82 - 1223 Days Plan Q -
+    <plan> <option>"``). The key keeps every ``" - "`` part but those made
+    only of plan / option words, lower-cased, with punctuation dropped, and
+    then strips trailing plan / option words for names that run them on
+    without a separator (``"axis long term equity fund regular growth"``).
+    Series numbers stay, so two series of a fixed maturity plan are two
+    families; only trailing words go, so ``"quant growth fund - growth"``
+    keeps its name (``"quant growth fund"``).
+    """
+    words = []
+    for part in (name or "").lower().split(" - "):
+        part_words = re.findall(r"[a-z0-9]+", part)
+        if not _FAMILY_SUFFIX_WORDS.issuperset(part_words):
+            words += part_words
+    while words and words[-1] in _FAMILY_SUFFIX_WORDS:
+        words.pop()
+    return " ".join(words)
+
+
 # Columns that may or may not exist in a baseline DB depending on its
 # generation. We probe for presence rather than alter-tabling so the
 # pipeline tolerates running against older DBs (e.g. ones built before
@@ -32,10 +32,12 @@ from cptools.builder import (
     SchemeRow,
     build_rows_from_bse,
     build_rows_from_franklin,
+    classify_scheme,
     merge_isin_rows,
     merge_rows,
     read_baseline,
     read_baseline_isin,
+    scheme_family_key,
 )
 from cptools.fetchers.amfi import get_amfi_isin_map
 from cptools.fetchers.bse import fetch_bse_master_data
@@ -51,7 +53,11 @@ from cptools.settings import (
 from cptools.utils import get_session
 from packaging import version
 
-DBFORMAT = "2"
+from casparser_isin.bloom import BloomFilter
+from casparser_isin.isin import isin_rowid
+from casparser_isin.mf_isin import fuzzy_key, normalize_rta_code
+
+DBFORMAT = "3"
 
 _NO_CHANGE = 0
 _PUBLISHED = 1
@@ -75,13 +81,42 @@ def prepare_db(conn: sqlite3.Connection, rows, nav_rows, isin_rows) -> None:
                 name, isin, amfi_code, type,
                 rta, rta_code, amc_code,
                 sebi_category,
-                last_seen
+                last_seen,
+                rta_code_key, plan, option,
+                fuzzy_key, family_id
             )
             """
         )
-        conn.execute("CREATE TABLE meta(key NOT NULL PRIMARY KEY, value)")
-        conn.execute("CREATE INDEX idx_scheme_rta_code ON scheme(rta_code)")
-        conn.execute("CREATE INDEX idx_scheme_isin ON scheme(isin)")
+        conn.execute("CREATE TABLE meta(key NOT NULL PRIMARY KEY, value) WITHOUT ROWID")
+        # Covering indexes, one per runtime query shape in casparser_isin
+        # (asserted by tests/tools/test_query_plans.py). ``id`` follows the
+        # equality columns so ``ORDER BY id DESC`` needs no sort.
+        #   direct_isin_lookup / isin_lookup_many: WHERE isin = ?
+        #   family_lookup: WHERE isin = ?, then the ISIN's family_id
+        conn.execute(
+            "CREATE INDEX idx_scheme_isin "
+            "ON scheme(isin, id, name, amfi_code, type, fuzzy_key, family_id)"
+        )
+        #   scheme_lookup / isin_lookup_many: WHERE rta_code_key IN (...)
+        #   ``rta_code_key`` is the normalized code (see normalize_rta_code), so
+        #   the exact, Franklin and trimmed-code candidates are one probe each.
+        #   HDFC scheme_lookup: rta_code_key prefix range, then equality on
+        #   rta / plan / option (see classify_scheme), checked in the index.
+        #   Both shapes order rows by id in Python, so ``id`` needn't lead.
+        conn.execute(
+            "CREATE INDEX idx_scheme_rta_code_key "
+            "ON scheme(rta_code_key, rta, plan, option, id, name, isin, amfi_code, type, fuzzy_key)"
+        )
+        #   amfi_lookup / amfi_lookup_many: WHERE amfi_code = ? / IN (...)
+        conn.execute(
+            "CREATE INDEX idx_scheme_amfi_code "
+            "ON scheme(amfi_code, id, name, isin, type, fuzzy_key)"
+        )
+        #   family_lookup: WHERE family_id = ?
+        conn.execute(
+            "CREATE INDEX idx_scheme_family "
+            "ON scheme(family_id, id, name, isin, amfi_code, type, fuzzy_key)"
+        )
 
         today = datetime.date.today()
         db_version = str(version.parse(today.strftime("%Y.%m.%d")))
@@ -89,19 +124,43 @@ def prepare_db(conn: sqlite3.Connection, rows, nav_rows, isin_rows) -> None:
             "INSERT INTO meta(key, value) VALUES (?, ?)",
             [("version", db_version), ("dbformat", DBFORMAT)],
         )
+        rows = [r.as_tuple() if isinstance(r, SchemeRow) else r for r in rows]
+        # One family per distinct scheme_family_key, numbered in key order so
+        # unchanged data gets unchanged ids.
+        family_keys = [scheme_family_key(row[1]) for row in rows]
+        families = {key: n for n, key in enumerate(sorted(set(family_keys) - {""}), 1)}
+        conn.execute("CREATE TABLE family(id INTEGER NOT NULL PRIMARY KEY, name NOT NULL)")
+        conn.executemany(
+            "INSERT INTO family(id, name) VALUES (?, ?)",
+            ((n, key) for key, n in families.items()),
+        )
         conn.executemany(
             "INSERT INTO scheme"
             "(id, name, isin, amfi_code, type, rta, rta_code, amc_code, "
-            "sebi_category, last_seen) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (r.as_tuple() if isinstance(r, SchemeRow) else r for r in rows),
+            "sebi_category, last_seen, rta_code_key, plan, option, fuzzy_key, family_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    *row,
+                    normalize_rta_code(row[6] or ""),
+                    *classify_scheme(row[1]),
+                    fuzzy_key(row[1] or ""),
+                    families.get(key),
+                )
+                for row, key in zip(rows, family_keys, strict=True)
+            ),
         )
 
-        conn.execute("CREATE TABLE nav20180131(isin NOT NULL PRIMARY KEY, nav)")
+        _create_scheme_fts(conn)
+
+        # WITHOUT ROWID: the primary-key B-tree holds the whole row, so
+        # lookups by ISIN need no second (rowid) lookup.
+        conn.execute("CREATE TABLE nav20180131(isin NOT NULL PRIMARY KEY, nav) WITHOUT ROWID")
         conn.executemany("INSERT INTO nav20180131(isin, nav) VALUES (?, ?)", nav_rows)
 
         conn.execute(
-            "CREATE TABLE isin(isin NOT NULL PRIMARY KEY, name, issuer, type, status, last_seen)"
+            "CREATE TABLE isin(isin NOT NULL PRIMARY KEY, name, issuer, type, status, last_seen) "
+            "WITHOUT ROWID"
         )
         conn.executemany(
             "INSERT INTO isin(isin, name, issuer, type, status, last_seen) "
@@ -109,11 +168,85 @@ def prepare_db(conn: sqlite3.Connection, rows, nav_rows, isin_rows) -> None:
             (r.as_tuple() if isinstance(r, IsinRow) else r for r in isin_rows),
         )
 
+        #   ISINDb.search(issuer_code=...): WHERE substr(isin, 4, 4) = ?
+        conn.execute("CREATE INDEX idx_isin_issuer_code ON isin(substr(isin, 4, 4))")
+        _create_isin_fts(conn)
+
+        # Bloom filters over the ISIN lookup keys let the runtime reject
+        # misses (ISINs outside KEEP_TYPES, scheme-only ISINs) without a query.
+        conn.execute("CREATE TABLE bloom(name NOT NULL PRIMARY KEY, bits, k, n) WITHOUT ROWID")
+        for name, sql in (
+            ("isin", "SELECT isin FROM isin"),
+            ("scheme", "SELECT isin FROM scheme WHERE isin IS NOT NULL"),
+        ):
+            bloom = BloomFilter.from_keys(row[0] for row in conn.execute(sql))
+            conn.execute(
+                "INSERT INTO bloom(name, bits, k, n) VALUES (?, ?, ?, ?)",
+                (name, bloom.bits, bloom.k, bloom.n),
+            )
+
+    # Ship planner statistics (sqlite_stat1) so the runtime never has to
+    # guess between indexes.
+    conn.execute("ANALYZE")
     # VACUUM to reclaim any free pages from the bulk inserts. Must run
     # outside of any open transaction.
     conn.execute("VACUUM")
 
 
+def _create_scheme_fts(conn: sqlite3.Connection) -> bool:
+    """Index scheme names for ``MFISINDb.search_schemes``, if this SQLite can.
+
+    ``scheme_fts`` is an external-content FTS5 table (it stores only the
+    index, reading names from ``scheme`` by rowid) with the trigram
+    tokenizer, which answers ``name LIKE '%word%'`` from the index for any
+    3+ character word. ``detail='none'`` drops token positions, which
+    ``LIKE`` doesn't need: ~65 bytes per name instead of ~180. SQLite builds
+    without FTS5 or the trigram tokenizer (before 3.34) ship the DB without
+    it; the runtime then scans ``scheme`` instead.
+    """
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE scheme_fts USING fts5("
+            "name, content='scheme', content_rowid='id', tokenize='trigram', detail='none')"
+        )
+    except sqlite3.OperationalError as exc:
+        logger.warning("No scheme name search index: SQLite lacks FTS5 trigram (%s)", exc)
+        return False
+    conn.execute("INSERT INTO scheme_fts(scheme_fts) VALUES ('rebuild')")
+    return True
+
+
+def _create_isin_fts(conn: sqlite3.Connection) -> bool:
+    """Index ISIN names and issuers for ``ISINDb.search``, if this SQLite can.
+
+    ``isin`` is a WITHOUT ROWID table, so ``isin_fts`` is contentless (it
+    stores only the index) and keys each entry by the ISIN itself, read as a
+    base-36 integer (``isin_rowid``). Words are unicode61 tokens;
+    ``detail='none'`` keeps just which rows hold each word, the runtime
+    re-checking the matched rows' columns, at roughly half the size of
+    ``detail='column'``; nothing ranks hits, so no column sizes are stored.
+    """
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE isin_fts USING fts5("
+            "name, issuer, content='', columnsize=0, tokenize='unicode61', detail='none')"
+        )
+    except sqlite3.OperationalError as exc:
+        logger.warning("No ISIN name search index: SQLite lacks FTS5 (%s)", exc)
+        return False
+    rows = conn.execute("SELECT isin, name, issuer FROM isin").fetchall()
+    conn.executemany(
+        "INSERT INTO isin_fts(rowid, name, issuer) VALUES (?, ?, ?)",
+        (
+            (rowid, name, issuer)
+            for isin, name, issuer in rows
+            if (rowid := isin_rowid(isin)) is not None
+        ),
+    )
+    conn.execute("INSERT INTO isin_fts(isin_fts) VALUES ('optimize')")
+    return True
+
+
 def _build_in_memory(rows, nav_rows, isin_rows) -> sqlite3.Connection:
     conn = sqlite3.connect(":memory:")
     prepare_db(conn, rows, nav_rows, isin_rows)
@@ -129,16 +262,17 @@ def _backup_to_file(mem_conn: sqlite3.Connection, dest: Path) -> None:
 def _hash_db_content(path: Path) -> str:
     """Hash the *data* of the DB (not the binary file).
 
-    Two DBs are considered equal if their meta + scheme + nav + isin tables
-    have the same rows in the same order. Using table data rather than file
+    Two DBs are considered equal if their scheme + nav + isin tables have
+    the same rows (scheme in id order, the others in ISIN order). Using table data rather than file
     bytes means we don't trigger a publish just because SQLite chose
     different page layouts on different runs.
     """
     digest = hashlib.sha256()
     with closing(sqlite3.connect(path)) as conn:
-        for table in ("scheme", "nav20180131", "isin"):
+        # nav20180131 and isin are WITHOUT ROWID tables from dbformat 3 on.
+        for table, order in (("scheme", "id"), ("nav20180131", "isin"), ("isin", "isin")):
             try:
-                rows = conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+                rows = conn.execute(f"SELECT * FROM {table} ORDER BY {order}").fetchall()
             except sqlite3.OperationalError:
                 continue
             for row in rows: